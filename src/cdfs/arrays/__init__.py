@@ -13,4 +13,9 @@ __email__ = __email__
 
 # Imports #
 # Local Packages #
+from .blockcache import BlockCache
+from .filehandlepool import FileHandlePool
+from .overviewpyramid import OverviewPyramid
+from .readaheadprefetcher import ReadAheadPrefetcher
+from .timecontentsleaftable import TimeContentsLeafTable
 from .timecontentsproxy import BaseTimeContentsLeafContainer, TimeContentsNodeProxy, TimeContentsProxy
@@ -0,0 +1,244 @@
+"""blockcache.py
+A byte-bounded least recently used cache of decoded blocks of leaf data.
+"""
+# Package Header #
+from ..header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Standard Libraries #
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from threading import RLock
+
+# Third-Party Packages #
+import numpy as np
+
+# Local Packages #
+
+
+# Definitions #
+# Classes #
+class BlockCache:
+    """A byte-bounded least recently used cache of decoded blocks of leaf data.
+
+    The samples of a leaf are split into blocks of a fixed length along the sample axis, and each block is cached by the
+    leaf path, the block index, and the channel selection it was read with. When the cache is over its byte budget, the
+    least recently used blocks are dropped. The shape of each cached leaf is recorded so the blocks of a leaf which
+    changed shape can be invalidated.
+
+    Class Attributes:
+        default_max_bytes: The default maximum number of bytes of cached blocks.
+        default_block_length: The default number of samples in a block.
+
+    Attributes:
+        max_bytes: The maximum number of bytes of cached blocks.
+        block_length: The number of samples in a block.
+        blocks: The cached blocks by leaf path, block index, and channel selection in the order they were last used.
+        leaf_keys: The keys of the cached blocks by leaf path.
+        leaf_shapes: The shapes of the cached leaves by leaf path.
+        nbytes: The number of bytes of the cached blocks.
+        hits: The number of requests for a block which was cached.
+        misses: The number of requests for a block which had to be read.
+        evictions: The number of blocks dropped to keep the cache within its byte budget.
+        invalidations: The number of blocks dropped because their leaf changed.
+        lock: The lock which makes the cache safe to use across threads.
+
+    Args:
+        max_bytes: The maximum number of bytes of cached blocks.
+        block_length: The number of samples in a block.
+        init: Determines if this object will construct.
+    """
+    default_max_bytes: int = 256 * 2**20
+    default_block_length: int = 4096
+
+    # Magic Methods #
+    # Construction/Destruction
+    def __init__(self, max_bytes: int | None = None, block_length: int | None = None, *, init: bool = True) -> None:
+        # New Attributes #
+        self.max_bytes: int = self.default_max_bytes
+        self.block_length: int = self.default_block_length
+
+        self.blocks: OrderedDict[tuple[Hashable, int, Hashable], np.ndarray] = OrderedDict()
+        self.leaf_keys: dict[Hashable, set[tuple[Hashable, int, Hashable]]] = {}
+        self.leaf_shapes: dict[Hashable, tuple[int, ...]] = {}
+        self.nbytes: int = 0
+
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self.invalidations: int = 0
+
+        self.lock: RLock = RLock()
+
+        # Object Construction #
+        if init:
+            self.construct(max_bytes=max_bytes, block_length=block_length)
+
+    def __len__(self) -> int:
+        return len(self.blocks)
+
+    def __contains__(self, key: tuple[Hashable, int, Hashable]) -> bool:
+        return key in self.blocks
+
+    # Instance Methods #
+    # Constructors/Destructors
+    def construct(self, max_bytes: int | None = None, block_length: int | None = None) -> None:
+        """Constructs this object.
+
+        Args:
+            max_bytes: The maximum number of bytes of cached blocks.
+            block_length: The number of samples in a block.
+        """
+        if max_bytes is not None:
+            self.max_bytes = max_bytes
+            self.evict()
+
+        if block_length is not None and block_length != self.block_length:
+            self.block_length = block_length
+            self.clear()
+
+    # Blocks
+    def get_block(
+        self,
+        path: Hashable,
+        index: int,
+        loader: Callable[[], np.ndarray],
+        channels: Hashable = None,
+        shape: tuple[int, ...] | None = None,
+    ) -> np.ndarray:
+        """Gets a block of a leaf from the cache, reading it with the loader if it is not cached.
+
+        Args:
+            path: The path of the leaf.
+            index: The index of the block within the leaf.
+            loader: The callable which reads the block.
+            channels: The channel selection the block is read with, None for all the channels.
+            shape: The shape of the leaf, which invalidates the blocks of the leaf if it changed.
+
+        Returns:
+            The block.
+        """
+        if shape is not None:
+            self.update_leaf(path, shape)
+
+        key = (path, index, channels)
+        with self.lock:
+            block = self.blocks.get(key, None)
+            if block is not None:
+                self.hits += 1
+                self.blocks.move_to_end(key)
+                return block
+            self.misses += 1
+
+        block = loader()
+        with self.lock:
+            if key not in self.blocks and block.nbytes <= self.max_bytes:
+                self.blocks[key] = block
+                self.leaf_keys.setdefault(path, set()).add(key)
+                self.nbytes += block.nbytes
+                self.evict(exclude=key)
+        return block
+
+    def pop_block(self, key: tuple[Hashable, int, Hashable]) -> np.ndarray | None:
+        """Removes a block from the cache.
+
+        Args:
+            key: The leaf path, block index, and channel selection of the block.
+
+        Returns:
+            The block or None if it was not cached.
+        """
+        with self.lock:
+            block = self.blocks.pop(key, None)
+            if block is not None:
+                self.nbytes -= block.nbytes
+                keys = self.leaf_keys[key[0]]
+                keys.discard(key)
+                if not keys:
+                    del self.leaf_keys[key[0]]
+            return block
+
+    def evict(self, exclude: tuple[Hashable, int, Hashable] | None = None) -> None:
+        """Drops the least recently used blocks until the cache is within its byte budget.
+
+        Args:
+            exclude: The key of a block which will not be dropped.
+        """
+        with self.lock:
+            for key in list(self.blocks):
+                if self.nbytes <= self.max_bytes:
+                    break
+                if key != exclude:
+                    self.pop_block(key)
+                    self.evictions += 1
+
+    def update_leaf(self, path: Hashable, shape: tuple[int, ...]) -> bool:
+        """Records the shape of a leaf, invalidating the blocks of the leaf if its shape changed.
+
+        Args:
+            path: The path of the leaf.
+            shape: The current shape of the leaf.
+
+        Returns:
+            If the blocks of the leaf were invalidated.
+        """
+        shape = tuple(shape)
+        with self.lock:
+            old = self.leaf_shapes.get(path, None)
+            self.leaf_shapes[path] = shape
+            if old is None or old == shape:
+                return False
+            self.invalidate_leaf(path)
+            return True
+
+    def invalidate_leaf(self, path: Hashable) -> None:
+        """Drops all the blocks of a leaf.
+
+        Args:
+            path: The path of the leaf.
+        """
+        with self.lock:
+            for key in list(self.leaf_keys.get(path, ())):
+                self.pop_block(key)
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        """Drops all the blocks in the cache."""
+        with self.lock:
+            self.blocks.clear()
+            self.leaf_keys.clear()
+            self.leaf_shapes.clear()
+            self.nbytes = 0
+
+    # Statistics
+    def get_stats(self) -> dict[str, int]:
+        """Gets the counters of the cache.
+
+        Returns:
+            The hits, misses, evictions, invalidations, and the number and bytes of the cached blocks.
+        """
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "blocks": len(self.blocks),
+                "nbytes": self.nbytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    def reset_stats(self) -> None:
+        """Sets the hit, miss, eviction, and invalidation counters to zero."""
+        with self.lock:
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+            self.invalidations = 0
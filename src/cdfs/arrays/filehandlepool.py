@@ -0,0 +1,210 @@
+"""filehandlepool.py
+A size-bounded pool of open file handles which closes the least recently used files.
+"""
+# Package Header #
+from ..header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Standard Libraries #
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterator
+from contextlib import contextmanager
+from threading import RLock
+from typing import Any
+
+# Third-Party Packages #
+
+# Local Packages #
+
+
+# Definitions #
+# Classes #
+class FileHandlePool:
+    """A size-bounded pool of open file handles which closes the least recently used files.
+
+    Files are opened through the pool with a key and an opener. When the pool is over its limit, the least recently used
+    file which is not in use is closed. A file which was closed by the pool is opened again the next time it is
+    requested, so the files of the pool can be used as if they were always open.
+
+    Class Attributes:
+        default_limit: The default maximum number of open files.
+
+    Attributes:
+        limit: The maximum number of open files.
+        handles: The open files by key in the order they were last used.
+        uses: The number of current uses of the files by key, files in use are not closed on eviction.
+        pending_closes: The keys of the files in use which were asked to close, they close when their last use ends.
+        hits: The number of requests for a file which was open.
+        misses: The number of requests for a file which had to be opened.
+        evictions: The number of files closed to keep the pool within its limit.
+        lock: The lock which makes the pool safe to use across threads.
+
+    Args:
+        limit: The maximum number of open files.
+        init: Determines if this object will construct.
+    """
+    default_limit: int = 256
+
+    # Magic Methods #
+    # Construction/Destruction
+    def __init__(self, limit: int | None = None, *, init: bool = True) -> None:
+        # New Attributes #
+        self.limit: int = self.default_limit
+        self.handles: OrderedDict[Hashable, Any] = OrderedDict()
+        self.uses: dict[Hashable, int] = {}
+        self.pending_closes: set[Hashable] = set()
+
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+        self.lock: RLock = RLock()
+
+        # Object Construction #
+        if init:
+            self.construct(limit=limit)
+
+    def __len__(self) -> int:
+        return len(self.handles)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.handles
+
+    # Instance Methods #
+    # Constructors/Destructors
+    def construct(self, limit: int | None = None) -> None:
+        """Constructs this object.
+
+        Args:
+            limit: The maximum number of open files.
+        """
+        if limit is not None:
+            self.limit = limit
+
+    # Handles
+    def get_file(self, key: Hashable, opener: Callable[[], Any]) -> Any:
+        """Gets an open file from the pool, opening it if it is not in the pool.
+
+        Args:
+            key: The key of the file, such as its path and mode.
+            opener: The callable which opens the file.
+
+        Returns:
+            The open file.
+        """
+        with self.lock:
+            file = self.handles.get(key, None)
+            if file is not None:
+                self.hits += 1
+                self.handles.move_to_end(key)
+                self.pending_closes.discard(key)
+            else:
+                self.misses += 1
+                self.handles[key] = file = opener()
+                self.evict(exclude=key)
+            return file
+
+    @contextmanager
+    def use_file(self, key: Hashable, opener: Callable[[], Any]) -> Iterator[Any]:
+        """Gets an open file which will not be closed by eviction while it is being used.
+
+        Args:
+            key: The key of the file, such as its path and mode.
+            opener: The callable which opens the file.
+
+        Yields:
+            The open file.
+        """
+        with self.lock:
+            file = self.get_file(key, opener)
+            self.uses[key] = self.uses.get(key, 0) + 1
+        try:
+            yield file
+        finally:
+            with self.lock:
+                count = self.uses[key] - 1
+                if count:
+                    self.uses[key] = count
+                else:
+                    del self.uses[key]
+                    if key in self.pending_closes:
+                        self.close_file(key)
+                    self.evict()
+
+    def evict(self, exclude: Hashable | None = None) -> None:
+        """Closes the least recently used files which are not in use until the pool is within its limit.
+
+        Args:
+            exclude: A key which will not be closed.
+        """
+        with self.lock:
+            if len(self.handles) <= self.limit:
+                return
+
+            for key in [k for k in self.handles if k != exclude and k not in self.uses]:
+                self.handles.pop(key).close()
+                self.evictions += 1
+                if len(self.handles) <= self.limit:
+                    break
+
+    def close_file(self, key: Hashable) -> None:
+        """Closes a file and removes it from the pool, or after its last use ends if it is in use.
+
+        Args:
+            key: The key of the file to close.
+        """
+        with self.lock:
+            if key in self.uses:
+                self.pending_closes.add(key)
+                return
+            self.pending_closes.discard(key)
+            file = self.handles.pop(key, None)
+            if file is not None:
+                file.close()
+
+    def set_limit(self, limit: int) -> None:
+        """Sets the maximum number of open files and closes files if the pool is over the new limit.
+
+        Args:
+            limit: The maximum number of open files.
+        """
+        with self.lock:
+            self.limit = limit
+            self.evict()
+
+    def clear(self) -> None:
+        """Closes all the files in the pool."""
+        with self.lock:
+            self.pending_closes.clear()
+            for key in list(self.handles):
+                self.handles.pop(key).close()
+
+    # Statistics
+    def get_stats(self) -> dict[str, int]:
+        """Gets the counters of the pool.
+
+        Returns:
+            The hits, misses, evictions, number of open files, and limit of the pool.
+        """
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "open": len(self.handles),
+                "limit": self.limit,
+            }
+
+    def reset_stats(self) -> None:
+        """Sets the hit, miss, and eviction counters to zero."""
+        with self.lock:
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
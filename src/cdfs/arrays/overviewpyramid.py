@@ -0,0 +1,473 @@
+"""overviewpyramid.py
+Decimated min, max, and mean levels of the leaves stored in sidecar files for displaying long spans.
+"""
+# Package Header #
+from ..header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Standard Libraries #
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+import os
+import pathlib
+from threading import RLock
+from typing import Any
+
+# Third-Party Packages #
+import numpy as np
+
+# Local Packages #
+
+
+# Definitions #
+# Classes #
+class OverviewPyramid:
+    """Decimated min, max, and mean levels of the leaves stored in sidecar files for displaying long spans.
+
+    Each level of a leaf splits the samples into bins of the decimation factor to the power of the level, so the first
+    level has a bin for every factor samples and each level after has a factor fewer bins than the one before. The
+    levels of a leaf are saved in a sidecar npz file with the shape and the modification time of the leaf's file, so a
+    sidecar is rebuilt when its leaf changes. The levels are built in a background thread from the path and shape of
+    each leaf, so a leaf container is only created by the thread when its levels need to be built, and the most recently
+    used levels are kept in memory.
+
+    Class Attributes:
+        default_factor: The default number of bins of a level which make a bin of the next level.
+        default_block_length: The default number of samples read at a time when building the levels.
+        default_max_leaves: The default number of leaves whose levels are kept in memory.
+        suffix: The suffix added to a leaf's file name to make the name of its sidecar file.
+
+    Attributes:
+        path: The directory of the sidecar files.
+        root: The directory the leaf paths are relative to, which is mirrored in the sidecar directory.
+        factor: The number of bins of a level which make a bin of the next level.
+        block_length: The number of samples read at a time when building the levels.
+        max_leaves: The number of leaves whose levels are kept in memory.
+        leaves: The stamp and levels of the leaves in memory by leaf path in the order they were last used.
+        pending: The builds in progress by leaf path.
+        builds: The number of leaves whose levels were built.
+        executor: The thread which builds the levels.
+        lock: The lock which makes the pyramid safe to use across threads.
+
+    Args:
+        path: The directory of the sidecar files.
+        root: The directory the leaf paths are relative to.
+        factor: The number of bins of a level which make a bin of the next level.
+        block_length: The number of samples read at a time when building the levels.
+        max_leaves: The number of leaves whose levels are kept in memory.
+        init: Determines if this object will construct.
+    """
+    default_factor: int = 16
+    default_block_length: int = 2**16
+    default_max_leaves: int = 256
+    suffix: str = ".overview.npz"
+
+    # Magic Methods #
+    # Construction/Destruction
+    def __init__(
+        self,
+        path: pathlib.Path | str | None = None,
+        root: pathlib.Path | str | None = None,
+        factor: int | None = None,
+        block_length: int | None = None,
+        max_leaves: int | None = None,
+        *,
+        init: bool = True,
+    ) -> None:
+        # New Attributes #
+        self.path: pathlib.Path | None = None
+        self.root: pathlib.Path | None = None
+        self.factor: int = self.default_factor
+        self.block_length: int = self.default_block_length
+        self.max_leaves: int = self.default_max_leaves
+
+        self.leaves: OrderedDict[Hashable, tuple[tuple[Any, ...], list[tuple[np.ndarray, ...]]]] = OrderedDict()
+        self.pending: dict[Hashable, Future] = {}
+        self.builds: int = 0
+
+        self.executor: ThreadPoolExecutor | None = None
+        self.lock: RLock = RLock()
+
+        # Object Construction #
+        if init:
+            self.construct(path=path, root=root, factor=factor, block_length=block_length, max_leaves=max_leaves)
+
+    def __len__(self) -> int:
+        return len(self.leaves)
+
+    # Instance Methods #
+    # Constructors/Destructors
+    def construct(
+        self,
+        path: pathlib.Path | str | None = None,
+        root: pathlib.Path | str | None = None,
+        factor: int | None = None,
+        block_length: int | None = None,
+        max_leaves: int | None = None,
+    ) -> None:
+        """Constructs this object.
+
+        Args:
+            path: The directory of the sidecar files.
+            root: The directory the leaf paths are relative to.
+            factor: The number of bins of a level which make a bin of the next level.
+            block_length: The number of samples read at a time when building the levels.
+            max_leaves: The number of leaves whose levels are kept in memory.
+        """
+        if path is not None:
+            self.path = pathlib.Path(path)
+
+        if root is not None:
+            self.root = pathlib.Path(root)
+
+        if factor is not None and factor != self.factor:
+            if factor < 2:
+                raise ValueError("The decimation factor must be at least 2.")
+            self.factor = factor
+            self.clear()
+
+        if block_length is not None:
+            self.block_length = block_length
+
+        if max_leaves is not None:
+            self.max_leaves = max_leaves
+
+    def get_executor(self) -> ThreadPoolExecutor:
+        """Gets the thread which builds the levels, creating it if it does not exist.
+
+        Returns:
+            The thread pool with the one thread.
+        """
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cdfs_overview")
+        return self.executor
+
+    def close(self) -> None:
+        """Stops the thread which builds the levels and drops the levels in memory."""
+        with self.lock:
+            executor = self.executor
+            self.executor = None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+        self.clear()
+
+    # Sidecars
+    @staticmethod
+    def get_stamp(key: pathlib.Path | str, shape: Iterable[int]) -> tuple[tuple[int, ...], int]:
+        """Gets the values which identify the version of a leaf, its shape and the modification time of its file.
+
+        Args:
+            key: The path of the leaf.
+            shape: The shape of the leaf.
+
+        Returns:
+            The shape of the leaf and the modification time of its file in nanoseconds, -1 if the file does not exist.
+        """
+        try:
+            mtime = os.stat(key).st_mtime_ns
+        except OSError:
+            mtime = -1
+        return tuple(int(n) for n in shape), mtime
+
+    def get_sidecar_path(self, key: pathlib.Path | str) -> pathlib.Path:
+        """Gets the path of the sidecar file of a leaf.
+
+        Args:
+            key: The path of the leaf.
+
+        Returns:
+            The path of the sidecar file.
+        """
+        key = pathlib.Path(key)
+        if self.root is not None and key.is_relative_to(self.root):
+            key = key.relative_to(self.root)
+        else:
+            key = pathlib.Path(key.name)
+        return self.path / key.parent / (key.name + self.suffix)
+
+    def save_levels(
+        self,
+        key: pathlib.Path | str,
+        stamp: tuple[tuple[int, ...], int],
+        levels: list[tuple[np.ndarray, ...]],
+    ) -> None:
+        """Saves the levels of a leaf to its sidecar file, replacing the file once it is written.
+
+        Args:
+            key: The path of the leaf.
+            stamp: The shape of the leaf and the modification time of its file.
+            levels: The min, max, and mean arrays of each level.
+        """
+        path = self.get_sidecar_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        shape, mtime = stamp
+        arrays = {
+            "shape": np.asarray(shape, dtype=np.int64),
+            "mtime": np.int64(mtime),
+            "factor": np.int64(self.factor),
+        }
+        for i, (minimum, maximum, mean) in enumerate(levels):
+            arrays[f"min_{i}"] = minimum
+            arrays[f"max_{i}"] = maximum
+            arrays[f"mean_{i}"] = mean
+
+        temporary = path.with_name(path.name + ".tmp")
+        with temporary.open("wb") as file:
+            np.savez(file, **arrays)
+        os.replace(temporary, path)
+
+    def load_levels(
+        self,
+        key: pathlib.Path | str,
+        stamp: tuple[tuple[int, ...], int],
+    ) -> list[tuple[np.ndarray, ...]] | None:
+        """Loads the levels of a leaf from its sidecar file if the file matches the leaf.
+
+        Args:
+            key: The path of the leaf.
+            stamp: The current shape of the leaf and the modification time of its file.
+
+        Returns:
+            The min, max, and mean arrays of each level, or None if there is no matching sidecar file.
+        """
+        path = self.get_sidecar_path(key)
+        if not path.is_file():
+            return None
+
+        shape, mtime = stamp
+        try:
+            with np.load(path) as file:
+                if (
+                    tuple(file["shape"]) != shape
+                    or "mtime" not in file.files
+                    or int(file["mtime"]) != mtime
+                    or int(file["factor"]) != self.factor
+                ):
+                    return None
+                n_levels = sum(1 for name in file.files if name.startswith("min_"))
+                return [(file[f"min_{i}"], file[f"max_{i}"], file[f"mean_{i}"]) for i in range(n_levels)]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    # Levels
+    @staticmethod
+    def reduce_bins(
+        minimum: np.ndarray,
+        maximum: np.ndarray,
+        mean: np.ndarray,
+        counts: np.ndarray,
+        factor: int,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Combines every factor bins into one bin along the first axis.
+
+        Args:
+            minimum: The minimum of each bin.
+            maximum: The maximum of each bin.
+            mean: The mean of each bin.
+            counts: The number of samples in each bin.
+            factor: The number of bins to combine.
+
+        Returns:
+            The minimum, maximum, mean, and number of samples of the combined bins.
+        """
+        n_bins = -(-len(counts) // factor)
+        padding = n_bins * factor - len(counts)
+        if padding:
+            pad_width = [(0, padding)] + [(0, 0)] * (minimum.ndim - 1)
+            minimum = np.pad(minimum, pad_width, mode="edge")
+            maximum = np.pad(maximum, pad_width, mode="edge")
+            mean = np.pad(mean, pad_width)
+            counts = np.pad(counts, (0, padding))
+
+        shape = (n_bins, factor) + minimum.shape[1:]
+        weights = counts.reshape((n_bins, factor) + (1,) * (minimum.ndim - 1))
+        totals = weights.sum(axis=1)
+        return (
+            minimum.reshape(shape).min(axis=1),
+            maximum.reshape(shape).max(axis=1),
+            (mean.reshape(shape) * weights).sum(axis=1) / totals,
+            totals.reshape(n_bins),
+        )
+
+    def build_levels(self, leaf: Any, axis: int = 0) -> tuple[tuple[int, ...], list[tuple[np.ndarray, ...]]]:
+        """Reads a leaf in blocks and builds its levels.
+
+        Args:
+            leaf: The leaf to build the levels of.
+            axis: The axis the samples are along.
+
+        Returns:
+            The shape of the leaf and the min, max, and mean arrays of each level with the samples along the first axis.
+        """
+        factor = self.factor
+        block_length = max(self.block_length // factor, 1) * factor
+        parts = []
+        with leaf.use_file():
+            data = leaf.data
+            shape = tuple(data.shape)
+            slices = [slice(None)] * len(shape)
+            for start in range(0, shape[axis], block_length):
+                slices[axis] = slice(start, start + block_length)
+                block = np.moveaxis(np.asarray(data[tuple(slices)]), axis, 0)
+                counts = np.ones(block.shape[0], dtype=np.int64)
+                parts.append(self.reduce_bins(block, block, block.astype(np.float64), counts, factor))
+
+        if not parts:
+            return shape, []
+
+        minimum, maximum, mean, counts = (np.concatenate(arrays) for arrays in zip(*parts))
+        levels = [(minimum, maximum, mean)]
+        while len(counts) > 1:
+            minimum, maximum, mean, counts = self.reduce_bins(minimum, maximum, mean, counts, factor)
+            levels.append((minimum, maximum, mean))
+        return shape, levels
+
+    def build_entry(
+        self,
+        key: pathlib.Path | str,
+        shape: Iterable[int],
+        create_leaf: Callable[[], Any],
+        axis: int = 0,
+        force: bool = False,
+    ) -> list[tuple[np.ndarray, ...]]:
+        """Gets the levels of a leaf from its sidecar file or creates the leaf, builds them, and saves the sidecar file.
+
+        Args:
+            key: The path of the leaf.
+            shape: The shape of the leaf.
+            create_leaf: The callable which creates the leaf container, only called if the levels are built.
+            axis: The axis the samples are along.
+            force: Determines if the levels will be built even if the sidecar file matches the leaf.
+
+        Returns:
+            The min, max, and mean arrays of each level.
+        """
+        stamp = self.get_stamp(key, shape)
+        levels = None if force else self.load_levels(key, stamp)
+        if levels is None:
+            shape, levels = self.build_levels(create_leaf(), axis)
+            stamp = (shape, stamp[1])
+            self.save_levels(key, stamp, levels)
+            with self.lock:
+                self.builds += 1
+
+        with self.lock:
+            self.leaves[key] = (stamp, levels)
+            self.leaves.move_to_end(key)
+            while len(self.leaves) > self.max_leaves:
+                self.leaves.popitem(last=False)
+        return levels
+
+    def build_leaf(self, leaf: Any, axis: int = 0, force: bool = False) -> list[tuple[np.ndarray, ...]]:
+        """Gets the levels of a leaf from its sidecar file or builds them and saves the sidecar file.
+
+        Args:
+            leaf: The leaf to get the levels of.
+            axis: The axis the samples are along.
+            force: Determines if the levels will be built even if the sidecar file matches the leaf.
+
+        Returns:
+            The min, max, and mean arrays of each level.
+        """
+        return self.build_entry(leaf.path, leaf.shape, lambda: leaf, axis, force)
+
+    def is_current(self, key: Hashable, shape: Iterable[int]) -> bool:
+        """Checks if the levels of a leaf in memory match the current shape and file of the leaf.
+
+        Args:
+            key: The path of the leaf.
+            shape: The current shape of the leaf.
+
+        Returns:
+            If the levels in memory match the leaf.
+        """
+        stamp = self.get_stamp(key, shape)
+        with self.lock:
+            entry = self.leaves.get(key, None)
+            return entry is not None and entry[0] == stamp
+
+    def get_leaf(self, leaf: Any, axis: int = 0) -> list[tuple[np.ndarray, ...]]:
+        """Gets the levels of a leaf, waiting on a build in progress or building them now if they do not exist.
+
+        Args:
+            leaf: The leaf to get the levels of.
+            axis: The axis the samples are along.
+
+        Returns:
+            The min, max, and mean arrays of each level.
+        """
+        key = leaf.path
+        with self.lock:
+            future = self.pending.get(key, None)
+        if future is not None:
+            future.result()
+
+        with self.lock:
+            if self.is_current(key, leaf.shape):
+                self.leaves.move_to_end(key)
+                return self.leaves[key][1]
+        return self.build_leaf(leaf, axis)
+
+    def schedule(
+        self,
+        entries: Iterable[tuple[Hashable, Iterable[int], Callable[[], Any]]],
+        axis: int = 0,
+    ) -> list[Future]:
+        """Starts building the levels of the leaves which are not current or being built in the background.
+
+        Args:
+            entries: The path, shape, and callable which creates the leaf container of each leaf to build.
+            axis: The axis the samples are along.
+
+        Returns:
+            The builds which were started.
+        """
+        futures = []
+        with self.lock:
+            for key, shape, create_leaf in entries:
+                if key not in self.pending and not self.is_current(key, shape):
+                    future = self.get_executor().submit(self.build_entry, key, shape, create_leaf, axis)
+                    self.pending[key] = future
+                    future.add_done_callback(lambda f, key=key: self.finish_build(key, f))
+                    futures.append(future)
+        return futures
+
+    def finish_build(self, key: Hashable, future: Future) -> None:
+        """Removes a finished build from the builds in progress.
+
+        Args:
+            key: The path of the leaf.
+            future: The finished build.
+        """
+        with self.lock:
+            if self.pending.get(key, None) is future:
+                del self.pending[key]
+
+    def wait(self) -> None:
+        """Waits for the builds in progress to finish."""
+        with self.lock:
+            futures = list(self.pending.values())
+        for future in futures:
+            future.result()
+
+    def invalidate_leaf(self, key: Hashable) -> None:
+        """Drops the levels of a leaf from memory.
+
+        Args:
+            key: The path of the leaf.
+        """
+        with self.lock:
+            self.leaves.pop(key, None)
+
+    def clear(self) -> None:
+        """Drops all the levels in memory."""
+        with self.lock:
+            self.leaves.clear()
@@ -0,0 +1,311 @@
+"""readaheadprefetcher.py
+A prefetcher which warms the leaves ahead of forward sequential reads in a background thread.
+"""
+# Package Header #
+from ..header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Standard Libraries #
+from collections import OrderedDict
+from collections.abc import Hashable, Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import RLock
+from typing import Any
+
+# Third-Party Packages #
+import numpy as np
+
+# Local Packages #
+
+
+# Definitions #
+# Classes #
+class ReadAheadPrefetcher:
+    """A prefetcher which warms the leaves ahead of forward sequential reads in a background thread.
+
+    When a read continues forward from the previous read, the leaves after it are opened and their first chunks are read
+    in a background thread. The next read takes the warmed chunks instead of waiting on opening the leaves and reading
+    them. Each warmed chunk is used once and the warmed chunks are kept within a memory budget.
+
+    Class Attributes:
+        default_depth: The default number of leaves to warm ahead of a read.
+        default_memory_budget: The default maximum number of bytes of warmed chunks.
+        default_chunk_length: The default number of samples to warm when a leaf's data is not chunked.
+
+    Attributes:
+        depth: The number of leaves to warm ahead of a read.
+        memory_budget: The maximum number of bytes of warmed chunks.
+        chunk_length: The number of samples to warm when a leaf's data is not chunked.
+        last_start: The first sample index of the previous read.
+        last_stop: The sample index after the previous read.
+        generation: The number of times the read position was abandoned, which makes older warms stale.
+        pending: The chunks being warmed by leaf key and start index.
+        blocks: The warmed chunks by leaf key and start index in the order they were warmed.
+        nbytes: The number of bytes of the warmed chunks.
+        hits: The number of leaf reads which started from a warmed chunk.
+        misses: The number of leaf reads which had no warmed chunk.
+        prefetches: The number of chunks which were warmed.
+        drops: The number of warmed chunks dropped to stay within the memory budget.
+        executor: The thread which warms the chunks.
+        lock: The lock which makes the prefetcher safe to use across threads.
+
+    Args:
+        depth: The number of leaves to warm ahead of a read.
+        memory_budget: The maximum number of bytes of warmed chunks.
+        chunk_length: The number of samples to warm when a leaf's data is not chunked.
+        init: Determines if this object will construct.
+    """
+    default_depth: int = 2
+    default_memory_budget: int = 64 * 2**20
+    default_chunk_length: int = 4096
+
+    # Magic Methods #
+    # Construction/Destruction
+    def __init__(
+        self,
+        depth: int | None = None,
+        memory_budget: int | None = None,
+        chunk_length: int | None = None,
+        *,
+        init: bool = True,
+    ) -> None:
+        # New Attributes #
+        self.depth: int = self.default_depth
+        self.memory_budget: int = self.default_memory_budget
+        self.chunk_length: int = self.default_chunk_length
+
+        self.last_start: int | None = None
+        self.last_stop: int | None = None
+        self.generation: int = 0
+
+        self.pending: dict[tuple[Hashable, int], Future] = {}
+        self.blocks: OrderedDict[tuple[Hashable, int], np.ndarray] = OrderedDict()
+        self.nbytes: int = 0
+
+        self.hits: int = 0
+        self.misses: int = 0
+        self.prefetches: int = 0
+        self.drops: int = 0
+
+        self.executor: ThreadPoolExecutor | None = None
+        self.lock: RLock = RLock()
+
+        # Object Construction #
+        if init:
+            self.construct(depth=depth, memory_budget=memory_budget, chunk_length=chunk_length)
+
+    def __len__(self) -> int:
+        return len(self.blocks)
+
+    # Instance Methods #
+    # Constructors/Destructors
+    def construct(
+        self,
+        depth: int | None = None,
+        memory_budget: int | None = None,
+        chunk_length: int | None = None,
+    ) -> None:
+        """Constructs this object.
+
+        Args:
+            depth: The number of leaves to warm ahead of a read.
+            memory_budget: The maximum number of bytes of warmed chunks.
+            chunk_length: The number of samples to warm when a leaf's data is not chunked.
+        """
+        if depth is not None:
+            self.depth = depth
+
+        if memory_budget is not None:
+            self.memory_budget = memory_budget
+
+        if chunk_length is not None:
+            self.chunk_length = chunk_length
+
+    def get_executor(self) -> ThreadPoolExecutor:
+        """Gets the thread which warms the chunks, creating it if it does not exist.
+
+        Returns:
+            The thread pool with the one thread.
+        """
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cdfs_prefetch")
+        return self.executor
+
+    def close(self) -> None:
+        """Stops the thread which warms the chunks and drops the warmed chunks."""
+        with self.lock:
+            executor = self.executor
+            self.executor = None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+        self.clear()
+
+    # Prefetching
+    def is_sequential(self, start: int, stop: int) -> bool:
+        """Records a read and determines if it continues forward from the previous read.
+
+        Args:
+            start: The first sample index of the read.
+            stop: The sample index after the read.
+
+        Returns:
+            If the read starts after the start of the previous read and no later than its end.
+        """
+        with self.lock:
+            sequential = self.last_stop is not None and self.last_start < start <= self.last_stop
+            if not sequential:
+                self.abandon()
+            self.last_start = start
+            self.last_stop = stop
+            return sequential
+
+    def schedule(self, segments: Iterable[tuple[Any, int, int, int]], axis: int = 0) -> None:
+        """Starts warming the chunks at the starts of leaf segments which are not warm or being warmed.
+
+        Args:
+            segments: The leaf, the start and stop within the leaf, and the position of the segments ahead of a read.
+            axis: The axis the samples are along.
+        """
+        with self.lock:
+            for leaf, start, _, _ in list(segments)[:self.depth]:
+                key = (leaf.path, start)
+                if key not in self.pending and key not in self.blocks:
+                    self.pending[key] = self.get_executor().submit(
+                        self.warm_leaf,
+                        key,
+                        leaf,
+                        start,
+                        axis,
+                        self.generation,
+                    )
+
+    def warm_leaf(
+        self,
+        key: tuple[Hashable, int],
+        leaf: Any,
+        start: int,
+        axis: int = 0,
+        generation: int | None = None,
+    ) -> None:
+        """Opens a leaf and reads the chunk at a sample index into the warmed chunks.
+
+        The chunk is thrown away if the read position was abandoned while it was being read.
+
+        Args:
+            key: The key of the leaf and the start index.
+            leaf: The leaf to warm.
+            start: The sample index within the leaf to warm from.
+            axis: The axis the samples are along.
+            generation: The generation the warm was scheduled in, defaults to the current generation.
+        """
+        block = None
+        try:
+            with leaf.use_file():
+                data = leaf.data
+                chunks = getattr(data, "chunks", None)
+                sample_bytes = data.dtype.itemsize * int(np.prod(data.shape)) // max(data.shape[axis], 1)
+                length = min(
+                    chunks[axis] if chunks else self.chunk_length,
+                    self.memory_budget // max(sample_bytes, 1),
+                    data.shape[axis] - start,
+                )
+                if length > 0:
+                    slices = [slice(None)] * data.ndim
+                    slices[axis] = slice(start, start + length)
+                    block = data[tuple(slices)]
+        except Exception:
+            block = None
+
+        with self.lock:
+            if generation is not None and generation != self.generation:
+                return
+            self.pending.pop(key, None)
+            if block is None:
+                return
+
+            self.blocks[key] = block
+            self.nbytes += block.nbytes
+            self.prefetches += 1
+            while self.nbytes > self.memory_budget and len(self.blocks) > 1:
+                self.nbytes -= self.blocks.popitem(last=False)[1].nbytes
+                self.drops += 1
+
+    def take_block(self, key: Hashable, start: int, stop: int, axis: int = 0) -> np.ndarray | None:
+        """Takes the warmed chunk of a leaf at a start index, waiting on the chunk if it is being warmed.
+
+        Args:
+            key: The key of the leaf.
+            start: The first sample index within the leaf to take.
+            stop: The sample index after the range to take.
+            axis: The axis the samples are along.
+
+        Returns:
+            The warmed samples from the start up to the stop or the end of the chunk, or None if the start is not warm.
+        """
+        key = (key, start)
+        with self.lock:
+            future = self.pending.get(key, None)
+        if future is not None:
+            future.result()
+
+        with self.lock:
+            block = self.blocks.pop(key, None)
+            if block is None:
+                self.misses += 1
+                return None
+
+            self.nbytes -= block.nbytes
+            self.hits += 1
+
+        slices = [slice(None)] * block.ndim
+        slices[axis] = slice(0, min(stop - start, block.shape[axis]))
+        return block[tuple(slices)]
+
+    def abandon(self) -> None:
+        """Drops the warmed chunks and makes the chunks being warmed stale, so they are thrown away when read."""
+        with self.lock:
+            self.generation += 1
+            for future in self.pending.values():
+                future.cancel()
+            self.pending.clear()
+            self.blocks.clear()
+            self.nbytes = 0
+
+    def clear(self) -> None:
+        """Drops the warmed chunks, makes the chunks being warmed stale, and forgets the previous read."""
+        with self.lock:
+            self.abandon()
+            self.last_start = None
+            self.last_stop = None
+
+    # Statistics
+    def get_stats(self) -> dict[str, int]:
+        """Gets the counters of the prefetcher.
+
+        Returns:
+            The hits, misses, prefetches, drops, and the number and bytes of the warmed chunks.
+        """
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "prefetches": self.prefetches,
+                "drops": self.drops,
+                "blocks": len(self.blocks),
+                "nbytes": self.nbytes,
+            }
+
+    def reset_stats(self) -> None:
+        """Sets the hit, miss, prefetch, and drop counters to zero."""
+        with self.lock:
+            self.hits = 0
+            self.misses = 0
+            self.prefetches = 0
+            self.drops = 0
@@ -0,0 +1,499 @@
+"""timecontentsleaftable.py
+A sequence of the children of a node which stores the leaves as rows of arrays.
+"""
+# Package Header #
+from ..header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Standard Libraries #
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Iterator, MutableSequence
+import datetime
+from threading import RLock
+from typing import Any
+
+# Third-Party Packages #
+import numpy as np
+
+# Local Packages #
+
+
+# Definitions #
+# Classes #
+class TimeContentsLeafTable(MutableSequence):
+    """A sequence of the children of a node which stores the leaves as rows of parallel arrays.
+
+    Nodes are stored as objects, but leaves are stored as a row of path ids, axes, shape ids, timezone ids, starts,
+    ends, and sample rates. The arrays grow by doubling, so they can hold more rows than there are paths. A leaf
+    container is only created when its leaf is accessed and the created leaves are kept in a least recently used cache,
+    so only the leaves being read exist as objects. The cache is guarded by a lock, so leaves can be gotten from several
+    threads, and the leaf containers it evicts or drops are closed.
+
+    Class Attributes:
+        default_max_materialized: The default maximum number of leaf containers to keep.
+        leaf_keys: The keyword arguments of a leaf which are stored in the arrays.
+
+    Attributes:
+        leaf_factory: The callable which creates a leaf container from keyword arguments.
+        max_materialized: The maximum number of leaf containers to keep.
+        leaf_kwargs: The keyword arguments given to every leaf container when it is created.
+        children: The node objects of the children, None for the children which are leaves.
+        leaf_rows: The leaf row of each child, -1 for the children which are nodes.
+        paths: The names of the leaves, the index of a name is its path id.
+        path_rows: The leaf rows of the names.
+        axes: The axis of each leaf.
+        shapes: The unique shapes of the leaves.
+        shape_index: The id of each unique shape.
+        shape_ids: The id of the shape of each leaf.
+        tzinfos: The unique timezones of the leaves.
+        tzinfo_index: The id of each unique timezone.
+        tzinfo_ids: The id of the timezone of each leaf.
+        starts: The start nanostamp of each leaf.
+        ends: The end nanostamp of each leaf.
+        sample_rates: The sample rate of each leaf.
+        extra_kwargs: Additional keyword arguments of leaves which are not stored in the arrays.
+        materialized: The created leaf containers by leaf row in the order they were last used.
+        lock: The lock which guards the created leaf containers.
+
+    Args:
+        leaf_factory: The callable which creates a leaf container from keyword arguments.
+        max_materialized: The maximum number of leaf containers to keep.
+        init: Determines if this object will construct.
+    """
+    default_max_materialized: int = 128
+    leaf_keys: set[str] = {"path", "axis", "shape", "tzinfo", "start", "end", "sample_rate"}
+
+    # Magic Methods #
+    # Construction/Destruction
+    def __init__(
+        self,
+        leaf_factory: Callable[..., Any] | None = None,
+        max_materialized: int | None = None,
+        *,
+        init: bool = True,
+    ) -> None:
+        # New Attributes #
+        self.leaf_factory: Callable[..., Any] | None = None
+        self.max_materialized: int = self.default_max_materialized
+        self.leaf_kwargs: dict[str, Any] = {}
+
+        self.children: list[Any | None] = []
+        self.leaf_rows: np.ndarray = np.empty(0, dtype=np.int64)
+
+        self.paths: list[str] = []
+        self.path_rows: dict[str, int] = {}
+        self.axes: np.ndarray = np.empty(0, dtype=np.int8)
+        self.shapes: list[tuple[int, ...]] = []
+        self.shape_index: dict[tuple[int, ...], int] = {}
+        self.shape_ids: np.ndarray = np.empty(0, dtype=np.int32)
+        self.tzinfos: list[datetime.tzinfo | None] = []
+        self.tzinfo_index: dict[datetime.tzinfo | None, int] = {}
+        self.tzinfo_ids: np.ndarray = np.empty(0, dtype=np.int32)
+        self.starts: np.ndarray = np.empty(0, dtype=np.int64)
+        self.ends: np.ndarray = np.empty(0, dtype=np.int64)
+        self.sample_rates: np.ndarray = np.empty(0, dtype=np.float64)
+        self.extra_kwargs: dict[int, dict[str, Any]] = {}
+
+        self.materialized: OrderedDict[int, Any] = OrderedDict()
+        self.lock: RLock = RLock()
+
+        # Object Construction #
+        if init:
+            self.construct(leaf_factory=leaf_factory, max_materialized=max_materialized)
+
+    # Container Methods
+    def __len__(self) -> int:
+        return len(self.children)
+
+    def __getitem__(self, index: int | slice) -> Any:
+        if isinstance(index, slice):
+            return [self.get_child(i) for i in range(*index.indices(len(self.children)))]
+        else:
+            return self.get_child(index)
+
+    def __setitem__(self, index: int | slice, value: Any) -> None:
+        replaced = self.leaf_rows[index]
+        if isinstance(index, slice):
+            value = list(value)
+            self.children[index] = value
+            rows = self.leaf_rows.tolist()
+            rows[index] = [-1] * len(value)
+            self.leaf_rows = np.asarray(rows, dtype=np.int64)
+        else:
+            self.children[index] = value
+            self.leaf_rows[index] = -1
+        for leaf in self._forget_rows(np.atleast_1d(replaced)):
+            leaf.close()
+
+    def __delitem__(self, index: int | slice) -> None:
+        removed = np.arange(self.leaf_rows.size)[index]
+        for leaf in self._forget_rows(np.atleast_1d(self.leaf_rows[removed])):
+            leaf.close()
+        del self.children[index]
+        self.leaf_rows = np.delete(self.leaf_rows, removed)
+
+    # Instance Methods #
+    # Constructors/Destructors
+    def construct(self, leaf_factory: Callable[..., Any] | None = None, max_materialized: int | None = None) -> None:
+        """Constructs this object.
+
+        Args:
+            leaf_factory: The callable which creates a leaf container from keyword arguments.
+            max_materialized: The maximum number of leaf containers to keep.
+        """
+        if leaf_factory is not None:
+            self.leaf_factory = leaf_factory
+
+        if max_materialized is not None:
+            self.max_materialized = max_materialized
+
+    # Sequence
+    def insert(self, index: int, value: Any) -> None:
+        """Inserts a node object as a child.
+
+        Args:
+            index: The index to insert the child at.
+            value: The child to insert.
+        """
+        size = len(self.children)
+        position = min(index, size) if index >= 0 else max(size + index, 0)
+        self.children.insert(position, value)
+        self.leaf_rows = np.insert(self.leaf_rows, position, -1)
+
+    def clear(self) -> None:
+        """Removes all children and leaf rows, closing the leaf containers which exist."""
+        with self.lock:
+            leaves = list(self.materialized.values())
+            self.materialized.clear()
+            self.children.clear()
+            self.leaf_rows = np.empty(0, dtype=np.int64)
+            self.paths.clear()
+            self.path_rows.clear()
+            self.axes = np.empty(0, dtype=np.int8)
+            self.shapes.clear()
+            self.shape_index.clear()
+            self.shape_ids = np.empty(0, dtype=np.int32)
+            self.tzinfos.clear()
+            self.tzinfo_index.clear()
+            self.tzinfo_ids = np.empty(0, dtype=np.int32)
+            self.starts = np.empty(0, dtype=np.int64)
+            self.ends = np.empty(0, dtype=np.int64)
+            self.sample_rates = np.empty(0, dtype=np.float64)
+            self.extra_kwargs.clear()
+        for leaf in leaves:
+            leaf.close()
+
+    def clear_children(self) -> None:
+        """Removes all the children, but keeps the leaf rows and leaf containers."""
+        self.children.clear()
+        self.leaf_rows = np.empty(0, dtype=np.int64)
+
+    def sort(self, key: Callable[[Any], Any] | None = None, reverse: bool = False) -> None:
+        """Sorts the children, which creates all the leaf containers to use as the sort basis.
+
+        Args:
+            key: The key to sort the children with.
+            reverse: Determines if the sort will be reversed.
+        """
+        children = [self.get_child(i) for i in range(len(self.children))]
+        order = sorted(range(len(children)), key=lambda i: key(children[i]) if key else children[i], reverse=reverse)
+        self.reorder(order)
+
+    def extend_children(self, children: Iterable[Any]) -> None:
+        """Adds children to the end which are either node objects or leaf rows.
+
+        Args:
+            children: The children to add, integers are leaf rows.
+        """
+        children = list(children)
+        rows = [c if isinstance(c, int) else -1 for c in children]
+        self.children.extend(None if isinstance(c, int) else c for c in children)
+        self.leaf_rows = np.concatenate((self.leaf_rows, np.asarray(rows, dtype=np.int64)))
+
+    def remove_children(self, indices: Iterable[int]) -> list[Any]:
+        """Removes children, forgetting the names of the removed leaves so the names can be added again.
+
+        Args:
+            indices: The indices of the children to remove.
+
+        Returns:
+            The leaf containers of the removed leaves which existed.
+        """
+        keep = np.ones(len(self.children), dtype=bool)
+        keep[np.asarray(list(indices), dtype=np.int64)] = False
+        removed = self._forget_rows(self.leaf_rows[~keep])
+        self.children = [c for c, k in zip(self.children, keep.tolist()) if k]
+        self.leaf_rows = self.leaf_rows[keep]
+        return removed
+
+    def _forget_rows(self, rows: np.ndarray) -> list[Any]:
+        removed = []
+        with self.lock:
+            for row in rows[rows >= 0].tolist():
+                self.path_rows.pop(self.paths[row], None)
+                self.extra_kwargs.pop(row, None)
+                if (leaf := self.materialized.pop(row, None)) is not None:
+                    removed.append(leaf)
+        return removed
+
+    def reorder(self, order: Iterable[int]) -> None:
+        """Reorders the children without creating any leaf containers.
+
+        Args:
+            order: The indices of the children in their new order.
+        """
+        order = np.asarray(order, dtype=np.int64)
+        self.children = [self.children[i] for i in order.tolist()]
+        self.leaf_rows = self.leaf_rows[order]
+
+    def get_slot(self, index: int) -> Any:
+        """Gets a child without creating a leaf container.
+
+        Args:
+            index: The index of the child.
+
+        Returns:
+            The node object or the leaf row of the child.
+        """
+        row = int(self.leaf_rows[index])
+        return self.children[index] if row < 0 else row
+
+    def leaf_slots(self) -> np.ndarray:
+        """Gets the index of the child of every leaf row.
+
+        Returns:
+            The child indices by leaf row.
+        """
+        slots = np.full(len(self.paths), -1, dtype=np.int64)
+        is_leaf = self.leaf_rows >= 0
+        slots[self.leaf_rows[is_leaf]] = np.flatnonzero(is_leaf)
+        return slots
+
+    # Leaves
+    def _get_id(self, values: list, index: dict[Any, int], value: Any) -> int:
+        id_ = index.get(value, None)
+        if id_ is None:
+            index[value] = id_ = len(values)
+            values.append(value)
+        return id_
+
+    def resize_rows(self, size: int) -> None:
+        """Changes the number of leaf rows the arrays can hold.
+
+        Args:
+            size: The new number of rows.
+        """
+        self.axes = np.resize(self.axes, size)
+        self.shape_ids = np.resize(self.shape_ids, size)
+        self.tzinfo_ids = np.resize(self.tzinfo_ids, size)
+        self.starts = np.resize(self.starts, size)
+        self.ends = np.resize(self.ends, size)
+        self.sample_rates = np.resize(self.sample_rates, size)
+
+    def add_leaf(
+        self,
+        path: str,
+        axis: int = 0,
+        shape: tuple[int, ...] = (0,),
+        tzinfo: datetime.tzinfo | None = None,
+        start: int | None = None,
+        end: int | None = None,
+        sample_rate: float | None = None,
+        **kwargs: Any,
+    ) -> int:
+        """Adds a leaf row without making it a child.
+
+        Args:
+            path: The name of the leaf within the node.
+            axis: The axis of the data which the leaf extends.
+            shape: The shape of the leaf.
+            tzinfo: The time zone of the leaf.
+            start: The start nanostamp of the leaf.
+            end: The end nanostamp of the leaf.
+            sample_rate: The sample rate of the leaf.
+            **kwargs: Additional keyword arguments for creating the leaf container.
+
+        Returns:
+            The leaf row.
+        """
+        row = len(self.paths)
+        if row >= self.starts.size:
+            self.resize_rows(max(16, 2 * row))
+
+        self.paths.append(path)
+        self.path_rows[path] = row
+        self.axes[row] = axis
+        self.shape_ids[row] = self._get_id(self.shapes, self.shape_index, tuple(shape))
+        self.tzinfo_ids[row] = self._get_id(self.tzinfos, self.tzinfo_index, tzinfo)
+        self.starts[row] = -1 if start is None else start
+        self.ends[row] = -1 if end is None else end
+        self.sample_rates[row] = np.nan if sample_rate is None else sample_rate
+        if kwargs:
+            self.extra_kwargs[row] = kwargs
+        return row
+
+    def update_leaf(self, row: int, **kwargs: Any) -> None:
+        """Updates the values of a leaf row and its leaf container if it exists.
+
+        Args:
+            row: The leaf row to update.
+            **kwargs: The values to update.
+        """
+        if (axis := kwargs.get("axis", None)) is not None:
+            self.axes[row] = axis
+        if (shape := kwargs.get("shape", None)) is not None:
+            self.shape_ids[row] = self._get_id(self.shapes, self.shape_index, tuple(shape))
+        if (tzinfo := kwargs.get("tzinfo", None)) is not None:
+            self.tzinfo_ids[row] = self._get_id(self.tzinfos, self.tzinfo_index, tzinfo)
+        if (start := kwargs.get("start", None)) is not None:
+            self.starts[row] = start
+        if (end := kwargs.get("end", None)) is not None:
+            self.ends[row] = end
+        if (sample_rate := kwargs.get("sample_rate", None)) is not None:
+            self.sample_rates[row] = sample_rate
+
+        extra_kwargs = {k: v for k, v in kwargs.items() if k not in self.leaf_keys}
+        if extra_kwargs:
+            self.extra_kwargs[row] = self.extra_kwargs.get(row, {}) | extra_kwargs
+
+        with self.lock:
+            leaf = self.materialized.get(row, None)
+        if leaf is not None:
+            leaf.update_defaults(**{k: v for k, v in kwargs.items() if k != "path"})
+
+    def find_leaf(self, path: str) -> int | None:
+        """Finds the leaf row of a leaf name.
+
+        Args:
+            path: The name of the leaf within the node.
+
+        Returns:
+            The leaf row or None if the name is not a leaf.
+        """
+        return self.path_rows.get(path, None)
+
+    def get_leaf_kwargs(self, row: int) -> dict[str, Any]:
+        """Gets the keyword arguments to create a leaf container from a leaf row.
+
+        Args:
+            row: The leaf row.
+
+        Returns:
+            The keyword arguments of the leaf.
+        """
+        start = self.starts[row]
+        end = self.ends[row]
+        sample_rate = self.sample_rates[row]
+        return self.leaf_kwargs | self.extra_kwargs.get(row, {}) | {
+            "path": self.paths[row],
+            "axis": int(self.axes[row]),
+            "shape": self.shapes[self.shape_ids[row]],
+            "tzinfo": self.tzinfos[self.tzinfo_ids[row]],
+            "start": None if start < 0 else np.uint64(start),
+            "end": None if end < 0 else np.uint64(end),
+            "sample_rate": None if np.isnan(sample_rate) else float(sample_rate),
+        }
+
+    def get_leaf_length(self, row: int) -> int:
+        """Gets the length of a leaf along its axis.
+
+        Args:
+            row: The leaf row.
+
+        Returns:
+            The length of the leaf.
+        """
+        return self.shapes[self.shape_ids[row]][self.axes[row]]
+
+    def get_leaf(self, row: int) -> Any:
+        """Gets the leaf container of a leaf row, creating it if it does not exist.
+
+        When the cache is over its size, the least recently used leaf containers are removed and closed.
+
+        Args:
+            row: The leaf row.
+
+        Returns:
+            The leaf container.
+        """
+        evicted = []
+        with self.lock:
+            leaf = self.materialized.get(row, None)
+            if leaf is None:
+                self.materialized[row] = leaf = self.leaf_factory(**self.get_leaf_kwargs(row))
+                while len(self.materialized) > self.max_materialized:
+                    evicted.append(self.materialized.popitem(last=False)[1])
+            else:
+                self.materialized.move_to_end(row)
+
+        for old_leaf in evicted:
+            old_leaf.close()
+        return leaf
+
+    def get_child(self, index: int) -> Any:
+        """Gets a child, creating its leaf container if it is a leaf.
+
+        Args:
+            index: The index of the child.
+
+        Returns:
+            The child.
+        """
+        row = int(self.leaf_rows[index])
+        return self.children[index] if row < 0 else self.get_leaf(row)
+
+    def evict(self, row: int | None = None) -> None:
+        """Drops leaf containers and closes them.
+
+        Args:
+            row: The leaf row of the leaf container to drop, all are dropped if None.
+        """
+        with self.lock:
+            if row is None:
+                evicted = list(self.materialized.values())
+                self.materialized.clear()
+            else:
+                evicted = [leaf] if (leaf := self.materialized.pop(row, None)) is not None else []
+        for leaf in evicted:
+            leaf.close()
+
+    def iter_materialized(self) -> Iterator[Any]:
+        """Iterates over the node objects and the leaf containers which exist.
+
+        Returns:
+            The children which are objects.
+        """
+        yield from (c for c in self.children if c is not None)
+        with self.lock:
+            leaves = list(self.materialized.values())
+        yield from leaves
+
+    # Getters
+    def get_shapes(self) -> tuple[tuple[int, ...], ...]:
+        """Gets the shapes of the children without creating leaf containers.
+
+        Returns:
+            The shapes of the children.
+        """
+        rows = self.leaf_rows.tolist()
+        return tuple(
+            self.children[i].get_shape() if r < 0 else self.shapes[self.shape_ids[r]] for i, r in enumerate(rows)
+        )
+
+    def get_sample_rates(self) -> tuple[float, ...]:
+        """Gets the sample rates of the children without creating leaf containers.
+
+        Returns:
+            The sample rates of the children.
+        """
+        rows = self.leaf_rows.tolist()
+        return tuple(
+            self.children[i].get_sample_rate() if r < 0 else float(self.sample_rates[r]) for i, r in enumerate(rows)
+        )
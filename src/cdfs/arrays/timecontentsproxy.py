@@ -14,27 +14,67 @@ __email__ = __email__
 # Imports #
 # Standard Libraries #
 from abc import abstractmethod
-from collections.abc import Iterable
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator, Hashable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 import datetime
 from decimal import Decimal
+from functools import partial
+from math import ceil
 import pathlib
 from typing import Any
 from warnings import warn
 
 # Third-Party Packages #
 from baseobjects.cachingtools import timed_keyless_cache
+from dspobjects.dataclasses import IndexValue
 from dspobjects.time import Timestamp, nanostamp
 from proxyarrays import BaseContainerFileTimeSeries, BaseDirectoryTimeSeries, DirectoryTimeSeriesProxy
+from proxyarrays.proxyarray.proxyarray import ProxyIndex
 import numpy as np
+from sqlalchemy import Row
 
 # Local Packages #
 from ..contentsfile.sqlite import TimeContentsFile
+from .blockcache import BlockCache
+from .filehandlepool import FileHandlePool
+from .overviewpyramid import OverviewPyramid
+from .readaheadprefetcher import ReadAheadPrefetcher
+from .timecontentsleaftable import TimeContentsLeafTable
 
 
 # Definitions #
 # Classes #
 class BaseTimeContentsLeafContainer(BaseContainerFileTimeSeries):
+    """A leaf of a time contents proxy which wraps one file.
+
+    The leaf is given its shape, sample rate, start, end, and time zone from the contents file. When it trusts the
+    contents, it answers these from the given values and only opens the file to read sample data. Otherwise, it reads
+    them from the file whenever the file is open.
+
+    When memory mapping is on and the data is an HDF5 dataset stored contiguously in the file, the data is read through
+    a read-only memory map of the dataset's bytes instead of the HDF5 selection machinery. Each memory map holds a file
+    descriptor until the leaf is closed.
+
+    Class Attributes:
+        file_type: The type of file object to open.
+        default_handle_pool: The default pool to open files through.
+        default_trust_contents: The default for trusting the contents, None trusts them when the mode is read only.
+        default_memory_map: The default for reading contiguous data through a memory map.
+        memory_map_drivers: The HDF5 file drivers which store a dataset's bytes at its offset in the file.
+
+    Attributes:
+        handle_pool: The pool to open the file through, which bounds the number of open files.
+        trust_contents: Determines if the metadata is answered from the contents, None trusts them when read only.
+        memory_map: Determines if contiguous data is read through a memory map.
+    """
     file_type: type | None = None
+    default_handle_pool: FileHandlePool | None = None
+    default_trust_contents: bool | None = None
+    default_memory_map: bool = False
+    memory_map_drivers: frozenset[str] = frozenset({"sec2", "stdio", "windows"})
 
     # Magic Methods #
     # Construction/Destruction
@@ -51,15 +91,26 @@ class BaseTimeContentsLeafContainer(BaseContainerFileTimeSeries):
         tzinfo: datetime.tzinfo | None = None,
         *,
         path: str | pathlib.Path | None = None,
+        handle_pool: FileHandlePool | None = None,
+        trust_contents: bool | None = None,
+        memory_map: bool | None = None,
         init: bool = True,
         **kwargs: Any,
     ) -> None:
         # New Attributes #
         self._shape: tuple[int] | None = None
         self._sample_rate: Decimal | None = None
+        self._sample_rate_float: float | None = None
+        self._sample_period_float: float | None = None
+        self._sample_period_ns: int | None = None
         self._tzinfo: datetime.tzinfo | None = None
         self._start: int | None = None
         self._end: int | None = None
+        self.handle_pool: FileHandlePool | None = self.default_handle_pool
+        self.trust_contents: bool | None = self.default_trust_contents
+        self.memory_map: bool = self.default_memory_map
+        self._memmap: np.memmap | None = None
+        self._memmap_shape: tuple[int, ...] | None = None
 
         # Parent Attributes #
         super().__init__(init=False)
@@ -77,13 +128,34 @@ class BaseTimeContentsLeafContainer(BaseContainerFileTimeSeries):
                 end=end,
                 tzinfo=tzinfo,
                 mode=mode,
+                handle_pool=handle_pool,
+                trust_contents=trust_contents,
+                memory_map=memory_map,
                 **kwargs,
             )
 
+    @property
+    def file(self) -> Any:
+        """The file object, which is opened through the handle pool if there is one."""
+        if self.handle_pool is not None:
+            self._file = self.handle_pool.get_file((self._path, self.mode), self.open_file)
+        elif self._file is None:
+            self._file = self.open_file()
+        return self._file
+
+    @file.setter
+    def file(self, value: Any) -> None:
+        self.set_file(value)
+
     @property
     def is_open(self) -> bool:
         return self._is_open()
 
+    @property
+    def trusts_contents(self) -> bool:
+        """Determines if the metadata is answered from the values given by the contents."""
+        return self.mode == "r" if self.trust_contents is None else self.trust_contents
+
     @property
     def tzinfo(self) -> datetime.tzinfo | None:
         return self.get_tzinfo()
@@ -145,7 +217,7 @@ class BaseTimeContentsLeafContainer(BaseContainerFileTimeSeries):
     def sample_period(self, value: float | str | Decimal) -> None:
         if not isinstance(value, Decimal):
             value = Decimal(value)
-        self._sample_rate = 1 / value
+        self.set_sample_rate_decimal(1 / value)
 
     # Instance Methods
     # Constructors/Destructors
@@ -162,6 +234,9 @@ class BaseTimeContentsLeafContainer(BaseContainerFileTimeSeries):
         tzinfo: datetime.tzinfo | None = None,
         *,
         path: str | pathlib.Path | None = None,
+        handle_pool: FileHandlePool | None = None,
+        trust_contents: bool | None = None,
+        memory_map: bool | None = None,
         **kwargs: Any,
     ) -> None:
         """Constructs this object.
@@ -177,8 +252,20 @@ class BaseTimeContentsLeafContainer(BaseContainerFileTimeSeries):
             end: The end of this proxy.
             tzinfo: The time zone of the timestamps.
             path: The path of the file to wrap.
+            handle_pool: The pool to open the file through, which bounds the number of open files.
+            trust_contents: Determines if the metadata is answered from the contents, None trusts them when read only.
+            memory_map: Determines if contiguous data is read through a memory map.
             **kwargs: The keyword arguments for constructing the file object.
         """
+        if handle_pool is not None:
+            self.handle_pool = handle_pool
+
+        if trust_contents is not None:
+            self.trust_contents = trust_contents
+
+        if memory_map is not None:
+            self.memory_map = memory_map
+
         if shape is not None:
             self._shape = shape
 
@@ -186,10 +273,10 @@ class BaseTimeContentsLeafContainer(BaseContainerFileTimeSeries):
             self.axis = axis
         
         if sample_period is not None:
-            self._sample_rate = 1 / Decimal(sample_period)
+            self.set_sample_rate_decimal(1 / Decimal(sample_period))
 
         if sample_rate is not None:
-            self._sample_rate = Decimal(sample_rate)
+            self.set_sample_rate_decimal(Decimal(sample_rate))
         
         if tzinfo is not None:
             self._tzinfo = tzinfo
@@ -203,10 +290,196 @@ class BaseTimeContentsLeafContainer(BaseContainerFileTimeSeries):
         # Parent Construction
         super().construct(file=file, mode=mode, path=path, **kwargs)
 
+    # File
+    def open_file(self) -> Any:
+        """Opens a new file object for the path of this proxy.
+
+        Returns:
+            The new file object.
+        """
+        return self.file_type(self._path, mode=self.mode, **self.file_kwargs)
+
+    @contextmanager
+    def use_file(self) -> Iterator[Any]:
+        """Gets the file object which will not be closed by the handle pool while it is being used.
+
+        Yields:
+            The file object.
+        """
+        if self.handle_pool is None:
+            yield self.file
+        else:
+            with self.handle_pool.use_file((self._path, self.mode), self.open_file) as self._file:
+                yield self._file
+
+    def open(self, mode: str | None = None, **kwargs: Any) -> "BaseTimeContentsLeafContainer":
+        """Opens the file of this proxy.
+
+        Args:
+            mode: The mode to open the file in.
+            **kwargs: The keyword arguments to open the file with.
+
+        Returns:
+            This object.
+        """
+        if self.handle_pool is None:
+            return super().open(mode, **kwargs)
+
+        if mode is not None:
+            self.mode = mode
+        self.file
+        return self
+
+    def close(self) -> None:
+        """Closes the file and the memory map of this proxy."""
+        self._memmap = None
+        self._memmap_shape = None
+        if self.handle_pool is not None:
+            self.handle_pool.close_file((self._path, self.mode))
+        elif self._file is not None:
+            self._file.close()
+        self._file = None
+
     @abstractmethod
     def _is_open(self) -> bool:
         pass
 
+    # Data
+    def fill_slices_array(
+        self,
+        data_array: np.ndarray,
+        array_slices: Iterable[slice] | None = None,
+        slices: Iterable[slice | int | None] | None = None,
+    ) -> np.ndarray:
+        """Fills a given array with values from the data, reading directly into the array when the data supports it.
+
+        Args:
+            data_array: The numpy array to fill.
+            array_slices: The slices to fill within the data_array.
+            slices: The slices to get the data from.
+
+        Returns:
+            The original array but filled.
+        """
+        array_slices = (slice(None),) * data_array.ndim if array_slices is None else tuple(array_slices)
+        slices = (slice(None),) * data_array.ndim if slices is None else tuple(slices)
+        split = self.split_selection(slices)
+        if split is not None:
+            axis, runs = split
+            source = list(slices)
+            destination = list(array_slices)
+            positions = range(data_array.shape[axis])[array_slices[axis]]
+            position = 0
+            for run in runs:
+                length = run.stop - run.start
+                inner = positions[position:position + length]
+                source[axis] = run
+                destination[axis] = slice(inner.start, inner.stop, inner.step)
+                self.fill_slices_array(data_array, destination, source)
+                position += length
+            return data_array
+
+        memmap = self.get_memmap()
+        if memmap is not None:
+            data_array[array_slices] = memmap[slices]
+            return data_array
+
+        data = self.data
+        if hasattr(data, "read_direct") and data_array.flags.c_contiguous:
+            data.read_direct(data_array, source_sel=slices, dest_sel=array_slices)
+        else:
+            data_array[array_slices] = data[slices]
+        return data_array
+
+    @staticmethod
+    def split_selection(slices: Iterable[slice | int | np.ndarray | None]) -> tuple[int, list[slice]] | None:
+        """Splits the index array of a selection into runs of consecutive indices, which are read as hyperslabs.
+
+        h5py only reads index arrays which are increasing and its point selections are slow on chunked data, so reading
+        each run as a slice is faster and keeps the order of the indices.
+
+        Args:
+            slices: The selection of each axis.
+
+        Returns:
+            The axis of the index array and its runs as slices, or None if the selection has no index array.
+        """
+        for axis, selection in enumerate(slices):
+            if isinstance(selection, np.ndarray):
+                if selection.size == 0:
+                    return axis, [slice(0, 0)]
+                breaks = np.flatnonzero(np.diff(selection) != 1) + 1
+                bounds = zip(np.concatenate(([0], breaks)), np.concatenate((breaks, [selection.size])))
+                return axis, [slice(int(selection[s]), int(selection[e - 1]) + 1) for s, e in bounds]
+        return None
+
+    def get_slices(self, slices: Iterable[slice | int | np.ndarray | None] | None = None) -> np.ndarray:
+        """Gets values from the data, reading an index array as runs of consecutive indices.
+
+        Args:
+            slices: The slices and index array to get the data from.
+
+        Returns:
+            The values of the selection.
+        """
+        slices = (slice(None),) * len(self.get_shape()) if slices is None else tuple(slices)
+        memmap = self.get_memmap()
+        data = self.data if memmap is None else memmap
+        split = self.split_selection(slices)
+        if split is None:
+            return data[slices]
+
+        axis, runs = split
+        source = list(slices)
+        parts = []
+        for run in runs:
+            source[axis] = run
+            parts.append(data[tuple(source)])
+        return np.concatenate(parts, axis=axis)
+
+    @classmethod
+    def create_memmap(cls, data: Any) -> np.memmap | None:
+        """Creates a read-only memory map of an HDF5 dataset if its bytes are stored contiguously in its file.
+
+        Args:
+            data: The dataset to map.
+
+        Returns:
+            The memory map or None if the dataset is chunked, not allocated, or not a plain HDF5 dataset.
+        """
+        get_offset = getattr(getattr(data, "id", None), "get_offset", None)
+        if get_offset is None or data.chunks is not None or data.dtype.hasobject or data.size == 0:
+            return None
+
+        try:
+            if data.file.driver not in cls.memory_map_drivers or data.is_virtual or data.external:
+                return None
+            offset = get_offset()
+        except (AttributeError, TypeError, ValueError):
+            return None
+
+        if offset is None:
+            return None
+        return np.memmap(data.file.filename, dtype=data.dtype, mode="r", offset=offset, shape=data.shape)
+
+    def get_memmap(self) -> np.memmap | None:
+        """Gets the memory map of the data, creating it the first time or after the shape of the leaf changed.
+
+        Returns:
+            The memory map or None if memory mapping is off or the data cannot be memory mapped.
+        """
+        if not self.memory_map:
+            return None
+
+        shape = self.get_shape()
+        if shape is None or self._memmap_shape != tuple(shape):
+            with self.use_file():
+                shape = tuple(self.get_shape())
+                if self._memmap_shape != shape:
+                    self._memmap = self.create_memmap(self.data)
+                    self._memmap_shape = shape
+        return self._memmap
+
     def update_defaults(
         self,
         shape: tuple[int] | None = None,
@@ -236,10 +509,10 @@ class BaseTimeContentsLeafContainer(BaseContainerFileTimeSeries):
             self.axis = axis
 
         if sample_period is not None:
-            self._sample_rate = 1 / Decimal(sample_period)
+            self.set_sample_rate_decimal(1 / Decimal(sample_period))
 
         if sample_rate is not None:
-            self._sample_rate = Decimal(sample_rate)
+            self.set_sample_rate_decimal(Decimal(sample_rate))
 
         if tzinfo is not None:
             self._tzinfo = tzinfo
@@ -261,7 +534,7 @@ class BaseTimeContentsLeafContainer(BaseContainerFileTimeSeries):
         Returns:
             The minimum shapes of the contained arrays/objects.
         """
-        if self.is_open:
+        if self.is_open and (self._shape is None or not self.trusts_contents):
             self._shape = self._get_shape()
         return self._shape
 
@@ -274,18 +547,32 @@ class BaseTimeContentsLeafContainer(BaseContainerFileTimeSeries):
         Returns:
             The shape of this proxy or the minimum sample rate of the contained arrays/objects.
         """
-        if self.is_open:
-            self._sample_rate = self._get_sample_rate_decimal()
+        if self.is_open and (self._sample_rate is None or not self.trusts_contents):
+            self.set_sample_rate_decimal(self._get_sample_rate_decimal())
         return self._sample_rate
 
+    def set_sample_rate_decimal(self, value: Decimal | None) -> None:
+        """Sets the sample rate and precomputes its float and integer nanosecond forms.
+
+        Args:
+            value: The sample rate.
+        """
+        self._sample_rate = value
+        if value is None:
+            self._sample_rate_float = self._sample_period_float = self._sample_period_ns = None
+        else:
+            self._sample_rate_float = float(value)
+            self._sample_period_float = 1.0 / self._sample_rate_float
+            self._sample_period_ns = int(round(10**9 / self._sample_rate_float))
+
     def get_sample_rate(self) -> float | None:
         """Get the sample rate of this proxy from the contained arrays/objects.
 
         Returns:
             The sample rate of this proxy.
         """
-        sample_rate = self.get_sample_rate_decimal()
-        return float(sample_rate) if sample_rate is not None else None
+        self.get_sample_rate_decimal()
+        return self._sample_rate_float
 
     def get_sample_period(self) -> float:
         """Get the sample period of this proxy.
@@ -295,7 +582,17 @@ class BaseTimeContentsLeafContainer(BaseContainerFileTimeSeries):
         Returns:
             The sample period of this proxy.
         """
-        return float(1 / self.get_sample_rate_decimal())
+        self.get_sample_rate_decimal()
+        return self._sample_period_float
+
+    def get_sample_period_nanoseconds(self) -> int | None:
+        """Get the sample period of this proxy rounded to integer nanoseconds.
+
+        Returns:
+            The sample period in nanoseconds.
+        """
+        self.get_sample_rate_decimal()
+        return self._sample_period_ns
 
     def get_sample_period_decimal(self) -> Decimal:
         """Get the sample period of this proxy.
@@ -316,7 +613,7 @@ class BaseTimeContentsLeafContainer(BaseContainerFileTimeSeries):
         Args:
             tzinfo: The time zone to set.
         """
-        if self.is_open:
+        if self.is_open and (self._tzinfo is None or not self.trusts_contents):
             self._tzinfo = self._get_tzinfo()
         return self._tzinfo
 
@@ -324,7 +621,7 @@ class BaseTimeContentsLeafContainer(BaseContainerFileTimeSeries):
         return self.time_axis.start_nanostamp
     
     def get_start_nanostamp(self) -> int | None:
-        if self.is_open:
+        if self.is_open and (self._start is None or not self.trusts_contents):
             self._start = self._get_start_nanostamp()
         return self._start
 
@@ -332,7 +629,7 @@ class BaseTimeContentsLeafContainer(BaseContainerFileTimeSeries):
         return self.time_axis.end_nanostamp
 
     def get_end_nanostamp(self) -> int | None:
-        if self.is_open:
+        if self.is_open and (self._end is None or not self.trusts_contents):
             self._end = self._get_end_nanostamp()
         return self._end
 
@@ -380,6 +677,65 @@ class BaseTimeContentsLeafContainer(BaseContainerFileTimeSeries):
         if self.mode == "r":
             raise IOError("not writable")
 
+    @classmethod
+    def read_contents_entry(cls, path: pathlib.Path | str) -> dict[str, Any] | None:
+        """Reads the contents entry of a leaf file, such as when the contents are corrected from the files.
+
+        Args:
+            path: The path of the file to read.
+
+        Returns:
+            The axis, shape, timezone, start, end, and sample rate of the leaf or None if the file is not a leaf.
+        """
+        if not cls.validate_path(path):
+            return None
+
+        leaf = cls(path=path, mode="r", trust_contents=False)
+        try:
+            with leaf.use_file():
+                tzinfo = leaf.get_tzinfo()
+                return {
+                    "axis": leaf.axis,
+                    "shape": tuple(leaf.get_shape()),
+                    "timezone": 0 if tzinfo is None else tzinfo,
+                    "start": np.uint64(leaf.get_start_nanostamp()),
+                    "end": np.uint64(leaf.get_end_nanostamp()),
+                    "sample_rate": leaf.get_sample_rate(),
+                }
+        finally:
+            leaf.close()
+
+    @classmethod
+    def can_write_file(cls) -> bool:
+        """Checks if this leaf type can write new leaf files, which is when it overrides write_file.
+
+        Returns:
+            If this leaf type can write new leaf files.
+        """
+        return cls.write_file.__func__ is not BaseTimeContentsLeafContainer.write_file.__func__
+
+    @classmethod
+    def write_file(
+        cls,
+        path: pathlib.Path | str,
+        data: np.ndarray,
+        nanostamps: np.ndarray,
+        sample_rate: float,
+        axis: int = 0,
+    ) -> None:
+        """Writes a new leaf file, such as when leaves are merged by compaction.
+
+        Leaf types which can be written override this.
+
+        Args:
+            path: The path of the file to write.
+            data: The samples of the leaf.
+            nanostamps: The nanostamp of each sample.
+            sample_rate: The sample rate of the samples.
+            axis: The axis the samples are along.
+        """
+        raise NotImplementedError
+
 
 class TimeContentsNodeProxy(DirectoryTimeSeriesProxy):
     default_node_type: type = None
@@ -404,10 +760,18 @@ class TimeContentsNodeProxy(DirectoryTimeSeriesProxy):
         # New Attributes #
         self.node_type: type | None = self.default_node_type
         self.leaf_type: type | None = self.default_leaf_type
+        self.child_starts: np.ndarray = np.empty(0, dtype=np.int64)
+        self.child_ends: np.ndarray = np.empty(0, dtype=np.int64)
+        self.child_lengths: np.ndarray = np.empty(0, dtype=np.int64)
+        self.child_sample_rates: np.ndarray = np.empty(0, dtype=np.float64)
+        self.child_start_indices: np.ndarray = np.empty(0, dtype=np.int64)
 
         # Parent Attributes #
         super().__init__(init=False)
 
+        # Override Attributes #
+        self.proxies: TimeContentsLeafTable = TimeContentsLeafTable(leaf_factory=self.create_leaf)
+
         # Object Construction #
         if init:
             self.construct(
@@ -423,6 +787,155 @@ class TimeContentsNodeProxy(DirectoryTimeSeriesProxy):
                 **kwargs,
             )
 
+    @property
+    def start_nanostamp(self) -> int | None:
+        """The start nanostamp of this proxy."""
+        return int(self.child_starts[0]) if self.child_starts.size else None
+
+    @property
+    def end_nanostamp(self) -> int | None:
+        """The end nanostamp of this proxy."""
+        return int(self.child_ends[-1]) if self.child_ends.size else None
+
+    @property
+    def start_timestamp(self) -> float | None:
+        """The start timestamp of this proxy."""
+        return float(self.child_starts[0]) / 10**9 if self.child_starts.size else None
+
+    @property
+    def end_timestamp(self) -> float | None:
+        """The end timestamp of this proxy."""
+        return float(self.child_ends[-1]) / 10**9 if self.child_ends.size else None
+
+    # Instance Methods #
+    # Constructors/Destructors
+    def construct(
+        self,
+        path: pathlib.Path | str | None = None,
+        proxies: Iterable[BaseDirectoryTimeSeries] | None = None,
+        mode: str | None = None,
+        update: bool = True,
+        open_: bool = False,
+        build: bool = True,
+        **kwargs: Any,
+    ) -> None:
+        """Constructs this object.
+
+        Args:
+            path: The path for this proxy to wrap.
+            proxies: An iterable holding proxies/objects to store in this proxy.
+            mode: Determines if the contents of this proxy are editable or not.
+            update: Determines if this proxy will start_timestamp updating or not.
+            open_: Determines if the proxies will remain open after construction.
+            build: Determines if the proxies will be constructed.
+            **kwargs: The keyword arguments to create contained proxies.
+        """
+        super().construct(path=path, proxies=proxies, mode=mode, update=update, open_=open_, build=build, **kwargs)
+        if self.child_starts.size != len(self.proxies):
+            self.sort_children()
+
+    # Child Index
+    def sort_children(self) -> None:
+        """Sorts the children by their start and rebuilds the child time index from the children."""
+        children = [self.proxies.get_slot(i) for i in range(len(self.proxies))]
+        times = [self._get_child_times(c) for c in children]
+        self.proxies.clear_children()
+        self.child_starts = np.empty(0, dtype=np.int64)
+        self.child_ends = np.empty(0, dtype=np.int64)
+        self.child_lengths = np.empty(0, dtype=np.int64)
+        self.child_sample_rates = np.empty(0, dtype=np.float64)
+        starts, ends, lengths, sample_rates = zip(*times) if times else ((), (), (), ())
+        self.merge_children(children=children, starts=starts, ends=ends, lengths=lengths, sample_rates=sample_rates)
+        self.clear_caches()
+
+    def require_child_index(self) -> None:
+        """Rebuilds the child time index if the children were changed without updating it."""
+        if not isinstance(self.proxies, TimeContentsLeafTable):
+            proxies = self.proxies
+            self.proxies = TimeContentsLeafTable(leaf_factory=self.create_leaf)
+            self.proxies.extend_children(proxies)
+        if self.child_starts.size != len(self.proxies):
+            self.sort_children()
+
+    def merge_children(
+        self,
+        children: list[BaseDirectoryTimeSeries | int],
+        starts: Iterable[int],
+        ends: Iterable[int],
+        lengths: Iterable[int],
+        sample_rates: Iterable[float] = (),
+        sort: bool = True,
+    ) -> None:
+        """Merges new children and their times into the children and the child time index.
+
+        New children which start after the current children are appended, otherwise the children are reordered with a
+        stable sort of the start nanostamps.
+
+        Args:
+            children: The children to add, either node objects or leaf rows.
+            starts: The start nanostamps of the new children.
+            ends: The end nanostamps of the new children.
+            lengths: The lengths of the new children along the axis.
+            sample_rates: The sample rates of the new children, NaN for children with mixed sample rates.
+            sort: Determines if the children will be kept in time order.
+        """
+        if children:
+            self.proxies.extend_children(children)
+            self.child_starts = np.concatenate((self.child_starts, np.asarray(starts, dtype=np.int64)))
+            self.child_ends = np.concatenate((self.child_ends, np.asarray(ends, dtype=np.int64)))
+            self.child_lengths = np.concatenate((self.child_lengths, np.asarray(lengths, dtype=np.int64)))
+            sample_rates = np.asarray(sample_rates, dtype=np.float64)
+            if sample_rates.size != len(children):
+                sample_rates = np.full(len(children), np.nan)
+            self.child_sample_rates = np.concatenate((self.child_sample_rates, sample_rates))
+
+        if sort and self.child_starts.size > 1 and (np.diff(self.child_starts) < 0).any():
+            order = np.argsort(self.child_starts, kind="stable")
+            self.proxies.reorder(order)
+            self.child_starts = self.child_starts[order]
+            self.child_ends = self.child_ends[order]
+            self.child_lengths = self.child_lengths[order]
+            self.child_sample_rates = self.child_sample_rates[order]
+
+        self.child_start_indices = np.zeros(self.child_lengths.size, dtype=np.int64)
+        np.cumsum(self.child_lengths[:-1], out=self.child_start_indices[1:])
+
+    def _get_child_times(self, child: BaseDirectoryTimeSeries | int) -> tuple[int, int, int, float]:
+        if isinstance(child, int):
+            table = self.proxies
+            return (
+                int(table.starts[child]),
+                int(table.ends[child]),
+                table.get_leaf_length(child),
+                float(table.sample_rates[child]),
+            )
+        else:
+            return child.start_nanostamp, child.end_nanostamp, child.length, child.get_uniform_sample_rate()
+
+    def get_uniform_sample_rate(self) -> float:
+        """Gets the sample rate shared by all the children from the child time index.
+
+        Returns:
+            The sample rate of the children, NaN if they differ or there are none.
+        """
+        sample_rates = self.child_sample_rates
+        if sample_rates.size and (sample_rates == sample_rates[0]).all():
+            return float(sample_rates[0])
+        return np.nan
+
+    # Children
+    def create_leaf(self, path: str, **kwargs: Any) -> BaseTimeContentsLeafContainer:
+        """Creates a leaf container for a leaf of this node.
+
+        Args:
+            path: The name of the leaf within this node.
+            **kwargs: The keyword arguments to create the leaf container.
+
+        Returns:
+            The new leaf container.
+        """
+        return self.leaf_type(path=self.path / path, mode=self.mode, **kwargs)
+
     def update_child(
         self,
         path: str | list[str],
@@ -436,70 +949,499 @@ class TimeContentsNodeProxy(DirectoryTimeSeriesProxy):
             open_: Determines if the arrays will remain open after construction.
             **kwargs: The keyword arguments to create contained arrays.
         """
-        path = path.split('/') if isinstance(path, str) else path.copy()
-
-        if path:
-            child_path = self.path / path.pop(0)
-            proxy = self.proxy_paths.get(child_path, None)
-            if proxy is None:
-                if path:
-                    proxy = self.node_type(path=child_path, mode=self.mode, open_=open_, build=False)
-                else:
-                    proxy = self.leaf_type(path=child_path, mode=self.mode, open_=open_,  **kwargs)
-                self.proxies.append(proxy)
-                self.proxy_paths[child_path] = proxy
-
-            if path:
-                proxy.update_child(path=path, open_=open_, **kwargs)
-            else:
-                proxy.update_defaults(**kwargs)
-
-            self.proxies.sort(key=lambda p: p.start_timestamp)
-            self.clear_caches()
+        self.update_children(paths=[kwargs | {"path": path}], open_=open_, sort=True)
 
     def update_children(self, paths: list[dict], open_: bool = False, sort: bool = False, **kwargs: Any) -> None:
         """Creates child arrays the given child paths.
 
+        Leaves are added as rows of the leaf table and their containers are only created when they are read. The child
+        time index is updated with the children's times, so given paths which are ordered by start create children
+        which are already in order and only need to be appended.
+
         Args:
             paths: The child paths and keyword arguments to create arrays from.
             open_: Determines if the arrays will remain open after construction.
-            sort: Determines if the arrays will be sorted after update.
+            sort: Determines if the arrays will be kept in time order after update.
             **kwargs: The keyword arguments to create contained arrays.
         """
+        self.require_child_index()
+        table = self.proxies
+        if kwargs:
+            table.leaf_kwargs = kwargs
+
         children_info = {}
         for path_kwargs in paths:
             path = path_kwargs["path"]
             path = path_kwargs["path"] = path.split('/') if isinstance(path, str) else path.copy()
             if path:
-                child_path = self.path / path.pop(0)
-                info = children_info.get(child_path, None)
+                name = path.pop(0)
+                info = children_info.get(name, None)
                 if info is None:
-                    children_info[child_path] = {"kwargs": path_kwargs | {"path": child_path}, "children": [path_kwargs]}
+                    children_info[name] = {"kwargs": path_kwargs | {"path": name}, "children": [path_kwargs]}
                 else:
                     info["children"].append(path_kwargs)
 
-        for child_path, info in children_info.items():
-            proxy = self.proxy_paths.get(child_path, None)
+        new_children = []
+        new_times = []
+        node_indices = None
+        leaf_indices = None
+        for name, info in children_info.items():
             update_leaf = not info["children"] or (len(info["children"]) == 1 and not info["children"][0]["path"])
-            if proxy is None:
-                if update_leaf:
-                    self.proxy_paths[child_path] = proxy = self.leaf_type(mode=self.mode, **(kwargs | info["kwargs"]))
-                else:
-                    self.proxy_paths[child_path] = proxy = self.node_type(
+            if update_leaf:
+                child = table.find_leaf(name)
+                if child is None:
+                    new_children.append(child := table.add_leaf(**info["kwargs"]))
+                    new_times.append(self._get_child_times(child))
+                    continue
+
+                table.update_leaf(child, **info["kwargs"])
+                if leaf_indices is None:
+                    leaf_indices = table.leaf_slots()
+                index = leaf_indices[child]
+            else:
+                child_path = self.path / name
+                child = self.proxy_paths.get(child_path, None)
+                if child is None:
+                    self.proxy_paths[child_path] = child = self.node_type(
                         path=child_path,
                         mode=self.mode,
                         open_=open_,
                         build=False,
                     )
-                self.proxies.append(proxy)
-            if update_leaf:
-                proxy.update_defaults(**info["kwargs"])
-            else:
-                proxy.update_children(paths=info["children"], open_=open_, sort=sort, **kwargs)
+                    child.update_children(paths=info["children"], open_=open_, sort=sort, **kwargs)
+                    new_children.append(child)
+                    new_times.append(self._get_child_times(child))
+                    continue
+
+                child.update_children(paths=info["children"], open_=open_, sort=sort, **kwargs)
+                if node_indices is None:
+                    node_indices = {id(c): i for i, c in enumerate(table.children) if c is not None}
+                index = node_indices[id(child)]
+
+            (
+                self.child_starts[index],
+                self.child_ends[index],
+                self.child_lengths[index],
+                self.child_sample_rates[index],
+            ) = self._get_child_times(child)
+
+        if children_info:
+            starts, ends, lengths, sample_rates = zip(*new_times) if new_times else ((), (), (), ())
+            self.merge_children(
+                children=new_children,
+                starts=starts,
+                ends=ends,
+                lengths=lengths,
+                sample_rates=sample_rates,
+                sort=sort,
+            )
+            self.clear_caches()
+
+    def remove_leaf_paths(self, paths: Iterable[pathlib.Path]) -> int:
+        """Removes the leaves with paths from this node and its nodes, such as the leaves whose entries were removed.
+
+        Args:
+            paths: The paths of the leaves to remove.
 
-        if sort:
-            self.proxies.sort(key=lambda p: p.start_timestamp)
+        Returns:
+            The number of leaves removed.
+        """
+        table = self.proxies
+        leaf_rows = []
+        nested = {}
+        for path in paths:
+            path = pathlib.Path(path)
+            if path.parent == self.path:
+                if (row := table.find_leaf(path.name)) is not None:
+                    leaf_rows.append(row)
+            elif path.is_relative_to(self.path):
+                nested.setdefault(self.path / path.relative_to(self.path).parts[0], []).append(path)
+
+        n_removed = 0
+        slots = []
+        node_indices = None
+        for child_path, child_paths in nested.items():
+            child = self.proxy_paths.get(child_path, None)
+            if child is None or not (n_child := child.remove_leaf_paths(child_paths)):
+                continue
+            if node_indices is None:
+                node_indices = {id(c): i for i, c in enumerate(table.children) if c is not None}
+            index = node_indices[id(child)]
+            n_removed += n_child
+            if len(child.proxies):
+                (
+                    self.child_starts[index],
+                    self.child_ends[index],
+                    self.child_lengths[index],
+                    self.child_sample_rates[index],
+                ) = self._get_child_times(child)
+            else:
+                slots.append(index)
+                del self.proxy_paths[child_path]
+
+        if leaf_rows:
+            leaf_slots = table.leaf_slots()[np.asarray(leaf_rows, dtype=np.int64)]
+            slots.extend(leaf_slots[leaf_slots >= 0].tolist())
+            n_removed += int((leaf_slots >= 0).sum())
+
+        if slots:
+            keep = np.ones(len(table), dtype=bool)
+            keep[slots] = False
+            for leaf in table.remove_children(slots):
+                leaf.close()
+            self.child_starts = self.child_starts[keep]
+            self.child_ends = self.child_ends[keep]
+            self.child_lengths = self.child_lengths[keep]
+            self.child_sample_rates = self.child_sample_rates[keep]
+
+        if n_removed:
+            self.merge_children(children=[], starts=(), ends=(), lengths=(), sort=False)
             self.clear_caches()
+        return n_removed
+
+    # Path and File System
+    def close(self) -> None:
+        """Closes the children which are nodes or leaves with containers."""
+        for proxy in self.proxies.iter_materialized():
+            proxy.close()
+
+    # Caches
+    def clear_all_caches(self) -> None:
+        """Clears the caches of this proxy and the children which are nodes or leaves with containers."""
+        self.clear_caches()
+        for proxy in self.proxies.iter_materialized():
+            try:
+                proxy.clear_all_caches()
+            except AttributeError:
+                continue
+
+    # Getters and Setters
+    @timed_keyless_cache(lifetime=1.0, call_method="clearing_call", local=True)
+    def get_any_updating(self) -> bool:
+        """Checks if any of the children which are nodes or leaves with containers are updating.
+
+        Returns:
+            If any contained proxies/objects are updating.
+        """
+        return any(proxy.get_any_updating() for proxy in self.proxies.iter_materialized())
+
+    @timed_keyless_cache(lifetime=1.0, call_method="clearing_call", local=True)
+    def get_shapes(self) -> tuple[tuple[int]]:
+        """Get the shapes of the children from the leaf table.
+
+        Returns:
+            The shapes of the children.
+        """
+        self.require_child_index()
+        return self.proxies.get_shapes()
+
+    def _get_shape_array(self) -> np.ndarray:
+        shapes = self.get_shapes()
+        shape_array = np.zeros((len(shapes), max(len(s) for s in shapes)), dtype=np.int64)
+        for index, shape in enumerate(shapes):
+            shape_array[index, :len(shape)] = shape
+        return shape_array
+
+    @timed_keyless_cache(lifetime=1.0, call_method="clearing_call", local=True)
+    def get_min_shape(self) -> tuple[int]:
+        """Get the minimum shapes from the children if they are different across axes.
+
+        Returns:
+            The minimum shapes of the children.
+        """
+        shape_array = self._get_shape_array()
+        shape = shape_array.min(axis=0)
+        shape[self.axis] = shape_array[:, self.axis].sum()
+        return tuple(int(s) for s in shape)
+
+    @timed_keyless_cache(lifetime=1.0, call_method="clearing_call", local=True)
+    def get_max_shape(self) -> tuple[int]:
+        """Get the maximum shapes from the children if they are different across axes.
+
+        Returns:
+            The maximum shapes of the children.
+        """
+        shape_array = self._get_shape_array()
+        shape = shape_array.max(axis=0)
+        shape[self.axis] = shape_array[:, self.axis].sum()
+        return tuple(int(s) for s in shape)
+
+    @timed_keyless_cache(call_method="clearing_call", local=True)
+    def get_sample_rates(self) -> tuple[float]:
+        """Get the sample rates of the children from the leaf table.
+
+        Returns:
+            The sample rates of the children.
+        """
+        self.require_child_index()
+        return self.proxies.get_sample_rates()
+
+    @timed_keyless_cache(call_method="clearing_call", local=True)
+    def get_start_nanostamps(self) -> np.ndarray:
+        """Get the start nanostamps of all contained proxies from the child time index.
+
+        Returns:
+            All the start nanostamps.
+        """
+        self.require_child_index()
+        return self.child_starts.astype(np.uint64)
+
+    @timed_keyless_cache(call_method="clearing_call", local=True)
+    def get_end_nanostamps(self) -> np.ndarray:
+        """Get the end nanostamps of all contained proxies from the child time index.
+
+        Returns:
+            All the end nanostamps.
+        """
+        self.require_child_index()
+        return self.child_ends.astype(np.uint64)
+
+    @timed_keyless_cache(lifetime=1.0, call_method="clearing_call", local=True)
+    def get_lengths(self) -> tuple[int]:
+        """Get the lengths of the contained proxies from the child time index.
+
+        Returns:
+            All the lengths of the contained proxies.
+        """
+        self.require_child_index()
+        return tuple(self.child_lengths.tolist())
+
+    @timed_keyless_cache(lifetime=1.0, call_method="clearing_call", local=True)
+    def get_length(self) -> int:
+        """Get the length of this proxy from the child time index.
+
+        Returns:
+            The length of this proxy.
+        """
+        self.require_child_index()
+        return int(self.child_lengths.sum())
+
+    @timed_keyless_cache(lifetime=1.0, call_method="clearing_call", local=True)
+    def get_proxy_start_indices(self) -> tuple[int]:
+        """Get the start indices of the contained proxies from the child time index.
+
+        Returns:
+            The start indices of each of the contained proxies.
+        """
+        self.require_child_index()
+        return tuple(self.child_start_indices.tolist())
+
+    # Find
+    def find_inner_proxy_index(self, super_index: int) -> ProxyIndex:
+        """Find the proxy and inner index of a super index.
+
+        Args:
+            super_index: The super index to find.
+
+        Returns:
+            The index information as a ProxyIndex.
+        """
+        return self.find_inner_proxy_indices((super_index,))[0]
+
+    def find_inner_proxy_indices(self, super_indices: Iterable[int]) -> tuple[ProxyIndex, ...]:
+        """Find the proxy and inner index of several super indices.
+
+        Args:
+            super_indices: The super indices to find.
+
+        Returns:
+            The indices' information as ProxyIndex objects.
+        """
+        length = self.length
+        super_indices = np.asarray(super_indices, dtype=np.int64)
+
+        if ((super_indices >= length) | (super_indices < -length)).any():
+            raise IndexError("super_index is out of range")
+        super_indices = np.where(super_indices < 0, super_indices + length, super_indices)
+
+        self.require_child_index()
+        start_indices = self.child_start_indices
+        proxy_indices = np.searchsorted(start_indices, super_indices, side="right") - 1
+        proxy_starts = start_indices[proxy_indices]
+        return tuple(
+            ProxyIndex(int(i), int(s), int(n - s)) for i, s, n in zip(proxy_indices, proxy_starts, super_indices)
+        )
+
+    def find_proxy(self, timestamp: datetime.datetime | float, tails: bool = False) -> IndexValue:
+        """Finds a proxy with a given timestamp in its range
+
+        Args:
+            timestamp: The time to find within the proxies.
+            tails: Determines if the flanking proxies will be given if the timestamp is out of the range.
+
+        Returns:
+            The requested proxy.
+        """
+        self.require_child_index()
+        nano_ts = int(nanostamp(timestamp))
+
+        index = None
+        if self.child_starts.size:
+            if nano_ts < self.child_starts[0]:
+                if tails:
+                    index = 0
+            elif nano_ts > self.child_ends[-1]:
+                if tails:
+                    index = self.child_ends.size - 1
+            else:
+                index = int(np.searchsorted(self.child_ends, nano_ts, side="left"))
+
+        if index is None:
+            raise IndexError("proxy not found. Timestamp out of range")
+
+        return IndexValue(index, self.proxies[index])
+
+    def get_nanostamp_index(self, nano_ts: int) -> int:
+        """Finds the index of the first sample at or after a nanostamp using the child time index.
+
+        Args:
+            nano_ts: The nanostamp to find the index of.
+
+        Returns:
+            The index of the first sample at or after the nanostamp, the length if it is after all samples.
+        """
+        self.require_child_index()
+        index = int(np.searchsorted(self.child_ends, nano_ts, side="left"))
+        if index >= self.child_ends.size:
+            return int(self.child_lengths.sum())
+
+        offset = int(self.child_start_indices[index])
+        start = int(self.child_starts[index])
+        if nano_ts <= start:
+            return offset
+
+        child = self.proxies.get_slot(index)
+        if isinstance(child, int):
+            sample_rate = self.child_sample_rates[index]
+            if np.isnan(sample_rate):
+                sample_rate = self.proxies.get_leaf(child).get_sample_rate()
+            inner_index = ceil((nano_ts - start) * float(sample_rate) / 10**9 - 1e-9)
+            return offset + min(inner_index, int(self.child_lengths[index]))
+        else:
+            return offset + child.get_nanostamp_index(nano_ts)
+
+    def get_nanostamp_indices(self, nanostamps: np.ndarray) -> np.ndarray:
+        """Finds the indices of the first samples at or after many nanostamps at once with the child time index.
+
+        The indices within the leaves are computed with NumPy from the start nanostamps and float sample rates of the
+        child time index, so no leaf containers are created.
+
+        Args:
+            nanostamps: The nanostamps to find the indices of.
+
+        Returns:
+            The indices of the first samples at or after the nanostamps, the length for those after all samples.
+        """
+        self.require_child_index()
+        nanostamps = np.asarray(nanostamps, dtype=np.int64)
+        n_children = self.child_ends.size
+        if not n_children:
+            return np.zeros(nanostamps.shape, dtype=np.int64)
+
+        indices = np.minimum(np.searchsorted(self.child_ends, nanostamps, side="left"), n_children - 1)
+        starts = self.child_starts[indices]
+        lengths = self.child_lengths[indices]
+        sample_rates = self.child_sample_rates[indices]
+        missing = np.isnan(sample_rates) & (self.proxies.leaf_rows[indices] >= 0)
+        for index in np.unique(indices[missing]):
+            sample_rates[indices == index] = self.proxies.get_child(int(index)).get_sample_rate()
+
+        with np.errstate(invalid="ignore"):
+            inner = np.ceil((nanostamps - starts) * sample_rates / 10**9 - 1e-9)
+        inner = np.clip(np.nan_to_num(inner), 0, lengths).astype(np.int64)
+
+        for index in np.unique(indices[self.proxies.leaf_rows[indices] < 0]):
+            selected = indices == index
+            inner[selected] = self.proxies.get_slot(int(index)).get_nanostamp_indices(nanostamps[selected])
+
+        inner[nanostamps > self.child_ends[-1]] = lengths[nanostamps > self.child_ends[-1]]
+        return self.child_start_indices[indices] + inner
+
+    def find_leaf_segments(
+        self,
+        start: int,
+        stop: int,
+        offset: int = 0,
+        limit: int | None = None,
+    ) -> list[tuple[Any, int, int, int]]:
+        """Finds the leaves and the ranges within them which make up a range of samples.
+
+        Args:
+            start: The first sample index of the range.
+            stop: The sample index after the range.
+            offset: The position of the range within the output.
+            limit: The maximum number of segments to find.
+
+        Returns:
+            The leaf, the start and stop within the leaf, and the position in the output of each segment.
+        """
+        return [
+            (node.proxies.get_leaf(row), inner_start, inner_stop, position)
+            for node, row, inner_start, inner_stop, position in self.find_leaf_rows(start, stop, offset, limit)
+        ]
+
+    def find_leaf_rows(
+        self,
+        start: int,
+        stop: int,
+        offset: int = 0,
+        limit: int | None = None,
+    ) -> list[tuple["TimeContentsNodeProxy", int, int, int, int]]:
+        """Finds the leaf rows and the ranges within them which make up a range of samples without creating leaves.
+
+        Args:
+            start: The first sample index of the range.
+            stop: The sample index after the range.
+            offset: The position of the range within the output.
+            limit: The maximum number of segments to find.
+
+        Returns:
+            The node, the leaf row, the start and stop within the leaf, and the position in the output of each segment.
+        """
+        self.require_child_index()
+        start_indices = self.child_start_indices
+        first = max(int(np.searchsorted(start_indices, start, side="right")) - 1, 0)
+        last = int(np.searchsorted(start_indices, stop, side="left"))
+
+        segments = []
+        for index in range(first, last):
+            if limit is not None and len(segments) >= limit:
+                break
+
+            child_start = int(start_indices[index])
+            inner_start = max(start - child_start, 0)
+            inner_stop = min(stop - child_start, int(self.child_lengths[index]))
+            if inner_start >= inner_stop:
+                continue
+
+            position = offset + child_start + inner_start - start
+            child = self.proxies.get_slot(index)
+            if isinstance(child, int):
+                segments.append((self, child, inner_start, inner_stop, position))
+            else:
+                remaining = None if limit is None else limit - len(segments)
+                segments.extend(child.find_leaf_rows(inner_start, inner_stop, position, remaining))
+        return segments
+
+    def find_time_leaf_rows(self, start: int, end: int) -> list[tuple["TimeContentsNodeProxy", int]]:
+        """Finds the leaf rows which overlap a range of time without creating leaves, even if the leaves overlap.
+
+        Args:
+            start: The first nanostamp of the range.
+            end: The last nanostamp of the range.
+
+        Returns:
+            The node and the leaf row of each leaf which overlaps the range.
+        """
+        self.require_child_index()
+        rows = []
+        for index in np.flatnonzero((self.child_starts <= end) & (self.child_ends >= start)).tolist():
+            child = self.proxies.get_slot(index)
+            if isinstance(child, int):
+                rows.append((self, child))
+            else:
+                rows.extend(child.find_time_leaf_rows(start, end))
+        return rows
 
 
 class TimeContentsProxy(TimeContentsNodeProxy):
@@ -507,10 +1449,16 @@ class TimeContentsProxy(TimeContentsNodeProxy):
 
     Class Attributes:
         default_node_proxy_type: The default proxy type to create when making a node.
+        default_read_workers: The default number of threads which read leaves concurrently.
 
     Attributes:
         content_map: A HDF5Group with the mapping information for creating the proxy structure.
         node_proxy_type: The proxy type to create when making a node.
+        read_workers: The number of threads which read leaves concurrently.
+        read_executor: The thread pool which reads the leaves.
+        prefetcher: The prefetcher which warms the leaves ahead of sequential reads, None when prefetching is off.
+        block_cache: The cache of decoded blocks of the leaves, None when block caching is off.
+        overviews: The overview pyramid of the leaves, None when overviews are off.
 
     Args:
         path: The path for this proxy to wrap.
@@ -525,6 +1473,7 @@ class TimeContentsProxy(TimeContentsNodeProxy):
     """
     default_proxy_type: type = TimeContentsNodeProxy
     default_node_type: type[TimeContentsNodeProxy] = TimeContentsNodeProxy
+    default_read_workers: int = 4
 
     # Magic Methods #
     # Construction/Destruction
@@ -537,12 +1486,21 @@ class TimeContentsProxy(TimeContentsNodeProxy):
         update: bool = False,
         open_: bool = False,
         build: bool = True,
+        read_workers: int | None = None,
+        prefetch: bool | None = None,
+        cache_blocks: bool | None = None,
+        build_overviews: bool | None = None,
         init: bool = True,
         **kwargs: Any,
     ) -> None:
         # New Attributes #
         self.contents_file: TimeContentsFile | None = None
         self.latest_update: int = 0
+        self.read_workers: int = self.default_read_workers
+        self.read_executor: ThreadPoolExecutor | None = None
+        self.prefetcher: ReadAheadPrefetcher | None = None
+        self.block_cache: BlockCache | None = None
+        self.overviews: OverviewPyramid | None = None
 
         # Parent Attributes #
         super().__init__(init=False)
@@ -557,6 +1515,10 @@ class TimeContentsProxy(TimeContentsNodeProxy):
                 update=update,
                 open_=open_,
                 build=build,
+                read_workers=read_workers,
+                prefetch=prefetch,
+                cache_blocks=cache_blocks,
+                build_overviews=build_overviews,
                 **kwargs,
             )
 
@@ -571,6 +1533,10 @@ class TimeContentsProxy(TimeContentsNodeProxy):
         update: bool = False,
         open_: bool = False,
         build: bool = False,
+        read_workers: int | None = None,
+        prefetch: bool | None = None,
+        cache_blocks: bool | None = None,
+        build_overviews: bool | None = None,
         **kwargs: Any,
     ) -> None:
         """Constructs this object.
@@ -583,11 +1549,30 @@ class TimeContentsProxy(TimeContentsNodeProxy):
             update: Determines if this proxy will start_timestamp updating or not.
             open_: Determines if the arrays will remain open after construction.
             build: Determines if the arrays will be constructed.
+            read_workers: The number of threads which read leaves concurrently.
+            prefetch: Determines if the leaves ahead of sequential reads will be warmed.
+            cache_blocks: Determines if the decoded blocks of the leaves will be cached.
+            build_overviews: Determines if the overview pyramid of the leaves will be built in the background.
             **kwargs: The keyword arguments to create contained arrays.
         """
         if contents_file is not None:
             self.contents_file = contents_file
 
+        if read_workers is not None:
+            self.set_read_workers(read_workers)
+
+        if prefetch is not None:
+            if prefetch:
+                self.enable_prefetch()
+            else:
+                self.disable_prefetch()
+
+        if cache_blocks is not None:
+            if cache_blocks:
+                self.enable_block_cache()
+            else:
+                self.disable_block_cache()
+
         if self.contents_file is not None:
             try:
                 self.get_tzinfo()
@@ -596,6 +1581,50 @@ class TimeContentsProxy(TimeContentsNodeProxy):
 
         super().construct(path=path, proxies=proxies, mode=mode, update=update, open_=open_, build=build, **kwargs)
 
+        if build_overviews is not None:
+            if build_overviews:
+                self.enable_overviews()
+            else:
+                self.disable_overviews()
+
+    def entries_from_rows(self, rows: Iterable[Row]) -> list[dict[str, Any]]:
+        """Creates the keyword arguments for the child proxies from projected contents rows.
+
+        This also advances the latest update to the newest update in the rows.
+
+        Args:
+            rows: The rows of (path, axis, shape, tz_offset, start, end, sample_rate, update_id) to convert.
+
+        Returns:
+            The keyword arguments of the child proxies.
+        """
+        timezones = {}
+        shapes = {}
+        entries = []
+        latest_update = self.latest_update
+        for path, axis, shape, tz_offset, start, end, sample_rate, update_id in rows:
+            if (tzinfo := timezones.get(tz_offset, None)) is None:
+                timezones[tz_offset] = tzinfo = datetime.timezone(datetime.timedelta(seconds=tz_offset))
+            if (shape_tuple := shapes.get(shape, None)) is None:
+                shapes[shape] = shape_tuple = tuple(int(i) for i in shape.split(",") if i.strip())
+            if update_id > latest_update:
+                latest_update = update_id
+
+            entries.append(
+                {
+                    "path": path,
+                    "axis": axis,
+                    "shape": shape_tuple,
+                    "tzinfo": tzinfo,
+                    "start": np.uint64(start),
+                    "end": np.uint64(end),
+                    "sample_rate": sample_rate,
+                }
+            )
+
+        self.latest_update = latest_update
+        return entries
+
     def construct_proxies(self, open_=False, **kwargs: Any) -> None:
         """Constructs the arrays for this object.
 
@@ -606,18 +1635,13 @@ class TimeContentsProxy(TimeContentsNodeProxy):
         if self.tzinfo is None:
             self.get_tzinfo()
 
+        self.proxies.clear()
         self.proxy_paths.clear()
+        self.sort_children()
         with self.contents_file.create_session() as session:
-            entries = self.contents_file.contents.get_all(session=session, as_entries=True)
-
-        for entry in entries:
-            del entry["id"]
-            entry["tzinfo"] = entry.pop("tz_offset")
-            update_id = entry.pop("update_id")
-            if update_id > self.latest_update:
-                self.latest_update = update_id
+            rows = self.contents_file.contents.get_all_rows(session=session)
 
-        self.update_children(paths=entries, open_=open_, sort=True, **kwargs)
+        self.update_children(paths=self.entries_from_rows(rows), open_=open_, sort=True, **kwargs)
 
     async def construct_proxies_async(self, open_=False, **kwargs: Any) -> None:
         """Constructs the arrays for this object.
@@ -626,20 +1650,47 @@ class TimeContentsProxy(TimeContentsNodeProxy):
             open_: Determines if the arrays will remain open after construction.
             **kwargs: The keyword arguments to create contained arrays.
         """
+        self.proxies.clear()
         self.proxy_paths.clear()
-        entries = await self.contents_file.contents.get_all_async(
-            session=self.contents_file.async_session_maker,
-            as_entries=True,
-        )
+        self.sort_children()
+        rows = await self.contents_file.contents.get_all_rows_async(session=self.contents_file.async_session_maker)
 
-        for entry in entries:
-            del entry["id"]
-            entry["tzinfo"] = entry.pop("tz_offset")
-            update_id = entry.pop("update_id")
-            if update_id > self.latest_update:
-                self.latest_update = update_id
+        self.update_children(paths=self.entries_from_rows(rows), open_=open_, sort=True, **kwargs)
+
+    def update_entries(
+        self,
+        entries: list[dict[str, Any]],
+        open_=False,
+        removed: Iterable[str] = (),
+        **kwargs: Any,
+    ) -> None:
+        """Updates the children with new or changed entries, dropping the read state of leaves which changed shape.
 
+        When overviews are on, the levels of the new and changed leaves are built in the background.
+
+        Args:
+            entries: The keyword arguments of the new or changed child proxies.
+            open_: Determines if the arrays will remain open after the update.
+            removed: The paths of the leaves whose entries were removed, such as the leaves merged by compaction.
+            **kwargs: The keyword arguments to create contained arrays.
+        """
+        removed = [self.path / path for path in removed]
+        shapes = [(self.path / e["path"], e["shape"]) for e in entries]
         self.update_children(paths=entries, open_=open_, sort=True, **kwargs)
+        if removed:
+            self.remove_leaf_paths(removed)
+        if self.prefetcher is not None:
+            self.prefetcher.clear()
+        if self.block_cache is not None:
+            for path in removed:
+                self.block_cache.invalidate_leaf(path)
+            for path, shape in shapes:
+                self.block_cache.update_leaf(path, shape)
+        if self.overviews is not None:
+            for path in removed:
+                self.overviews.invalidate_leaf(path)
+        if self.overviews is not None and shapes:
+            self.overviews.schedule(self.get_leaf_entries({path for path, _ in shapes}), self.axis)
 
     def update_proxies(self, open_=False, **kwargs: Any) -> None:
         """Updates the arrays for this object.
@@ -649,22 +1700,18 @@ class TimeContentsProxy(TimeContentsNodeProxy):
             **kwargs: The keyword arguments to create contained arrays.
         """
         with self.contents_file.create_session() as session:
-            entries = self.contents_file.contents.get_from_update(
+            rows = self.contents_file.contents.get_rows_from_update(
                 session=session,
                 update_id=self.latest_update,
                 inclusive=False,
-                as_entries=True,
             )
+            entries = self.entries_from_rows(rows) if rows else []
+            removed = self.find_replaced_paths(entries)
+            if removed:
+                removed -= self.contents_file.contents.get_existing_paths(session=session, paths=removed)
 
         if entries:
-            for entry in entries:
-                del entry["id"]
-                entry["tzinfo"] = entry.pop("tz_offset")
-                update_id = entry.pop("update_id")
-                if update_id > self.latest_update:
-                    self.latest_update = update_id
-
-            self.update_children(paths=entries, open_=open_, sort=True, **kwargs)
+            self.update_entries(entries, open_=open_, removed=removed, **kwargs)
 
     async def update_proxies_async(self, open_=False, **kwargs: Any) -> None:
         """Updates the arrays for this object.
@@ -673,22 +1720,856 @@ class TimeContentsProxy(TimeContentsNodeProxy):
             open_: Determines if the arrays will remain open after the update.
             **kwargs: The keyword arguments to create contained arrays.
         """
-        entries = await self.contents_file.contents.get_from_update_async(
-            session=self.contents_file.async_sessionmaker,
+        rows = await self.contents_file.contents.get_rows_from_update_async(
+            session=self.contents_file.async_session_maker,
             update_id=self.latest_update,
             inclusive=False,
-            as_entries=True,
         )
+        entries = self.entries_from_rows(rows) if rows else []
+        removed = self.find_replaced_paths(entries)
+        if removed:
+            removed -= await self.contents_file.contents.get_existing_paths_async(
+                session=self.contents_file.async_session_maker,
+                paths=removed,
+            )
 
         if entries:
-            for entry in entries:
-                del entry["id"]
-                entry["tzinfo"] = entry.pop("tz_offset")
-                update_id = entry.pop("update_id")
-                if update_id > self.latest_update:
-                    self.latest_update = update_id
-
-            self.update_children(paths=entries, open_=open_, sort=True, **kwargs)
+            self.update_entries(entries, open_=open_, removed=removed, **kwargs)
+
+    def find_replaced_paths(self, entries: list[dict[str, Any]]) -> set[str]:
+        """Finds the leaves which new entries overlap in time, whose entries may have been replaced by the new ones.
+
+        The leaves found are only candidates; the ones whose entries are still in the contents are kept.
+
+        Args:
+            entries: The keyword arguments of the new or changed child proxies.
+
+        Returns:
+            The paths relative to this proxy of the leaves which overlap the entries and are not among them.
+        """
+        if not entries or not self.length:
+            return set()
+
+        paths = set()
+        for entry in entries:
+            for node, row in self.find_time_leaf_rows(int(entry["start"]), int(entry["end"])):
+                paths.add((node.path / node.proxies.paths[row]).relative_to(self.path).as_posix())
+        return paths - {e["path"] for e in entries}
+
+    # Reading
+    def set_read_workers(self, read_workers: int) -> None:
+        """Sets the number of threads which read leaves concurrently.
+
+        Args:
+            read_workers: The number of threads, one or less reads the leaves in the calling thread.
+        """
+        self.read_workers = read_workers
+        self.shutdown_read_executor()
+
+    def get_read_executor(self) -> ThreadPoolExecutor:
+        """Gets the thread pool which reads the leaves, creating it if it does not exist.
+
+        Returns:
+            The thread pool.
+        """
+        if self.read_executor is None:
+            self.read_executor = ThreadPoolExecutor(max_workers=self.read_workers, thread_name_prefix="cdfs_read")
+        return self.read_executor
+
+    def shutdown_read_executor(self) -> None:
+        """Shuts down the thread pool which reads the leaves."""
+        if self.read_executor is not None:
+            self.read_executor.shutdown(wait=True)
+            self.read_executor = None
+
+    def enable_prefetch(
+        self,
+        depth: int | None = None,
+        memory_budget: int | None = None,
+        chunk_length: int | None = None,
+    ) -> ReadAheadPrefetcher:
+        """Turns on warming the leaves ahead of forward sequential reads or changes the settings of the prefetcher.
+
+        Args:
+            depth: The number of leaves to warm ahead of a read.
+            memory_budget: The maximum number of bytes of warmed chunks.
+            chunk_length: The number of samples to warm when a leaf's data is not chunked.
+
+        Returns:
+            The prefetcher.
+        """
+        if self.prefetcher is None:
+            self.prefetcher = ReadAheadPrefetcher(depth=depth, memory_budget=memory_budget, chunk_length=chunk_length)
+        else:
+            self.prefetcher.construct(depth=depth, memory_budget=memory_budget, chunk_length=chunk_length)
+        return self.prefetcher
+
+    def disable_prefetch(self) -> None:
+        """Turns off warming the leaves ahead of sequential reads and drops the warmed chunks."""
+        if self.prefetcher is not None:
+            self.prefetcher.close()
+            self.prefetcher = None
+
+    def enable_block_cache(self, max_bytes: int | None = None, block_length: int | None = None) -> BlockCache:
+        """Turns on caching the decoded blocks of the leaves or changes the settings of the cache.
+
+        Args:
+            max_bytes: The maximum number of bytes of cached blocks.
+            block_length: The number of samples in a block.
+
+        Returns:
+            The block cache.
+        """
+        if self.block_cache is None:
+            self.block_cache = BlockCache(max_bytes=max_bytes, block_length=block_length)
+        else:
+            self.block_cache.construct(max_bytes=max_bytes, block_length=block_length)
+        return self.block_cache
+
+    def disable_block_cache(self) -> None:
+        """Turns off caching the decoded blocks of the leaves and drops the cached blocks."""
+        if self.block_cache is not None:
+            self.block_cache.clear()
+            self.block_cache = None
+
+    def enable_overviews(
+        self,
+        path: pathlib.Path | str | None = None,
+        factor: int | None = None,
+        block_length: int | None = None,
+        max_leaves: int | None = None,
+        background: bool = True,
+    ) -> OverviewPyramid:
+        """Turns on the overview pyramid of the leaves or changes its settings, starting to build the missing levels.
+
+        Args:
+            path: The directory of the sidecar files, defaults to an overviews directory in the path of this proxy.
+            factor: The number of bins of a level which make a bin of the next level.
+            block_length: The number of samples read at a time when building the levels.
+            max_leaves: The number of leaves whose levels are kept in memory.
+            background: Determines if the levels of all the leaves will start building in the background.
+
+        Returns:
+            The overview pyramid.
+        """
+        if self.overviews is None:
+            self.overviews = OverviewPyramid(
+                path=self.path / "overviews" if path is None else path,
+                root=self.path,
+                factor=factor,
+                block_length=block_length,
+                max_leaves=max_leaves,
+            )
+        else:
+            self.overviews.construct(path=path, factor=factor, block_length=block_length, max_leaves=max_leaves)
+
+        if background:
+            self.overviews.schedule(self.get_leaf_entries(), self.axis)
+        return self.overviews
+
+    def disable_overviews(self) -> None:
+        """Turns off the overview pyramid of the leaves, leaving the sidecar files which were built."""
+        if self.overviews is not None:
+            self.overviews.close()
+            self.overviews = None
+
+    def get_leaves(self) -> list[Any]:
+        """Gets all the leaves in order of time.
+
+        Returns:
+            The leaves.
+        """
+        return [leaf for leaf, _, _, _ in self.find_leaf_segments(0, self.length)]
+
+    def get_leaf_entries(
+        self,
+        paths: Iterable[pathlib.Path] | None = None,
+    ) -> list[tuple[pathlib.Path, tuple[int, ...], partial]]:
+        """Gets the path, shape, and a callable which creates the container of the leaves without creating them.
+
+        Args:
+            paths: The paths of the leaves to get, all the leaves if None.
+
+        Returns:
+            The path, shape, and callable which gets the leaf container of each leaf in order of time.
+        """
+        paths = None if paths is None else set(paths)
+        entries = []
+        for node, row, _, _, _ in self.find_leaf_rows(0, self.length):
+            table = node.proxies
+            path = node.path / table.paths[row]
+            if paths is None or path in paths:
+                entries.append((path, table.shapes[table.shape_ids[row]], partial(table.get_leaf, row)))
+        return entries
+
+    def read_leaf_block(
+        self,
+        leaf: Any,
+        index: int,
+        block_length: int,
+        selection: tuple[slice | np.ndarray, ...] | None = None,
+    ) -> np.ndarray:
+        """Reads a block of samples from a leaf.
+
+        Args:
+            leaf: The leaf to read from.
+            index: The index of the block within the leaf.
+            block_length: The number of samples in a block.
+            selection: The selection of the other axes to read, None for all of them.
+
+        Returns:
+            The samples of the block.
+        """
+        slices = [slice(None)] * len(self.shape) if selection is None else list(selection)
+        slices[self.axis] = slice(index * block_length, (index + 1) * block_length)
+        with leaf.use_file():
+            return leaf.get_slices(slices)
+
+    def fill_cached_segment(
+        self,
+        data_array: np.ndarray,
+        leaf: Any,
+        start: int,
+        stop: int,
+        position: int,
+        selection: tuple[slice | np.ndarray, ...] | None = None,
+    ) -> None:
+        """Fills a part of an array with a range of samples from a leaf through the block cache.
+
+        Args:
+            data_array: The array to fill.
+            leaf: The leaf to read from.
+            start: The first sample index within the leaf.
+            stop: The sample index after the range within the leaf.
+            position: The position along the axis of the array to fill from.
+            selection: The selection of the other axes to read, None for all of them.
+        """
+        cache = self.block_cache
+        block_length = cache.block_length
+        path = leaf.path
+        shape = leaf.shape
+        axis = self.axis
+        channels = self.get_selection_key(selection)
+        array_slices = [slice(None)] * data_array.ndim
+        block_slices = [slice(None)] * data_array.ndim
+        for index in range(start // block_length, (stop - 1) // block_length + 1):
+            block = cache.get_block(
+                path,
+                index,
+                lambda: self.read_leaf_block(leaf, index, block_length, selection),
+                channels=channels,
+                shape=shape,
+            )
+            block_start = index * block_length
+            inner_start = max(start, block_start) - block_start
+            inner_stop = min(stop - block_start, block.shape[axis])
+            block_slices[axis] = slice(inner_start, inner_stop)
+            array_slices[axis] = slice(position, position + inner_stop - inner_start)
+            data_array[tuple(array_slices)] = block[tuple(block_slices)]
+            position += inner_stop - inner_start
+
+    def fill_leaf_segment(
+        self,
+        data_array: np.ndarray,
+        leaf: Any,
+        start: int,
+        stop: int,
+        position: int,
+        selection: tuple[slice | np.ndarray, ...] | None = None,
+    ) -> None:
+        """Fills a part of an array with a range of samples from a leaf.
+
+        Args:
+            data_array: The array to fill.
+            leaf: The leaf to read from.
+            start: The first sample index within the leaf.
+            stop: The sample index after the range within the leaf.
+            position: The position along the axis of the array to fill from.
+            selection: The selection of the other axes to read, None for all of them.
+        """
+        array_slices = [slice(None)] * data_array.ndim
+        if self.prefetcher is not None:
+            block = self.prefetcher.take_block(leaf.path, start, stop, self.axis)
+            if block is not None:
+                if selection is not None:
+                    block_slices = list(selection)
+                    block_slices[self.axis] = slice(None)
+                    block = block[tuple(block_slices)]
+                length = block.shape[self.axis]
+                array_slices[self.axis] = slice(position, position + length)
+                data_array[tuple(array_slices)] = block
+                start += length
+                position += length
+                if start >= stop:
+                    return
+
+        if self.block_cache is not None:
+            self.fill_cached_segment(data_array, leaf, start, stop, position, selection)
+            return
+
+        array_slices[self.axis] = slice(position, position + stop - start)
+        slices = [slice(None)] * data_array.ndim if selection is None else list(selection)
+        slices[self.axis] = slice(start, stop)
+        if leaf.get_memmap() is not None:
+            leaf.fill_slices_array(data_array=data_array, array_slices=array_slices, slices=slices)
+        else:
+            with leaf.use_file():
+                leaf.fill_slices_array(data_array=data_array, array_slices=array_slices, slices=slices)
+
+    def fill_leaf_segments(
+        self,
+        data_array: np.ndarray,
+        segments: list[tuple[Any, int, int, int]],
+        selection: tuple[slice | np.ndarray, ...] | None = None,
+    ) -> np.ndarray:
+        """Fills an array with segments of leaves, reading the leaves concurrently if there are several.
+
+        Args:
+            data_array: The array to fill.
+            segments: The leaf, the start and stop within the leaf, and the position in the array of each segment.
+            selection: The selection of the other axes to read, None for all of them.
+
+        Returns:
+            The filled array.
+        """
+        if len(segments) < 2 or self.read_workers < 2:
+            for segment in segments:
+                self.fill_leaf_segment(data_array, *segment, selection)
+        else:
+            executor = self.get_read_executor()
+            futures = [executor.submit(self.fill_leaf_segment, data_array, *segment, selection) for segment in segments]
+            for future in futures:
+                future.result()
+        return data_array
+
+    def create_selection(
+        self,
+        channels: int | slice | Iterable[int] | None = None,
+        channel_axis: int | None = None,
+    ) -> tuple[slice | np.ndarray, ...] | None:
+        """Creates the selection of the axes other than the sample axis which reads a set of channels.
+
+        Increasing runs of channels become slices, so h5py reads them as one hyperslab, and other channels become
+        index arrays which keep their order.
+
+        Args:
+            channels: The channels to read as an index, a slice, or a sequence of indices, None for all the channels.
+            channel_axis: The axis the channels are along, defaults to the last axis which is not the sample axis.
+
+        Returns:
+            The selection of each axis with the whole sample axis, or None if all the channels are read.
+        """
+        if channels is None:
+            return None
+
+        ndim = len(self.shape)
+        if channel_axis is None:
+            channel_axis = ndim - 1 if self.axis != ndim - 1 else ndim - 2
+        elif channel_axis < 0:
+            channel_axis += ndim
+        if not 0 <= channel_axis < ndim or channel_axis == self.axis:
+            raise ValueError(f"channel_axis {channel_axis} must be an axis of the data other than the axis {self.axis}")
+
+        n_channels = self.shape[channel_axis]
+        if isinstance(channels, slice):
+            start, stop, step = channels.indices(n_channels)
+            channels = slice(start, stop, step) if step > 0 else np.arange(start, stop, step)
+        if not isinstance(channels, slice):
+            channels = np.atleast_1d(np.asarray(channels, dtype=np.int64))
+            if channels.ndim != 1:
+                raise ValueError("channels must be an index, a slice, or a one dimensional sequence of indices")
+            if ((channels < -n_channels) | (channels >= n_channels)).any():
+                raise IndexError(f"channels are out of bounds for axis {channel_axis} with size {n_channels}")
+            channels = channels % n_channels
+            if channels.size and (np.diff(channels) == 1).all():
+                channels = slice(int(channels[0]), int(channels[-1]) + 1)
+
+        selection = [slice(None)] * ndim
+        selection[channel_axis] = channels
+        return tuple(selection)
+
+    @staticmethod
+    def get_selection_key(selection: tuple[slice | np.ndarray, ...] | None) -> Hashable:
+        """Creates a hashable key of a selection.
+
+        Args:
+            selection: The selection of each axis.
+
+        Returns:
+            The hashable key of the selection.
+        """
+        if selection is None:
+            return None
+        return tuple((s.start, s.stop, s.step) if isinstance(s, slice) else tuple(s.tolist()) for s in selection)
+
+    def get_read_shape(self, length: int, selection: tuple[slice | np.ndarray, ...] | None = None) -> tuple[int, ...]:
+        """Gets the shape of a read of a number of samples.
+
+        Args:
+            length: The number of samples along the axis.
+            selection: The selection of the other axes to read, None for all of them.
+
+        Returns:
+            The shape of the read.
+        """
+        shape = list(self.shape)
+        if selection is not None:
+            for axis, channels in enumerate(selection):
+                shape[axis] = len(range(shape[axis])[channels]) if isinstance(channels, slice) else channels.size
+        shape[self.axis] = length
+        return tuple(shape)
+
+    def create_read_array(
+        self,
+        length: int,
+        dtype: Any = None,
+        out: np.ndarray | None = None,
+        selection: tuple[slice | np.ndarray, ...] | None = None,
+    ) -> np.ndarray:
+        """Creates the array to read a number of samples into or validates a given one.
+
+        Args:
+            length: The number of samples along the axis.
+            dtype: The dtype of the array.
+            out: An array to read into instead of creating one.
+            selection: The selection of the other axes to read, None for all of them.
+
+        Returns:
+            The array to read into.
+        """
+        shape = self.get_read_shape(length, selection)
+        if out is None:
+            return np.empty(shape, dtype=np.float64 if dtype is None else dtype)
+
+        if out.shape != shape:
+            raise ValueError(f"out has shape {out.shape}, but the read has shape {shape}")
+        if dtype is not None and out.dtype != np.dtype(dtype):
+            raise TypeError(f"out has dtype {out.dtype}, but dtype {np.dtype(dtype)} was requested")
+        return out
+
+    def read_index_range(
+        self,
+        start: int | None = None,
+        stop: int | None = None,
+        dtype: Any = None,
+        out: np.ndarray | None = None,
+        channels: int | slice | Iterable[int] | None = None,
+        channel_axis: int | None = None,
+        copy: bool = True,
+    ) -> np.ndarray:
+        """Reads a range of samples into one array, filling the parts from each leaf concurrently.
+
+        When channels are given, only the hyperslab of those channels is read from each leaf. When copying is off and
+        the range is within one memory mapped leaf, a read-only view of the memory map is returned instead of a copy.
+
+        Args:
+            start: The first sample index of the range.
+            stop: The sample index after the range.
+            dtype: The dtype of the array, defaults to the dtype of the first leaf.
+            out: An array to read into, which must have the shape of the range and the dtype if given.
+            channels: The channels to read as an index, a slice, or a sequence of indices, None for all the channels.
+            channel_axis: The axis the channels are along, defaults to the last axis which is not the sample axis.
+            copy: Determines if the samples are always copied into a new array, otherwise a range within one memory
+                mapped leaf is returned as a read-only view.
+
+        Returns:
+            The samples of the range.
+        """
+        length = self.length
+        start = 0 if start is None else (start + length if start < 0 else min(start, length))
+        stop = length if stop is None else (stop + length if stop < 0 else min(stop, length))
+        stop = max(start, stop)
+
+        segments = self.find_leaf_segments(start, stop)
+        if self.prefetcher is not None and self.prefetcher.is_sequential(start, stop):
+            self.prefetcher.schedule(self.find_leaf_segments(stop, length, limit=self.prefetcher.depth), self.axis)
+
+        selection = self.create_selection(channels, channel_axis)
+        if not copy and out is None and len(segments) == 1 and self.block_cache is None:
+            leaf, inner_start, inner_stop, _ = segments[0]
+            memmap = leaf.get_memmap()
+            if memmap is not None and (dtype is None or np.dtype(dtype) == memmap.dtype):
+                slices = [slice(None)] * memmap.ndim if selection is None else list(selection)
+                slices[self.axis] = slice(inner_start, inner_stop)
+                return np.asarray(leaf.get_slices(slices))
+
+        if dtype is None and out is None and segments:
+            dtype = segments[0][0].data.dtype
+
+        return self.fill_leaf_segments(self.create_read_array(stop - start, dtype, out, selection), segments, selection)
+
+    def read_time_range(
+        self,
+        start: datetime.datetime | float | int | np.dtype | None = None,
+        stop: datetime.datetime | float | int | np.dtype | None = None,
+        dtype: Any = None,
+        out: np.ndarray | None = None,
+        channels: int | slice | Iterable[int] | None = None,
+        channel_axis: int | None = None,
+    ) -> np.ndarray:
+        """Reads the samples from a start time up to a stop time into one array.
+
+        The sample indices of the times are found with the cached start nanostamps and sample rates of the leaves, so
+        no leaves are opened except the ones being read.
+
+        Args:
+            start: The time of the first sample, inclusive.
+            stop: The time after the last sample, exclusive.
+            dtype: The dtype of the array, defaults to the dtype of the first leaf.
+            out: An array to read into, which must have the shape of the range and the dtype if given.
+            channels: The channels to read as an index, a slice, or a sequence of indices, None for all the channels.
+            channel_axis: The axis the channels are along, defaults to the last axis which is not the sample axis.
+
+        Returns:
+            The samples of the time range.
+        """
+        start = None if start is None else self.get_nanostamp_index(int(nanostamp(start)))
+        stop = None if stop is None else self.get_nanostamp_index(int(nanostamp(stop)))
+        return self.read_index_range(
+            start,
+            stop,
+            dtype=dtype,
+            out=out,
+            channels=channels,
+            channel_axis=channel_axis,
+        )
+
+    def read_overview(
+        self,
+        start: datetime.datetime | float | int | np.dtype | None = None,
+        stop: datetime.datetime | float | int | np.dtype | None = None,
+        max_points: int = 2048,
+        channels: int | slice | Iterable[int] | None = None,
+        channel_axis: int | None = None,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Reads the min, max, and mean of a time range at no more than a number of points along the axis.
+
+        The finest level of the overview pyramid which fits the range in the number of points is used, so the cost
+        depends on the number of points rather than the span of the range. The bins at the edges of the range can
+        include samples just outside of it. When the range spans more leaves than fit in the number of points, the bins
+        of neighboring leaves are merged, so the points never exceed the maximum. When the samples of the range fit in
+        the number of points, the samples are returned as the min, max, and mean. The overviews are turned on if they
+        are off, and the levels of the leaves in the range which have not been built are read and built before
+        returning, so the first read of a range costs a full read of it unless the levels were built in the background.
+
+        Args:
+            start: The time of the first sample, inclusive.
+            stop: The time after the last sample, exclusive.
+            max_points: The maximum number of points along the axis.
+            channels: The channels to read as an index, a slice, or a sequence of indices, None for all the channels.
+            channel_axis: The axis the channels are along, defaults to the last axis which is not the sample axis.
+
+        Returns:
+            The start nanostamp of each point, and the min, max, and mean of each point.
+        """
+        length = self.length
+        start = 0 if start is None else self.get_nanostamp_index(int(nanostamp(start)))
+        stop = length if stop is None else self.get_nanostamp_index(int(nanostamp(stop)))
+        stop = max(start, stop)
+        n_samples = stop - start
+        segments = self.find_leaf_segments(start, stop)
+        selection = self.create_selection(channels, channel_axis)
+
+        if n_samples <= max_points:
+            data = self.read_index_range(start, stop, channels=channels, channel_axis=channel_axis)
+            nanostamps = [
+                int(leaf.get_start_nanostamp()) + np.round(np.arange(s, e) * 10**9 / leaf.get_sample_rate())
+                for leaf, s, e, _ in segments
+            ]
+            nanostamps = np.concatenate(nanostamps).astype(np.uint64) if nanostamps else np.empty(0, np.uint64)
+            return nanostamps, data, data, data.astype(np.float64)
+
+        overviews = self.overviews if self.overviews is not None else self.enable_overviews(background=False)
+        factor = overviews.factor
+        level = 0
+        bin_length = factor
+        while bin_length < n_samples and -(-n_samples // bin_length) + 2 * len(segments) > max_points:
+            level += 1
+            bin_length *= factor
+
+        nanostamps = []
+        parts = []
+        counts = []
+        for leaf, inner_start, inner_stop, _ in segments:
+            levels = overviews.get_leaf(leaf, self.axis)
+            index = min(level, len(levels) - 1)
+            bin_length = factor ** (index + 1)
+            first = inner_start // bin_length
+            last = -(-inner_stop // bin_length)
+            period = bin_length * 10**9 / leaf.get_sample_rate()
+            bins = np.arange(first, last)
+            nanostamps.append(int(leaf.get_start_nanostamp()) + np.round(bins * period))
+            parts.append(tuple(array[first:last] for array in levels[index]))
+            counts.append(np.minimum((bins + 1) * bin_length, leaf.shape[self.axis]) - bins * bin_length)
+
+        if not parts:
+            empty = np.empty(self.get_read_shape(0, selection))
+            return np.empty(0, np.uint64), empty, empty, empty
+
+        nanostamps = np.concatenate(nanostamps).astype(np.uint64)
+        minimum, maximum, mean = (np.concatenate(arrays) for arrays in zip(*parts))
+        if nanostamps.size > max_points:
+            group = -(-nanostamps.size // max(max_points, 1))
+            minimum, maximum, mean, _ = overviews.reduce_bins(minimum, maximum, mean, np.concatenate(counts), group)
+            nanostamps = nanostamps[::group]
+
+        slices = [slice(None)] * len(self.shape) if selection is None else list(selection)
+        slices[self.axis] = slice(None)
+        minimum, maximum, mean = (np.moveaxis(array, 0, self.axis)[tuple(slices)] for array in (minimum, maximum, mean))
+        return nanostamps, minimum, maximum, mean
+
+    # Windows
+    @staticmethod
+    def duration_nanoseconds(duration: datetime.timedelta | float | int) -> int:
+        """Converts a duration to an integer number of nanoseconds.
+
+        Args:
+            duration: The duration as a timedelta or in seconds.
+
+        Returns:
+            The number of nanoseconds of the duration.
+        """
+        if isinstance(duration, datetime.timedelta):
+            return (duration.days * 86400 + duration.seconds) * 10**9 + duration.microseconds * 10**3
+        return int(round(duration * 10**9))
+
+    def fill_window(
+        self,
+        data_array: np.ndarray,
+        start: int,
+        stop: int,
+        fill_value: Any = np.nan,
+        selection: tuple[slice | np.ndarray, ...] | None = None,
+    ) -> np.ndarray:
+        """Fills an array with the samples from a start nanostamp to a stop nanostamp, placing each leaf by its time.
+
+        The samples of each leaf are placed at the position of their time within the window, so the parts of the window
+        which are not covered by a leaf are left as the fill value.
+
+        Args:
+            data_array: The array to fill, which has the number of samples of the window along the axis.
+            start: The nanostamp of the start of the window, inclusive.
+            stop: The nanostamp of the end of the window, exclusive.
+            fill_value: The value for the parts of the window without samples.
+            selection: The selection of the other axes to read, None for all of them.
+
+        Returns:
+            The filled array.
+        """
+        length = data_array.shape[self.axis]
+        segments = []
+        n_samples = 0
+        for leaf, inner_start, inner_stop, _ in self.find_leaf_segments(
+            self.get_nanostamp_index(start),
+            self.get_nanostamp_index(stop),
+        ):
+            offset = (int(leaf.get_start_nanostamp()) - start) * leaf.get_sample_rate() / 10**9
+            position = max(ceil(offset + inner_start - 1e-9), 0)
+            inner_stop = min(inner_stop, inner_start + length - position)
+            if inner_start < inner_stop:
+                segments.append((leaf, inner_start, inner_stop, position))
+                n_samples += inner_stop - inner_start
+
+        if n_samples < length:
+            data_array.fill(fill_value)
+        return self.fill_leaf_segments(data_array, segments, selection)
+
+    def create_window_parameters(
+        self,
+        duration: datetime.timedelta | float,
+        step: datetime.timedelta | float | None = None,
+        overlap: datetime.timedelta | float = 0,
+        start: datetime.datetime | float | int | np.dtype | None = None,
+        fill_value: Any = np.nan,
+        dtype: Any = None,
+        selection: tuple[slice | np.ndarray, ...] | None = None,
+    ) -> tuple[int, int, int, tuple[int, ...], np.dtype]:
+        """Creates the nanosecond timing, the shape, and the dtype of the windows to iterate over.
+
+        Args:
+            duration: The duration of each window as a timedelta or in seconds.
+            step: The time between the starts of the windows, defaults to the duration minus the overlap.
+            overlap: The time the windows overlap, used when the step is not given.
+            start: The time of the start of the first window, defaults to the start of the data.
+            fill_value: The value for the parts of the windows without samples.
+            dtype: The dtype of the windows, defaults to the dtype of the data which can hold the fill value.
+            selection: The selection of the other axes to read, None for all of them.
+
+        Returns:
+            The duration, step, and start in nanoseconds, and the shape and dtype of the windows.
+        """
+        duration = self.duration_nanoseconds(duration)
+        step = duration - self.duration_nanoseconds(overlap) if step is None else self.duration_nanoseconds(step)
+        if step <= 0:
+            raise ValueError("The step between windows must be positive.")
+
+        start = self.start_nanostamp if start is None else int(nanostamp(start))
+        if dtype is None:
+            segments = self.find_leaf_segments(0, 1)
+            dtype = np.result_type(segments[0][0].data.dtype, fill_value) if segments else np.float64
+
+        shape = self.get_read_shape(int(round(duration * self.sample_rate / 10**9)), selection)
+        return duration, step, int(start), shape, np.dtype(dtype)
+
+    def iter_windows(
+        self,
+        duration: datetime.timedelta | float,
+        step: datetime.timedelta | float | None = None,
+        overlap: datetime.timedelta | float = 0,
+        start: datetime.datetime | float | int | np.dtype | None = None,
+        stop: datetime.datetime | float | int | np.dtype | None = None,
+        fill_value: Any = np.nan,
+        dtype: Any = None,
+        reuse: bool = True,
+        channels: int | slice | Iterable[int] | None = None,
+        channel_axis: int | None = None,
+    ) -> Iterator[tuple[np.uint64, np.ndarray]]:
+        """Iterates over fixed duration windows of the samples from a start time to a stop time.
+
+        Each window is read straight from the leaves into one buffer, so the memory used does not grow with the range.
+        The parts of a window which fall in a gap between leaves or outside the data are set to the fill value.
+
+        Args:
+            duration: The duration of each window as a timedelta or in seconds.
+            step: The time between the starts of the windows, defaults to the duration minus the overlap.
+            overlap: The time the windows overlap, used when the step is not given.
+            start: The time of the start of the first window, defaults to the start of the data.
+            stop: The time after which no windows start, defaults to the end of the data.
+            fill_value: The value for the parts of the windows without samples.
+            dtype: The dtype of the windows, defaults to the dtype of the data which can hold the fill value.
+            reuse: Determines if the same buffer is yielded for every window, copy a window to keep it past the next.
+            channels: The channels to read as an index, a slice, or a sequence of indices, None for all the channels.
+            channel_axis: The axis the channels are along, defaults to the last axis which is not the sample axis.
+
+        Yields:
+            The start nanostamp of the window and the samples of the window.
+        """
+        selection = self.create_selection(channels, channel_axis)
+        duration, step, start, shape, dtype = self.create_window_parameters(
+            duration,
+            step,
+            overlap,
+            start,
+            fill_value,
+            dtype,
+            selection,
+        )
+        stop = self.end_nanostamp + 1 if stop is None else int(nanostamp(stop))
+        data_array = None
+        for window_start in range(start, stop, step):
+            if data_array is None or not reuse:
+                data_array = np.empty(shape, dtype=dtype)
+            data_array = self.fill_window(data_array, window_start, window_start + duration, fill_value, selection)
+            yield np.uint64(window_start), data_array
+
+    async def aiter_windows(
+        self,
+        duration: datetime.timedelta | float,
+        step: datetime.timedelta | float | None = None,
+        overlap: datetime.timedelta | float = 0,
+        start: datetime.datetime | float | int | np.dtype | None = None,
+        stop: datetime.datetime | float | int | np.dtype | None = None,
+        fill_value: Any = np.nan,
+        dtype: Any = None,
+        ahead: int = 2,
+        follow: bool = False,
+        poll_interval: float = 1.0,
+        channels: int | slice | Iterable[int] | None = None,
+        channel_axis: int | None = None,
+    ) -> AsyncIterator[tuple[np.uint64, np.ndarray]]:
+        """Asynchronously iterates over fixed duration windows, reading the next windows while the current one is used.
+
+        The windows are read in a single worker thread, so reading does not block the loop and only one window is read
+        at a time while the consumer uses the current one. At most the given number of windows are queued ahead of the
+        window being used, which bounds the memory used when the consumer is slower than the reads. Each window is
+        yielded in a buffer which is reused after the consumer asks for the next window, so copy a window to keep it.
+        Closing or cancelling the iteration cancels the windows being read ahead.
+
+        When following, the iteration waits at the end of the data for new leaves, updating the proxies with the
+        contents file until the next window is complete or the stop is reached.
+
+        Args:
+            duration: The duration of each window as a timedelta or in seconds.
+            step: The time between the starts of the windows, defaults to the duration minus the overlap.
+            overlap: The time the windows overlap, used when the step is not given.
+            start: The time of the start of the first window, defaults to the start of the data.
+            stop: The time after which no windows start, defaults to the end of the data or no end when following.
+            fill_value: The value for the parts of the windows without samples.
+            dtype: The dtype of the windows, defaults to the dtype of the data which can hold the fill value.
+            ahead: The number of windows to read ahead of the window being used.
+            follow: Determines if the iteration waits for new data at the end of the data.
+            poll_interval: The seconds to wait between checks for new data when following.
+            channels: The channels to read as an index, a slice, or a sequence of indices, None for all the channels.
+            channel_axis: The axis the channels are along, defaults to the last axis which is not the sample axis.
+
+        Yields:
+            The start nanostamp of the window and the samples of the window.
+        """
+        selection = self.create_selection(channels, channel_axis)
+        duration, step, window_start, shape, dtype = self.create_window_parameters(
+            duration,
+            step,
+            overlap,
+            start,
+            fill_value,
+            dtype,
+            selection,
+        )
+        if stop is not None:
+            stop = int(nanostamp(stop))
+        elif not follow:
+            stop = self.end_nanostamp + 1
+
+        loop = asyncio.get_running_loop()
+        period = ceil(10**9 / self.sample_rate)
+        ahead = max(ahead, 0)
+        buffers = [np.empty(shape, dtype=dtype) for _ in range(ahead + 1)]
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cdfs_window")
+        pending = deque()
+        n_windows = 0
+        try:
+            while True:
+                while len(pending) <= ahead and (stop is None or window_start < stop):
+                    if follow and window_start + duration > self.end_nanostamp + period:
+                        if pending:
+                            break
+                        await self.update_proxies_async()
+                        if window_start + duration > self.end_nanostamp + period:
+                            await asyncio.sleep(poll_interval)
+                            continue
+
+                    data_array = buffers[n_windows % len(buffers)]
+                    future = loop.run_in_executor(
+                        executor,
+                        self.fill_window,
+                        data_array,
+                        window_start,
+                        window_start + duration,
+                        fill_value,
+                        selection,
+                    )
+                    pending.append((window_start, future))
+                    window_start += step
+                    n_windows += 1
+
+                if not pending:
+                    return
+
+                window_start_, future = pending.popleft()
+                yield np.uint64(window_start_), await future
+        finally:
+            for _, future in pending:
+                future.cancel()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def close(self) -> None:
+        """Closes the children and shuts down the threads which read, prefetch, and build overviews of the leaves."""
+        super().close()
+        self.shutdown_read_executor()
+        if self.prefetcher is not None:
+            self.prefetcher.close()
+        if self.overviews is not None:
+            self.overviews.close()
 
     def get_tzinfo(self) -> datetime.tzinfo:
         """Gets the tzinfo from the contents file.
@@ -17,3 +17,7 @@ from .basetable import BaseTable
 from .basemetainformationtable import BaseMetaInformationTable
 from .basecontentstable import BaseContentsTable
 from .basetimecontentstable import BaseTimeContentsTable
+from .basetimesegmentstable import BaseTimeSegmentsTable
+from .basestatisticstable import BaseStatisticsTable
+from .basefilestatstable import BaseFileStatsTable
+from .baseclusteredtimecontentstable import BaseClusteredTimeContentsTable
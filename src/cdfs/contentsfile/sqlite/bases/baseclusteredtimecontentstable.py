@@ -0,0 +1,133 @@
+"""baseclusteredtimecontentstable.py
+
+"""
+# Package Header #
+from ....header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Standard Libraries #
+import uuid
+
+# Third-Party Packages #
+from baseobjects import singlekwargdispatch
+from sqlalchemy import PrimaryKeyConstraint, UniqueConstraint, Uuid, text
+from sqlalchemy.orm import Session, mapped_column
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.types import BigInteger
+
+# Local Packages #
+from .basetimecontentstable import BaseTimeContentsTable
+
+
+# Definitions #
+# Classes #
+class BaseClusteredTimeContentsTable(BaseTimeContentsTable):
+    """A time contents table which stores its rows clustered by time rather than by a random id.
+
+    The table is a WITHOUT ROWID table whose primary key is (start, id), so the B-tree is ordered by time. Appending
+    entries in time order writes to the end of the tree and time ordered scans read contiguous pages. The uuid id is
+    kept as a unique secondary key so entries can still be found by id.
+    """
+    __table_args__ = (
+        PrimaryKeyConstraint("start", "id"),
+        UniqueConstraint("id"),
+        {"sqlite_with_rowid": False},
+    )
+    id = mapped_column(Uuid, default=uuid.uuid4)
+    start = mapped_column(BigInteger, nullable=False)
+
+    # Class Methods #
+    @classmethod
+    def _get_table_sql(cls, session: Session, name: str | None = None) -> str | None:
+        statement = text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :name")
+        return session.execute(statement, {"name": cls.__tablename__ if name is None else name}).scalar()
+
+    @classmethod
+    def is_clustered(cls, session: Session) -> bool:
+        """Checks if the table in the file has the clustered layout.
+
+        Args:
+            session: The session to check the table with.
+
+        Returns:
+            If the table in the file is clustered by time.
+        """
+        sql = cls._get_table_sql(session)
+        return sql is not None and "WITHOUT ROWID" in sql.upper()
+
+    @classmethod
+    def _migrate_table(cls, session: Session) -> bool:
+        name = cls.__tablename__
+        old_name = f"{name}_unclustered"
+        connection = session.connection()
+
+        if cls._get_table_sql(session) is None:
+            cls.__table__.create(connection)
+            return True
+        elif cls.is_clustered(session):
+            return False
+
+        connection.exec_driver_sql(f'ALTER TABLE "{name}" RENAME TO "{old_name}"')
+        cls.__table__.create(connection)
+
+        old_columns = {r[1] for r in connection.exec_driver_sql(f'PRAGMA table_info("{old_name}")')}
+        columns = ", ".join(f'"{c.name}"' for c in cls.__table__.columns if c.name in old_columns)
+        connection.exec_driver_sql(
+            f'INSERT INTO "{name}" ({columns}) SELECT {columns} FROM "{old_name}" ORDER BY "start", "id"'
+        )
+        connection.exec_driver_sql(f'DROP TABLE "{old_name}"')
+        return True
+
+    @classmethod
+    def migrate_table(cls, session: Session, begin: bool = False) -> bool:
+        """Rebuilds an existing contents table with the clustered layout, keeping all of its rows.
+
+        Args:
+            session: The session to migrate the table with.
+            begin: Determines if this method will begin and commit a transaction.
+
+        Returns:
+            If the table was changed.
+        """
+        if begin:
+            with session.begin():
+                return cls._migrate_table(session)
+        else:
+            return cls._migrate_table(session)
+
+    @singlekwargdispatch(kwarg="session")
+    @classmethod
+    async def migrate_table_async(
+        cls,
+        session: async_sessionmaker[AsyncSession] | AsyncSession,
+        begin: bool = False,
+    ) -> bool:
+        raise TypeError(f"{type(session)} is not a valid type.")
+
+    @migrate_table_async.register(async_sessionmaker)
+    @classmethod
+    async def _migrate_table_async(cls, session: async_sessionmaker[AsyncSession], begin: bool = False) -> bool:
+        async with session() as async_session:
+            if begin:
+                async with async_session.begin():
+                    return await async_session.run_sync(cls._migrate_table)
+            else:
+                changed = await async_session.run_sync(cls._migrate_table)
+                await async_session.commit()
+                return changed
+
+    @migrate_table_async.register(AsyncSession)
+    @classmethod
+    async def _migrate_table_async(cls, session: AsyncSession, begin: bool = False) -> bool:
+        if begin:
+            async with session.begin():
+                return await session.run_sync(cls._migrate_table)
+        else:
+            return await session.run_sync(cls._migrate_table)
@@ -13,11 +13,19 @@ __email__ = __email__
 
 # Imports #
 # Standard Libraries #
+import asyncio
+from collections.abc import Callable, Iterable
+from concurrent.futures import ProcessPoolExecutor
+from fnmatch import fnmatch
+import multiprocessing
+import os
 import pathlib
 from typing import Any
 import uuid
 
 # Third-Party Packages #
+from baseobjects import singlekwargdispatch
+from sqlalchemy import delete, func, insert, select, update
 from sqlalchemy.orm import Mapped, Session
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
@@ -27,6 +35,14 @@ from .basetable import BaseTable
 
 
 # Definitions #
+# Functions #
+def _read_entry(reader: Callable[[pathlib.Path], dict[str, Any] | None], path: pathlib.Path) -> tuple[Any, bool]:
+    try:
+        return reader(path), True
+    except Exception:
+        return None, False
+
+
 # Classes #
 class BaseContentsTable(BaseTable):
     __tablename__ = "contents"
@@ -36,6 +52,7 @@ class BaseContentsTable(BaseTable):
     shape: Mapped[str]
 
     file_type: type | None = None
+    read_start_method: str = "spawn"
 
     # Class Methods #
     @classmethod
@@ -56,17 +73,291 @@ class BaseContentsTable(BaseTable):
         return kwargs
 
     @classmethod
-    def correct_contents(cls, session: Session, path: pathlib.Path, begin: bool = False) -> None:
-        raise NotImplementedError
+    def get_existing_paths(cls, session: Session, paths: Iterable[str]) -> set[str]:
+        """Gets which of the paths have entries.
+
+        Args:
+            session: The session to query with.
+            paths: The paths to check.
+
+        Returns:
+            The paths which have entries.
+        """
+        paths = list(paths)
+        existing = set()
+        for i in range(0, len(paths), 500):
+            existing.update(session.execute(select(cls.path).where(cls.path.in_(paths[i:i + 500]))).scalars())
+        return existing
+
+    @singlekwargdispatch(kwarg="session")
+    @classmethod
+    async def get_existing_paths_async(
+        cls,
+        session: async_sessionmaker[AsyncSession] | AsyncSession,
+        paths: Iterable[str],
+    ) -> set[str]:
+        raise TypeError(f"{type(session)} is not a valid type.")
+
+    @get_existing_paths_async.register(async_sessionmaker)
+    @classmethod
+    async def _get_existing_paths_async(
+        cls,
+        session: async_sessionmaker[AsyncSession],
+        paths: Iterable[str],
+    ) -> set[str]:
+        async with session() as async_session:
+            return await async_session.run_sync(cls.get_existing_paths, paths)
+
+    @get_existing_paths_async.register(AsyncSession)
+    @classmethod
+    async def _get_existing_paths_async(cls, session: AsyncSession, paths: Iterable[str]) -> set[str]:
+        return await session.run_sync(cls.get_existing_paths, paths)
+
+    @classmethod
+    def scan_files(
+        cls,
+        path: pathlib.Path,
+        pattern: str = "*",
+        exclude: Iterable[str] = (),
+    ) -> dict[str, tuple[int, int, int]]:
+        """Finds the files in a directory and its subdirectories with the stat results of os.scandir.
+
+        Args:
+            path: The directory to scan.
+            pattern: The fnmatch pattern of the paths of the files to find relative to the directory.
+            exclude: The prefixes of the names or the fnmatch patterns of the relative paths of the files and
+                directories to skip.
+
+        Returns:
+            The size, modification time in nanoseconds, and inode of each file by its path relative to the directory.
+        """
+        exclude = tuple(exclude)
+        files = {}
+        directories = [(pathlib.Path(path), "")]
+        while directories:
+            directory, prefix = directories.pop()
+            with os.scandir(directory) as iterator:
+                for entry in iterator:
+                    relative = prefix + entry.name
+                    if exclude and (entry.name.startswith(exclude) or any(fnmatch(relative, e) for e in exclude)):
+                        continue
+                    elif entry.is_dir():
+                        directories.append((pathlib.Path(entry.path), relative + "/"))
+                    elif entry.is_file() and fnmatch(relative, pattern):
+                        stat = entry.stat()
+                        files[relative] = (stat.st_size, stat.st_mtime_ns, stat.st_ino)
+        return dict(sorted(files.items()))
 
+    @classmethod
+    def read_entries(
+        cls,
+        path: pathlib.Path,
+        files: Iterable[str],
+        reader: Callable[[pathlib.Path], dict[str, Any] | None],
+        workers: int | None = None,
+    ) -> tuple[dict[str, dict[str, Any]], list[str]]:
+        """Reads the entries of files in a process pool.
+
+        The processes are started with the read_start_method of this table rather than by forking, so they do not
+        inherit the locks of the threads which may be running, such as those which prefetch or build overviews.
+
+        Args:
+            path: The directory the files are in.
+            files: The paths of the files relative to the directory.
+            reader: The picklable callable which reads the entry of a file, returning None for files which are not
+                leaves.
+            workers: The number of processes which read the files, defaults to the number of processors.
+
+        Returns:
+            The entries by the path of their file relative to the directory and the relative paths of the files which
+            could not be read.
+        """
+        path = pathlib.Path(path)
+        files = list(files)
+        entries = {}
+        unreadable = []
+        if not files:
+            return entries, unreadable
+
+        chunksize = max(1, len(files) // (4 * (workers or os.cpu_count() or 1)))
+        context = multiprocessing.get_context(cls.read_start_method)
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+            results = executor.map(_read_entry, [reader] * len(files), [path / f for f in files], chunksize=chunksize)
+            for file, (entry, readable) in zip(files, results):
+                if not readable:
+                    unreadable.append(file)
+                elif entry is not None:
+                    entries[file] = entry | {"path": file}
+        return entries, unreadable
+
+    @classmethod
+    def scan_entries(
+        cls,
+        path: pathlib.Path,
+        reader: Callable[[pathlib.Path], dict[str, Any] | None],
+        pattern: str = "*",
+        exclude: Iterable[str] = (),
+        workers: int | None = None,
+    ) -> tuple[dict[str, dict[str, Any]], list[str]]:
+        """Reads the entries of the files in a directory and its subdirectories in a process pool.
+
+        Args:
+            path: The directory to scan.
+            reader: The picklable callable which reads the entry of a file, returning None for files which are not
+                leaves.
+            pattern: The fnmatch pattern of the paths of the files to read relative to the directory.
+            exclude: The prefixes of the names or the fnmatch patterns of the relative paths of the files and
+                directories to skip.
+            workers: The number of processes which read the files, defaults to the number of processors.
+
+        Returns:
+            The entries by the path of their file relative to the directory and the relative paths of the files which
+            could not be read.
+        """
+        return cls.read_entries(path, cls.scan_files(path, pattern, exclude), reader, workers)
+
+    @classmethod
+    def reconcile_entries(
+        cls,
+        session: Session,
+        entries: dict[str, dict[str, Any]],
+        keep: Iterable[str] = (),
+    ) -> dict[str, list[str]]:
+        """Makes the entries match scanned entries with bulk inserts, updates, and deletes.
+
+        The entries are updated by id rather than by primary key, since the primary key of some tables includes the
+        start, which an update may change.
+
+        Args:
+            session: The session to change the entries with.
+            entries: The scanned entries by path.
+            keep: The paths of the entries which are kept as they are, such as those of files which did not change.
+
+        Returns:
+            The paths of the added, updated, and removed entries.
+        """
+        update_id = (session.execute(select(func.max(cls.update_id))).scalar() or 0) + 1
+        existing = {item.path: item for item in session.execute(select(cls)).scalars()}
+        for path in keep:
+            existing.pop(path, None)
+
+        added = []
+        updated = []
+        for path, entry in entries.items():
+            values = cls.format_entry_kwargs(**entry)
+            item = existing.pop(path, None)
+            if item is None:
+                added.append(values | {"update_id": update_id})
+            elif any(getattr(item, k) != v for k, v in values.items()):
+                updated.append((item.id, values | {"update_id": update_id}))
+        removed = [item.id for item in existing.values()]
+
+        for i in range(0, len(removed), 500):
+            session.execute(delete(cls).where(cls.id.in_(removed[i:i + 500])))
+        for id_, values in updated:
+            statement = update(cls).where(cls.id == id_).values(values)
+            session.execute(statement.execution_options(synchronize_session=False))
+        if added:
+            session.execute(insert(cls), added)
+        return {
+            "added": [e["path"] for e in added],
+            "updated": [e["path"] for _, e in updated],
+            "removed": sorted(existing),
+        }
+
+    @classmethod
+    def correct_contents(
+        cls,
+        session: Session,
+        path: pathlib.Path,
+        reader: Callable[[pathlib.Path], dict[str, Any] | None],
+        pattern: str = "*",
+        exclude: Iterable[str] = (),
+        workers: int | None = None,
+        begin: bool = False,
+    ) -> dict[str, list[str]]:
+        """Scans a directory for leaf files and makes the entries match them.
+
+        The files are read in a process pool, then the entries of new files are inserted, the entries which differ from
+        their files are updated, and the entries without files are deleted with bulk statements. The entries of files
+        which could not be read are kept as they are. The inserted and updated entries get a new update id, so proxies
+        which update pick them up.
+
+        Args:
+            session: The session to correct the entries with.
+            path: The directory to scan.
+            reader: The picklable callable which reads the entry of a file, returning None for files which are not
+                leaves.
+            pattern: The fnmatch pattern of the paths of the files to read relative to the directory.
+            exclude: The prefixes of the names or the fnmatch patterns of the relative paths of the files and
+                directories to skip.
+            workers: The number of processes which read the files, defaults to the number of processors.
+            begin: Determines if this method will begin and commit a transaction.
+
+        Returns:
+            The relative paths of the added, updated, removed, and unreadable files.
+        """
+        entries, unreadable = cls.scan_entries(path, reader, pattern, exclude, workers)
+        if begin:
+            with session.begin():
+                changes = cls.reconcile_entries(session, entries, unreadable)
+        else:
+            changes = cls.reconcile_entries(session, entries, unreadable)
+        return changes | {"unreadable": unreadable}
+
+    @singlekwargdispatch(kwarg="session")
     @classmethod
     async def correct_contents_async(
         cls,
         session: async_sessionmaker[AsyncSession] | AsyncSession,
         path: pathlib.Path,
+        reader: Callable[[pathlib.Path], dict[str, Any] | None],
+        pattern: str = "*",
+        exclude: Iterable[str] = (),
+        workers: int | None = None,
+        begin: bool = False,
+    ) -> dict[str, list[str]]:
+        raise TypeError(f"{type(session)} is not a valid type.")
+
+    @correct_contents_async.register(async_sessionmaker)
+    @classmethod
+    async def _correct_contents_async(
+        cls,
+        session: async_sessionmaker[AsyncSession],
+        path: pathlib.Path,
+        reader: Callable[[pathlib.Path], dict[str, Any] | None],
+        pattern: str = "*",
+        exclude: Iterable[str] = (),
+        workers: int | None = None,
+        begin: bool = False,
+    ) -> dict[str, list[str]]:
+        scan = (path, reader, pattern, exclude, workers)
+        entries, unreadable = await asyncio.get_running_loop().run_in_executor(None, cls.scan_entries, *scan)
+        async with session() as async_session:
+            async with async_session.begin():
+                changes = await async_session.run_sync(cls.reconcile_entries, entries, unreadable)
+        return changes | {"unreadable": unreadable}
+
+    @correct_contents_async.register(AsyncSession)
+    @classmethod
+    async def _correct_contents_async(
+        cls,
+        session: AsyncSession,
+        path: pathlib.Path,
+        reader: Callable[[pathlib.Path], dict[str, Any] | None],
+        pattern: str = "*",
+        exclude: Iterable[str] = (),
+        workers: int | None = None,
         begin: bool = False,
-    ) -> None:
-        raise NotImplementedError
+    ) -> dict[str, list[str]]:
+        scan = (path, reader, pattern, exclude, workers)
+        entries, unreadable = await asyncio.get_running_loop().run_in_executor(None, cls.scan_entries, *scan)
+        if begin:
+            async with session.begin():
+                changes = await session.run_sync(cls.reconcile_entries, entries, unreadable)
+        else:
+            changes = await session.run_sync(cls.reconcile_entries, entries, unreadable)
+        return changes | {"unreadable": unreadable}
 
     # Instance Methods #
     def update(self, dict_: dict[str, Any] | None = None, /, **kwargs) -> None:
@@ -0,0 +1,96 @@
+"""basefilestatstable.py
+A table which stores the size, modification time, and inode of the file of each contents entry.
+"""
+# Package Header #
+from ....header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Standard Libraries #
+from collections.abc import Iterable, Mapping
+import uuid
+
+# Third-Party Packages #
+from sqlalchemy import Uuid, delete, insert, select
+from sqlalchemy.orm import Session, mapped_column
+from sqlalchemy.types import BigInteger
+
+# Local Packages #
+from .basetable import BaseTable
+from .basecontentstable import BaseContentsTable
+
+
+# Definitions #
+# Classes #
+class BaseFileStatsTable(BaseTable):
+    """A table which stores the size, modification time, and inode of the file of each contents entry.
+
+    The values are the stat results of the file when its entry was last read, so a rescan can skip the files whose stat
+    results did not change. They are kept in their own table, so contents files made before the table existed do not
+    need their contents table migrated.
+    """
+    __tablename__ = "filestats"
+    __mapper_args__ = {"polymorphic_identity": "filestats"}
+    contents_id = mapped_column(Uuid, index=True)
+    size = mapped_column(BigInteger)
+    mtime = mapped_column(BigInteger)
+    inode = mapped_column(BigInteger)
+
+    # Class Methods #
+    @classmethod
+    def get_file_stats(
+        cls,
+        session: Session,
+        contents: type[BaseContentsTable],
+    ) -> dict[str, tuple[int, int, int]]:
+        """Gets the stored stat results of the files of the contents entries.
+
+        Args:
+            session: The session to query with.
+            contents: The contents table to get the paths of the entries from.
+
+        Returns:
+            The size, modification time in nanoseconds, and inode of the file of each entry by path.
+        """
+        if not cls.has_table(session):
+            return {}
+        statement = select(contents.path, cls.size, cls.mtime, cls.inode).join(contents, contents.id == cls.contents_id)
+        return {path: (size, mtime, inode) for path, size, mtime, inode in session.execute(statement)}
+
+    @classmethod
+    def delete_file_stats(cls, session: Session, ids: Iterable[uuid.UUID]) -> None:
+        """Deletes the stat results of contents entries if the table exists.
+
+        Args:
+            session: The session to delete the stat results with.
+            ids: The ids of the contents entries.
+        """
+        if cls.has_table(session):
+            ids = list(ids)
+            for i in range(0, len(ids), 500):
+                session.execute(delete(cls).where(cls.contents_id.in_(ids[i:i + 500])))
+
+    @classmethod
+    def set_file_stats(cls, session: Session, stats: Mapping[uuid.UUID, tuple[int, int, int]]) -> None:
+        """Replaces the stat results of contents entries, creating the table if it does not exist.
+
+        Args:
+            session: The session to set the stat results with.
+            stats: The size, modification time in nanoseconds, and inode of the file by contents entry id.
+        """
+        cls.require_table(session)
+        cls.delete_file_stats(session, stats)
+        if stats:
+            session.execute(
+                insert(cls),
+                [
+                    {"contents_id": i, "size": size, "mtime": mtime, "inode": inode}
+                    for i, (size, mtime, inode) in stats.items()
+                ],
+            )
@@ -0,0 +1,350 @@
+"""basestatisticstable.py
+A table which stores the summary statistics of each channel of each contents entry.
+"""
+# Package Header #
+from ....header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Standard Libraries #
+from collections.abc import Iterable, Mapping
+import uuid
+
+# Third-Party Packages #
+from baseobjects import singlekwargdispatch
+import numpy as np
+from sqlalchemy import Row, Uuid, delete, func, insert, or_, select
+from sqlalchemy.orm import Mapped, Session, mapped_column
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.types import BigInteger
+
+# Local Packages #
+from .basetable import BaseTable
+from .basetimecontentstable import BaseTimeContentsTable
+
+
+# Definitions #
+# Constants #
+STATISTICS_FIELDS = ("count", "minimum", "maximum", "total", "total_squares")
+
+
+# Classes #
+class BaseStatisticsTable(BaseTable):
+    """A table which stores the summary statistics of each channel of each contents entry.
+
+    Each row holds the number of samples which are not NaN, the minimum, the maximum, the sum, and the sum of squares of
+    a channel of a contents entry. These combine across entries without the raw data, so the statistics of a time
+    window only need the raw data of the entries which are partly in the window. The channels of an entry are every
+    index of the axes other than the sample axis in C order.
+    """
+    __tablename__ = "statistics"
+    __mapper_args__ = {"polymorphic_identity": "statistics"}
+    contents_id = mapped_column(Uuid, index=True)
+    channel: Mapped[int]
+    count = mapped_column(BigInteger)
+    minimum: Mapped[float | None]
+    maximum: Mapped[float | None]
+    total: Mapped[float | None]
+    total_squares: Mapped[float | None]
+
+    # Static Methods #
+    @staticmethod
+    def compute_statistics(data: np.ndarray, axis: int = 0) -> dict[str, np.ndarray]:
+        """Computes the summary statistics of each channel of an array, ignoring NaNs.
+
+        Args:
+            data: The samples to compute the statistics of.
+            axis: The axis the samples are along.
+
+        Returns:
+            The count, minimum, maximum, total, and total_squares of each channel.
+        """
+        data = np.moveaxis(np.asarray(data), axis, 0)
+        values = data.reshape(data.shape[0], -1).astype(np.float64)
+        valid = ~np.isnan(values)
+        values = np.where(valid, values, 0.0)
+        return {
+            "count": valid.sum(axis=0, dtype=np.int64),
+            "minimum": np.fmin.reduce(np.where(valid, values, np.inf), axis=0, initial=np.inf),
+            "maximum": np.fmax.reduce(np.where(valid, values, -np.inf), axis=0, initial=-np.inf),
+            "total": values.sum(axis=0),
+            "total_squares": np.square(values).sum(axis=0),
+        }
+
+    @staticmethod
+    def combine_statistics(statistics: Iterable[dict[str, np.ndarray]]) -> dict[str, np.ndarray] | None:
+        """Combines the summary statistics of parts of the same channels and derives their mean and RMS.
+
+        Args:
+            statistics: The count, minimum, maximum, total, and total_squares of each channel of each part.
+
+        Returns:
+            The combined count, minimum, maximum, total, total_squares, mean, and rms of each channel, or None if there
+            are no parts.
+        """
+        statistics = list(statistics)
+        if not statistics:
+            return None
+
+        count = np.sum([s["count"] for s in statistics], axis=0)
+        combined = {
+            "count": count,
+            "minimum": np.fmin.reduce([s["minimum"] for s in statistics], axis=0),
+            "maximum": np.fmax.reduce([s["maximum"] for s in statistics], axis=0),
+            "total": np.sum([s["total"] for s in statistics], axis=0),
+            "total_squares": np.sum([s["total_squares"] for s in statistics], axis=0),
+        }
+        empty = count == 0
+        combined["minimum"] = np.where(empty | np.isinf(combined["minimum"]), np.nan, combined["minimum"])
+        combined["maximum"] = np.where(empty | np.isinf(combined["maximum"]), np.nan, combined["maximum"])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            combined["mean"] = np.where(empty, np.nan, combined["total"] / count)
+            combined["rms"] = np.where(empty, np.nan, np.sqrt(combined["total_squares"] / count))
+        return combined
+
+    # Class Methods #
+    @classmethod
+    def get_contents_id(cls, session: Session, contents: type[BaseTimeContentsTable], path: str) -> uuid.UUID | None:
+        """Gets the id of the contents entry of a path.
+
+        Args:
+            session: The session to query with.
+            contents: The contents table to get the entry from.
+            path: The path of the entry.
+
+        Returns:
+            The id of the entry or None if there is no entry with the path.
+        """
+        return session.execute(select(contents.id).where(contents.path == str(path))).scalar()
+
+    @classmethod
+    def get_entries_without_statistics(
+        cls,
+        session: Session,
+        contents: type[BaseTimeContentsTable],
+    ) -> tuple[Row, ...]:
+        """Gets the id and path of the contents entries which have no statistics.
+
+        Args:
+            session: The session to query with.
+            contents: The contents table to get the entries from.
+
+        Returns:
+            The id and path of each entry without statistics, ordered by start.
+        """
+        statement = select(contents.id, contents.path).order_by(contents.start)
+        if cls.has_table(session):
+            statement = statement.where(~select(cls.contents_id).where(cls.contents_id == contents.id).exists())
+        return tuple(session.execute(statement))
+
+    @classmethod
+    def get_channel_statistics(
+        cls,
+        session: Session,
+        contents: type[BaseTimeContentsTable],
+        channel: int,
+    ) -> tuple[Row, ...]:
+        """Gets the statistics of a channel of every contents entry which has statistics.
+
+        Args:
+            session: The session to query with.
+            contents: The contents table to get the paths of the entries from.
+            channel: The channel to get the statistics of.
+
+        Returns:
+            The path, count, minimum, and maximum of the channel of each entry.
+        """
+        if not cls.has_table(session):
+            return ()
+        statement = (
+            select(contents.path, cls.count, cls.minimum, cls.maximum)
+            .join(contents, contents.id == cls.contents_id)
+            .where(cls.channel == channel)
+        )
+        return tuple(session.execute(statement))
+
+    @classmethod
+    def delete_statistics(cls, session: Session, ids: Iterable[uuid.UUID]) -> None:
+        """Deletes the statistics of contents entries if the table exists.
+
+        Args:
+            session: The session to delete the statistics with.
+            ids: The ids of the contents entries.
+        """
+        if cls.has_table(session):
+            ids = list(ids)
+            for i in range(0, len(ids), 500):
+                session.execute(delete(cls).where(cls.contents_id.in_(ids[i:i + 500])))
+
+    @classmethod
+    def _set_statistics(cls, session: Session, statistics: Mapping[uuid.UUID, dict[str, np.ndarray]]) -> None:
+        cls.require_table(session)
+        cls.delete_statistics(session, statistics)
+
+        rows = []
+        for contents_id, channels in statistics.items():
+            values = [np.asarray(channels[name]).tolist() for name in STATISTICS_FIELDS]
+            for channel, (count, minimum, maximum, total, total_squares) in enumerate(zip(*values)):
+                rows.append(
+                    {
+                        "contents_id": contents_id,
+                        "channel": channel,
+                        "count": count,
+                        "minimum": minimum,
+                        "maximum": maximum,
+                        "total": total,
+                        "total_squares": total_squares,
+                    }
+                )
+        if rows:
+            session.execute(insert(cls), rows)
+
+    @classmethod
+    def set_statistics(
+        cls,
+        session: Session,
+        statistics: Mapping[uuid.UUID, dict[str, np.ndarray]],
+        begin: bool = False,
+    ) -> None:
+        """Replaces the statistics of contents entries, creating the table if it does not exist.
+
+        Args:
+            session: The session to set the statistics with.
+            statistics: The count, minimum, maximum, total, and total_squares of each channel by contents entry id.
+            begin: Determines if this method will begin and commit a transaction.
+        """
+        if begin:
+            with session.begin():
+                cls._set_statistics(session, statistics)
+        else:
+            cls._set_statistics(session, statistics)
+
+    @singlekwargdispatch(kwarg="session")
+    @classmethod
+    async def set_statistics_async(
+        cls,
+        session: async_sessionmaker[AsyncSession] | AsyncSession,
+        statistics: Mapping[uuid.UUID, dict[str, np.ndarray]],
+        begin: bool = False,
+    ) -> None:
+        raise TypeError(f"{type(session)} is not a valid type.")
+
+    @set_statistics_async.register(async_sessionmaker)
+    @classmethod
+    async def _set_statistics_async(
+        cls,
+        session: async_sessionmaker[AsyncSession],
+        statistics: Mapping[uuid.UUID, dict[str, np.ndarray]],
+        begin: bool = False,
+    ) -> None:
+        async with session() as async_session:
+            async with async_session.begin():
+                await async_session.run_sync(cls._set_statistics, statistics)
+
+    @set_statistics_async.register(AsyncSession)
+    @classmethod
+    async def _set_statistics_async(
+        cls,
+        session: AsyncSession,
+        statistics: Mapping[uuid.UUID, dict[str, np.ndarray]],
+        begin: bool = False,
+    ) -> None:
+        if begin:
+            async with session.begin():
+                await session.run_sync(cls._set_statistics, statistics)
+        else:
+            await session.run_sync(cls._set_statistics, statistics)
+
+    @classmethod
+    def get_window_statistics(
+        cls,
+        session: Session,
+        contents: type[BaseTimeContentsTable],
+        start: int,
+        stop: int,
+    ) -> tuple[dict[str, np.ndarray] | None, tuple[Row, ...]]:
+        """Combines the statistics of the entries in a window and finds the entries which need their raw data read.
+
+        Args:
+            session: The session to query with.
+            contents: The contents table to get the entries from.
+            start: The nanostamp of the start of the window, inclusive.
+            stop: The nanostamp of the end of the window, exclusive.
+
+        Returns:
+            The count, minimum, maximum, total, and total_squares of each channel of the entries wholly in the window
+            which have statistics, or None if there are none, and the path, start, and end of each other entry which
+            overlaps the window.
+        """
+        if not cls.has_table(session):
+            statement = select(contents.path, contents.start, contents.end).where(
+                contents.end >= start,
+                contents.start < stop,
+            )
+            return None, tuple(session.execute(statement.order_by(contents.start)))
+
+        statement = (
+            select(
+                cls.channel,
+                func.sum(cls.count),
+                func.min(cls.minimum),
+                func.max(cls.maximum),
+                func.sum(cls.total),
+                func.sum(cls.total_squares),
+            )
+            .join(contents, contents.id == cls.contents_id)
+            .where(contents.start >= start, contents.end < stop)
+            .group_by(cls.channel)
+            .order_by(cls.channel)
+        )
+        rows = session.execute(statement).all()
+        arrays = BaseTimeContentsTable.rows_to_arrays(rows, (np.int64,) * 2 + (np.float64,) * 4)
+        totals = dict(zip(STATISTICS_FIELDS, arrays[1:])) if rows else None
+
+        has_statistics = select(cls.contents_id).where(cls.contents_id == contents.id).exists()
+        statement = select(contents.path, contents.start, contents.end).where(
+            contents.end >= start,
+            contents.start < stop,
+            or_(contents.start < start, contents.end >= stop, ~has_statistics),
+        )
+        return totals, tuple(session.execute(statement.order_by(contents.start)))
+
+    @singlekwargdispatch(kwarg="session")
+    @classmethod
+    async def get_window_statistics_async(
+        cls,
+        session: async_sessionmaker[AsyncSession] | AsyncSession,
+        contents: type[BaseTimeContentsTable],
+        start: int,
+        stop: int,
+    ) -> tuple[dict[str, np.ndarray] | None, tuple[Row, ...]]:
+        raise TypeError(f"{type(session)} is not a valid type.")
+
+    @get_window_statistics_async.register(async_sessionmaker)
+    @classmethod
+    async def _get_window_statistics_async(
+        cls,
+        session: async_sessionmaker[AsyncSession],
+        contents: type[BaseTimeContentsTable],
+        start: int,
+        stop: int,
+    ) -> tuple[dict[str, np.ndarray] | None, tuple[Row, ...]]:
+        async with session() as async_session:
+            return await async_session.run_sync(cls.get_window_statistics, contents, start, stop)
+
+    @get_window_statistics_async.register(AsyncSession)
+    @classmethod
+    async def _get_window_statistics_async(
+        cls,
+        session: AsyncSession,
+        contents: type[BaseTimeContentsTable],
+        start: int,
+        stop: int,
+    ) -> tuple[dict[str, np.ndarray] | None, tuple[Row, ...]]:
+        return await session.run_sync(cls.get_window_statistics, contents, start, stop)
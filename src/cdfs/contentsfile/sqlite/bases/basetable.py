@@ -19,7 +19,7 @@ import uuid
 
 # Third-Party Packages #
 from baseobjects import singlekwargdispatch
-from sqlalchemy import Uuid, Result, select, lambda_stmt, func
+from sqlalchemy import Uuid, Result, inspect, select, lambda_stmt, func
 from sqlalchemy.orm import mapped_column, Session
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.types import BigInteger
@@ -36,6 +36,27 @@ class BaseTable:
     update_id = mapped_column(BigInteger, default=0)
 
     # Class Methods #
+    @classmethod
+    def has_table(cls, session: Session) -> bool:
+        """Checks if the table exists in the file.
+
+        Args:
+            session: The session to check with.
+
+        Returns:
+            If the table exists.
+        """
+        return inspect(session.connection()).has_table(cls.__tablename__)
+
+    @classmethod
+    def require_table(cls, session: Session) -> None:
+        """Creates the table in the file if it does not exist.
+
+        Args:
+            session: The session to create the table with.
+        """
+        cls.__table__.create(session.connection(), checkfirst=True)
+
     @classmethod
     def format_entry_kwargs(cls, id_: str | uuid.UUID | None = None, **kwargs: Any) -> dict[str, Any]:
         if id_ is not None:
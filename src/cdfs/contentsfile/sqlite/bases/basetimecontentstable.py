@@ -13,6 +13,7 @@ __email__ = __email__
 
 # Imports #
 # Standard Libraries #
+from collections.abc import Iterable, Sequence
 import datetime
 from decimal import Decimal
 import time
@@ -25,7 +26,8 @@ from baseobjects import singlekwargdispatch
 from baseobjects.operations import timezone_offset
 from dspobjects.time import nanostamp, Timestamp
 import numpy as np
-from sqlalchemy import select, func, lambda_stmt
+from sqlalchemy import Row, delete, select, func, lambda_stmt
+from sqlalchemy.sql import StatementLambdaElement
 from sqlalchemy.orm import Mapped, Session, mapped_column
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.types import BigInteger
@@ -191,6 +193,309 @@ class BaseTimeContentsTable(BaseContentsTable):
         statement = lambda_stmt(lambda: select(cls.start, cls.end, cls.tz_offset).order_by(cls.start))
         return tuple(await session.execute(statement))
 
+    @staticmethod
+    def rows_to_arrays(rows: Sequence[Sequence[Any]], dtypes: Sequence[Any]) -> tuple[np.ndarray, ...]:
+        """Converts rows into one array per column.
+
+        Args:
+            rows: The rows to convert.
+            dtypes: The dtype of each column.
+
+        Returns:
+            The arrays of the columns.
+        """
+        n_rows = len(rows)
+        return tuple(np.fromiter((r[i] for r in rows), dtype, n_rows) for i, dtype in enumerate(dtypes))
+
+    @staticmethod
+    def find_segments(
+        starts: np.ndarray,
+        ends: np.ndarray,
+        sample_rates: np.ndarray,
+        tolerance: float = 1.0,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Finds the continuous segments of a set of time ranges by comparing each end with the next start.
+
+        A range continues the ranges before it if it starts no later than one sample period after their latest end plus
+        the tolerance. Overlapping ranges are merged.
+
+        Args:
+            starts: The start nanostamps of the ranges.
+            ends: The end nanostamps of the ranges.
+            sample_rates: The sample rates of the ranges.
+            tolerance: The number of sample periods a gap can be beyond one sample period and still be continuous.
+
+        Returns:
+            The start nanostamps, end nanostamps, and sample rates of the segments as arrays ordered by start.
+        """
+        if starts.size == 0:
+            return np.empty(0, np.int64), np.empty(0, np.int64), np.empty(0, np.float64)
+
+        order = np.argsort(starts, kind="stable")
+        starts = np.asarray(starts, dtype=np.int64)[order]
+        ends = np.maximum.accumulate(np.asarray(ends, dtype=np.int64)[order])
+        sample_rates = np.asarray(sample_rates, dtype=np.float64)[order]
+
+        limits = np.ceil(10**9 / sample_rates[:-1] * (1 + tolerance)).astype(np.int64)
+        firsts = np.flatnonzero(np.concatenate(([True], starts[1:] - ends[:-1] > limits)))
+        lasts = np.append(firsts[1:] - 1, starts.size - 1)
+        return starts[firsts], ends[lasts], sample_rates[firsts]
+
+    @classmethod
+    def _create_time_arrays_statement(cls, update_id: int | None = None) -> StatementLambdaElement:
+        statement = lambda_stmt(lambda: select(cls.start, cls.end, cls.sample_rate, cls.update_id).order_by(cls.start))
+        if update_id is not None:
+            statement += lambda s: s.where(cls.update_id > update_id)
+        return statement
+
+    @classmethod
+    def get_time_arrays(
+        cls,
+        session: Session,
+        update_id: int | None = None,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Gets the timing of the entries as arrays ordered by start.
+
+        Args:
+            session: The session to query with.
+            update_id: The update after which to get the entries, or None for all the entries.
+
+        Returns:
+            The start nanostamps, end nanostamps, sample rates, and update ids of the entries.
+        """
+        rows = session.execute(cls._create_time_arrays_statement(update_id)).all()
+        return cls.rows_to_arrays(rows, (np.int64, np.int64, np.float64, np.int64))
+
+    @classmethod
+    def get_segments(cls, session: Session, tolerance: float = 1.0) -> tuple[np.ndarray, np.ndarray]:
+        """Finds the continuous segments of all the entries.
+
+        Args:
+            session: The session to query with.
+            tolerance: The number of sample periods a gap can be beyond one sample period and still be continuous.
+
+        Returns:
+            The start and end nanostamps of the segments.
+        """
+        starts, ends, sample_rates, _ = cls.get_time_arrays(session)
+        return cls.find_segments(starts, ends, sample_rates, tolerance)[:2]
+
+    @singlekwargdispatch(kwarg="session")
+    @classmethod
+    async def get_segments_async(
+        cls,
+        session: async_sessionmaker[AsyncSession] | AsyncSession,
+        tolerance: float = 1.0,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        raise TypeError(f"{type(session)} is not a valid type.")
+
+    @get_segments_async.register(async_sessionmaker)
+    @classmethod
+    async def _get_segments_async(
+        cls,
+        session: async_sessionmaker[AsyncSession],
+        tolerance: float = 1.0,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        async with session() as async_session:
+            return await async_session.run_sync(cls.get_segments, tolerance)
+
+    @get_segments_async.register(AsyncSession)
+    @classmethod
+    async def _get_segments_async(cls, session: AsyncSession, tolerance: float = 1.0) -> tuple[np.ndarray, np.ndarray]:
+        return await session.run_sync(cls.get_segments, tolerance)
+
+    @classmethod
+    def _create_rows_statement(cls) -> StatementLambdaElement:
+        return lambda_stmt(
+            lambda: select(
+                cls.path,
+                cls.axis,
+                cls.shape,
+                cls.tz_offset,
+                cls.start,
+                cls.end,
+                cls.sample_rate,
+                cls.update_id,
+            ).order_by(cls.start, cls.path)
+        )
+
+    @classmethod
+    def get_all_rows(cls, session: Session) -> tuple[Row, ...]:
+        """Gets the columns needed to describe each entry as plain rows without creating ORM objects.
+
+        The rows are ordered by (start, path), so the children of every node are encountered in time order.
+
+        Args:
+            session: The session to query with.
+
+        Returns:
+            The rows of (path, axis, shape, tz_offset, start, end, sample_rate, update_id).
+        """
+        return tuple(session.execute(cls._create_rows_statement()))
+
+    @singlekwargdispatch(kwarg="session")
+    @classmethod
+    async def get_all_rows_async(cls, session: async_sessionmaker[AsyncSession] | AsyncSession) -> tuple[Row, ...]:
+        raise TypeError(f"{type(session)} is not a valid type.")
+
+    @get_all_rows_async.register(async_sessionmaker)
+    @classmethod
+    async def _get_all_rows_async(cls, session: async_sessionmaker[AsyncSession]) -> tuple[Row, ...]:
+        statement = cls._create_rows_statement()
+        async with session() as async_session:
+            return tuple(await async_session.execute(statement))
+
+    @get_all_rows_async.register(AsyncSession)
+    @classmethod
+    async def _get_all_rows_async(cls, session: AsyncSession) -> tuple[Row, ...]:
+        return tuple(await session.execute(cls._create_rows_statement()))
+
+    @classmethod
+    def _create_rows_from_update_statement(cls, update_id: int, inclusive: bool = True) -> StatementLambdaElement:
+        statement = cls._create_rows_statement()
+        if inclusive:
+            statement += lambda s: s.where(cls.update_id >= update_id)
+        else:
+            statement += lambda s: s.where(cls.update_id > update_id)
+        return statement
+
+    @classmethod
+    def get_rows_from_update(cls, session: Session, update_id: int, inclusive: bool = True) -> tuple[Row, ...]:
+        """Gets the rows of the entries changed from an update as plain rows ordered by (start, path).
+
+        Args:
+            session: The session to query with.
+            update_id: The update to get the entries from.
+            inclusive: Determines if the entries of the given update will be included.
+
+        Returns:
+            The rows of (path, axis, shape, tz_offset, start, end, sample_rate, update_id).
+        """
+        return tuple(session.execute(cls._create_rows_from_update_statement(update_id, inclusive)))
+
+    @singlekwargdispatch(kwarg="session")
+    @classmethod
+    async def get_rows_from_update_async(
+        cls,
+        session: async_sessionmaker[AsyncSession] | AsyncSession,
+        update_id: int,
+        inclusive: bool = True,
+    ) -> tuple[Row, ...]:
+        raise TypeError(f"{type(session)} is not a valid type.")
+
+    @get_rows_from_update_async.register(async_sessionmaker)
+    @classmethod
+    async def _get_rows_from_update_async(
+        cls,
+        session: async_sessionmaker[AsyncSession],
+        update_id: int,
+        inclusive: bool = True,
+    ) -> tuple[Row, ...]:
+        statement = cls._create_rows_from_update_statement(update_id, inclusive)
+        async with session() as async_session:
+            return tuple(await async_session.execute(statement))
+
+    @get_rows_from_update_async.register(AsyncSession)
+    @classmethod
+    async def _get_rows_from_update_async(
+        cls,
+        session: AsyncSession,
+        update_id: int,
+        inclusive: bool = True,
+    ) -> tuple[Row, ...]:
+        return tuple(await session.execute(cls._create_rows_from_update_statement(update_id, inclusive)))
+
+    @classmethod
+    def get_id_rows(cls, session: Session) -> tuple[Row, ...]:
+        """Gets the id and the columns needed to describe each entry as plain rows ordered by (start, path).
+
+        Args:
+            session: The session to query with.
+
+        Returns:
+            The rows of (id, path, axis, shape, tz_offset, start, end, sample_rate, update_id).
+        """
+        statement = select(
+            cls.id,
+            cls.path,
+            cls.axis,
+            cls.shape,
+            cls.tz_offset,
+            cls.start,
+            cls.end,
+            cls.sample_rate,
+            cls.update_id,
+        ).order_by(cls.start, cls.path)
+        return tuple(session.execute(statement))
+
+    @classmethod
+    def _replace_entries(cls, session: Session, ids: Iterable[uuid.UUID], entries: Iterable[dict[str, Any]]) -> None:
+        ids = list(ids)
+        for i in range(0, len(ids), 500):
+            session.execute(delete(cls).where(cls.id.in_(ids[i:i + 500])))
+        session.add_all(cls.item_from_entry(entry) for entry in entries)
+
+    @classmethod
+    def replace_entries(
+        cls,
+        session: Session,
+        ids: Iterable[uuid.UUID],
+        entries: Iterable[dict[str, Any]],
+        begin: bool = False,
+    ) -> None:
+        """Deletes entries and inserts new entries, such as when leaves are merged into a new leaf.
+
+        Args:
+            session: The session to replace the entries with.
+            ids: The ids of the entries to delete.
+            entries: The new entries to insert.
+            begin: Determines if this method will begin and commit a transaction.
+        """
+        if begin:
+            with session.begin():
+                cls._replace_entries(session, ids, entries)
+        else:
+            cls._replace_entries(session, ids, entries)
+
+    @singlekwargdispatch(kwarg="session")
+    @classmethod
+    async def replace_entries_async(
+        cls,
+        session: async_sessionmaker[AsyncSession] | AsyncSession,
+        ids: Iterable[uuid.UUID],
+        entries: Iterable[dict[str, Any]],
+        begin: bool = False,
+    ) -> None:
+        raise TypeError(f"{type(session)} is not a valid type.")
+
+    @replace_entries_async.register(async_sessionmaker)
+    @classmethod
+    async def _replace_entries_async(
+        cls,
+        session: async_sessionmaker[AsyncSession],
+        ids: Iterable[uuid.UUID],
+        entries: Iterable[dict[str, Any]],
+        begin: bool = False,
+    ) -> None:
+        async with session() as async_session:
+            async with async_session.begin():
+                await async_session.run_sync(cls._replace_entries, ids, entries)
+
+    @replace_entries_async.register(AsyncSession)
+    @classmethod
+    async def _replace_entries_async(
+        cls,
+        session: AsyncSession,
+        ids: Iterable[uuid.UUID],
+        entries: Iterable[dict[str, Any]],
+        begin: bool = False,
+    ) -> None:
+        if begin:
+            async with session.begin():
+                await session.run_sync(cls._replace_entries, ids, entries)
+        else:
+            await session.run_sync(cls._replace_entries, ids, entries)
+
     # Instance Methods #
     def update(self, dict_: dict[str, Any] | None = None, /, **kwargs) -> None:
         dict_ = ({} if dict_ is None else dict_) | kwargs
@@ -0,0 +1,224 @@
+"""basetimesegmentstable.py
+A table which stores the continuous segments of the time contents.
+"""
+# Package Header #
+from ....header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Standard Libraries #
+import datetime
+
+# Third-Party Packages #
+from baseobjects import singlekwargdispatch
+import numpy as np
+from sqlalchemy import delete, func, insert, lambda_stmt, select
+from sqlalchemy.sql import StatementLambdaElement
+from sqlalchemy.orm import Mapped, Session, mapped_column
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.types import BigInteger
+
+# Local Packages #
+from .basetable import BaseTable
+from .basetimecontentstable import BaseTimeContentsTable
+
+
+# Definitions #
+# Classes #
+class BaseTimeSegmentsTable(BaseTable):
+    """A table which stores the continuous segments of the time contents.
+
+    Each row is a run of contents entries without a gap between them, from the start of its first entry to the end of
+    its last entry. The update_id of the rows is the latest update of the contents the segments include, so the table
+    can be updated with only the entries added since.
+    """
+    __tablename__ = "segments"
+    __mapper_args__ = {"polymorphic_identity": "segments"}
+    start = mapped_column(BigInteger, index=True)
+    end = mapped_column(BigInteger)
+    sample_rate: Mapped[float]
+
+    # Class Methods #
+    @classmethod
+    def get_segment_arrays(cls, session: Session) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Gets the stored segments ordered by start.
+
+        Args:
+            session: The session to query with.
+
+        Returns:
+            The start nanostamps, end nanostamps, and sample rates of the segments.
+        """
+        rows = session.execute(lambda_stmt(lambda: select(cls.start, cls.end, cls.sample_rate).order_by(cls.start)))
+        return BaseTimeContentsTable.rows_to_arrays(rows.all(), (np.int64, np.int64, np.float64))
+
+    @classmethod
+    def _create_segments_statement(
+        cls,
+        min_duration: datetime.timedelta | float | None = None,
+    ) -> StatementLambdaElement:
+        statement = lambda_stmt(lambda: select(cls.start, cls.end).order_by(cls.start))
+        if min_duration is not None:
+            seconds = min_duration.total_seconds() if isinstance(min_duration, datetime.timedelta) else min_duration
+            min_nanoseconds = int(round(seconds * 10**9))
+            statement += lambda s: s.where(cls.end - cls.start >= min_nanoseconds)
+        return statement
+
+    @classmethod
+    def get_segments(
+        cls,
+        session: Session,
+        min_duration: datetime.timedelta | float | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Gets the stored segments which are at least a duration long.
+
+        Args:
+            session: The session to query with.
+            min_duration: The minimum time from the start to the end of the segments to get as a timedelta or seconds.
+
+        Returns:
+            The start and end nanostamps of the segments.
+        """
+        if not cls.has_table(session):
+            return np.empty(0, np.int64), np.empty(0, np.int64)
+        rows = session.execute(cls._create_segments_statement(min_duration)).all()
+        return BaseTimeContentsTable.rows_to_arrays(rows, (np.int64, np.int64))
+
+    @singlekwargdispatch(kwarg="session")
+    @classmethod
+    async def get_segments_async(
+        cls,
+        session: async_sessionmaker[AsyncSession] | AsyncSession,
+        min_duration: datetime.timedelta | float | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        raise TypeError(f"{type(session)} is not a valid type.")
+
+    @get_segments_async.register(async_sessionmaker)
+    @classmethod
+    async def _get_segments_async(
+        cls,
+        session: async_sessionmaker[AsyncSession],
+        min_duration: datetime.timedelta | float | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        async with session() as async_session:
+            return await async_session.run_sync(cls.get_segments, min_duration)
+
+    @get_segments_async.register(AsyncSession)
+    @classmethod
+    async def _get_segments_async(
+        cls,
+        session: AsyncSession,
+        min_duration: datetime.timedelta | float | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        return await session.run_sync(cls.get_segments, min_duration)
+
+    @classmethod
+    def _update_segments(
+        cls,
+        session: Session,
+        contents: type[BaseTimeContentsTable],
+        tolerance: float = 1.0,
+        rebuild: bool = False,
+    ) -> bool:
+        cls.require_table(session)
+        latest_update = None if rebuild else session.execute(select(func.max(cls.update_id))).scalar()
+        starts, ends, sample_rates, update_ids = contents.get_time_arrays(session, update_id=latest_update)
+        if latest_update is not None:
+            if starts.size == 0:
+                return False
+            segment_starts, segment_ends, segment_rates = cls.get_segment_arrays(session)
+            starts = np.concatenate((segment_starts, starts))
+            ends = np.concatenate((segment_ends, ends))
+            sample_rates = np.concatenate((segment_rates, sample_rates))
+
+        update_id = max(int(update_ids.max(initial=0)), latest_update or 0)
+        starts, ends, sample_rates = contents.find_segments(starts, ends, sample_rates, tolerance)
+        session.execute(delete(cls))
+        if starts.size:
+            session.execute(
+                insert(cls),
+                [
+                    {"start": int(s), "end": int(e), "sample_rate": float(r), "update_id": update_id}
+                    for s, e, r in zip(starts, ends, sample_rates)
+                ],
+            )
+        return True
+
+    @classmethod
+    def update_segments(
+        cls,
+        session: Session,
+        contents: type[BaseTimeContentsTable],
+        tolerance: float = 1.0,
+        rebuild: bool = False,
+        begin: bool = False,
+    ) -> bool:
+        """Merges the contents entries added since the last update into the stored segments.
+
+        Only the entries with a newer update_id than the stored segments are read, so the cost of an update depends on
+        the number of segments and new entries rather than all the entries. Entries which were changed or removed are
+        only accounted for by rebuilding, and the tolerance should be the same for every update.
+
+        Args:
+            session: The session to update the segments with.
+            contents: The contents table to get the entries from.
+            tolerance: The number of sample periods a gap can be beyond one sample period and still be continuous.
+            rebuild: Determines if the segments will be rebuilt from all the entries.
+            begin: Determines if this method will begin and commit a transaction.
+
+        Returns:
+            If the segments were changed.
+        """
+        if begin:
+            with session.begin():
+                return cls._update_segments(session, contents, tolerance, rebuild)
+        else:
+            return cls._update_segments(session, contents, tolerance, rebuild)
+
+    @singlekwargdispatch(kwarg="session")
+    @classmethod
+    async def update_segments_async(
+        cls,
+        session: async_sessionmaker[AsyncSession] | AsyncSession,
+        contents: type[BaseTimeContentsTable],
+        tolerance: float = 1.0,
+        rebuild: bool = False,
+        begin: bool = False,
+    ) -> bool:
+        raise TypeError(f"{type(session)} is not a valid type.")
+
+    @update_segments_async.register(async_sessionmaker)
+    @classmethod
+    async def _update_segments_async(
+        cls,
+        session: async_sessionmaker[AsyncSession],
+        contents: type[BaseTimeContentsTable],
+        tolerance: float = 1.0,
+        rebuild: bool = False,
+        begin: bool = False,
+    ) -> bool:
+        async with session() as async_session:
+            async with async_session.begin():
+                return await async_session.run_sync(cls._update_segments, contents, tolerance, rebuild)
+
+    @update_segments_async.register(AsyncSession)
+    @classmethod
+    async def _update_segments_async(
+        cls,
+        session: AsyncSession,
+        contents: type[BaseTimeContentsTable],
+        tolerance: float = 1.0,
+        rebuild: bool = False,
+        begin: bool = False,
+    ) -> bool:
+        if begin:
+            async with session.begin():
+                return await session.run_sync(cls._update_segments, contents, tolerance, rebuild)
+        else:
+            return await session.run_sync(cls._update_segments, contents, tolerance, rebuild)
@@ -14,4 +14,19 @@ __email__ = __email__
 # Imports #
 # Local Packages #
 from .contentsfile import ContentsFileAsyncSchema, ContentsTable, ContentsFile
-from .timecontentsfile import TimeContentsFileAsyncSchema, TimeContentsTable, TimeContentsFile
+from .timecontentsfile import (
+    TimeContentsFileAsyncSchema,
+    TimeContentsTable,
+    TimeSegmentsTable,
+    TimeStatisticsTable,
+    TimeFileStatsTable,
+    TimeContentsFile,
+)
+from .clusteredtimecontentsfile import (
+    ClusteredTimeContentsFileAsyncSchema,
+    ClusteredTimeContentsTable,
+    ClusteredTimeSegmentsTable,
+    ClusteredTimeStatisticsTable,
+    ClusteredTimeFileStatsTable,
+    ClusteredTimeContentsFile,
+)
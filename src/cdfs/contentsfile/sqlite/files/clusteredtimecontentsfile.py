@@ -0,0 +1,135 @@
+"""clusteredtimecontentsfile.py
+A time contents file which stores its contents clustered by time.
+"""
+# Package Header #
+from ....header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Standard Libraries #
+
+# Third-Party Packages #
+from sqlalchemy.orm import DeclarativeBase, Session
+from sqlalchemy.ext.asyncio import AsyncAttrs, AsyncSession, async_sessionmaker
+
+# Local Packages #
+from ..bases import (
+    BaseMetaInformationTable,
+    BaseClusteredTimeContentsTable,
+    BaseTimeSegmentsTable,
+    BaseStatisticsTable,
+    BaseFileStatsTable,
+)
+from .timecontentsfile import TimeContentsFile
+
+
+# Definitions #
+# Classes #
+class ClusteredTimeContentsFileAsyncSchema(AsyncAttrs, DeclarativeBase):
+    pass
+
+
+class ClusteredTimeMetaInformationTable(BaseMetaInformationTable, ClusteredTimeContentsFileAsyncSchema):
+    pass
+
+
+class ClusteredTimeContentsTable(BaseClusteredTimeContentsTable, ClusteredTimeContentsFileAsyncSchema):
+    pass
+
+
+class ClusteredTimeSegmentsTable(BaseTimeSegmentsTable, ClusteredTimeContentsFileAsyncSchema):
+    pass
+
+
+class ClusteredTimeStatisticsTable(BaseStatisticsTable, ClusteredTimeContentsFileAsyncSchema):
+    pass
+
+
+class ClusteredTimeFileStatsTable(BaseFileStatsTable, ClusteredTimeContentsFileAsyncSchema):
+    pass
+
+
+class ClusteredTimeContentsFile(TimeContentsFile):
+    """A time contents file whose contents table is clustered by (start, id).
+
+    The contents table is a WITHOUT ROWID table ordered by start, so time ordered scans and appends touch contiguous
+    pages. Files made with the unclustered layout can be opened and rebuilt in place with migrate_contents.
+
+    Class Attributes:
+        schema: The declarative base of the tables of this file.
+        meta_information_table: The table which stores the meta information.
+        contents: The clustered table which stores the contents entries.
+        segments: The table which stores the continuous segments of the contents.
+        statistics: The table which stores the summary statistics of the contents entries.
+        file_stats: The table which stores the stat results of the files of the contents entries.
+    """
+    schema: type[DeclarativeBase] = ClusteredTimeContentsFileAsyncSchema
+    meta_information_table: type[BaseMetaInformationTable] = ClusteredTimeMetaInformationTable
+    contents: type[BaseClusteredTimeContentsTable] = ClusteredTimeContentsTable
+    segments: type[BaseTimeSegmentsTable] = ClusteredTimeSegmentsTable
+    statistics: type[BaseStatisticsTable] = ClusteredTimeStatisticsTable
+    file_stats: type[BaseFileStatsTable] = ClusteredTimeFileStatsTable
+
+    # Instance Methods #
+    # Contents
+    def is_clustered(self, session: Session | None = None) -> bool:
+        """Checks if the contents table in the file has the clustered layout.
+
+        Args:
+            session: The session to check with.
+
+        Returns:
+            If the contents table in the file is clustered by time.
+        """
+        if session is not None:
+            return self.contents.is_clustered(session=session)
+        elif self.is_open:
+            with self.create_session() as session:
+                return self.contents.is_clustered(session=session)
+        else:
+            raise IOError("File not open")
+
+    def migrate_contents(self, session: Session | None = None, begin: bool = False) -> bool:
+        """Rebuilds the contents table of an existing file with the clustered layout.
+
+        Args:
+            session: The session to migrate with.
+            begin: Determines if a transaction will be begun and committed when a session is given.
+
+        Returns:
+            If the contents table was changed.
+        """
+        if session is not None:
+            return self.contents.migrate_table(session=session, begin=begin)
+        elif self.is_open:
+            with self.create_session() as session:
+                return self.contents.migrate_table(session=session, begin=True)
+        else:
+            raise IOError("File not open")
+
+    async def migrate_contents_async(
+        self,
+        session: async_sessionmaker[AsyncSession] | AsyncSession | None = None,
+        begin: bool = False,
+    ) -> bool:
+        """Asynchronously rebuilds the contents table of an existing file with the clustered layout.
+
+        Args:
+            session: The session to migrate with.
+            begin: Determines if a transaction will be begun and committed when a session is given.
+
+        Returns:
+            If the contents table was changed.
+        """
+        if session is not None:
+            return await self.contents.migrate_table_async(session=session, begin=begin)
+        elif self.is_open:
+            return await self.contents.migrate_table_async(session=self.async_session_maker, begin=True)
+        else:
+            raise IOError("File not open")
@@ -13,6 +13,7 @@ __email__ = __email__
 
 # Imports #
 # Standard Libraries #
+from collections.abc import Callable, Iterable
 import pathlib
 from typing import Optional, Any
 
@@ -299,26 +300,36 @@ class ContentsFile(CachingObject):
     def correct_contents(
         self,
         path: pathlib.Path,
+        reader: Callable[[pathlib.Path], dict[str, Any] | None],
+        pattern: str = "*",
+        exclude: Iterable[str] = (),
+        workers: int | None = None,
         session: Session | None = None,
         begin: bool = False,
-    ) -> None:
+    ) -> dict[str, list[str]]:
+        kwargs = {"path": path, "reader": reader, "pattern": pattern, "exclude": exclude, "workers": workers}
         if session is not None:
-            self.contents.correct_contents(session=session, path=path, begin=begin)
+            return self.contents.correct_contents(session=session, begin=begin, **kwargs)
         elif self.is_open:
             with self.create_session() as session:
-                self.contents.correct_contents(session=session, path=path, begin=True)
+                return self.contents.correct_contents(session=session, begin=True, **kwargs)
         else:
             raise IOError("File not open")
 
     async def correct_contents_async(
         self,
         path: pathlib.Path,
+        reader: Callable[[pathlib.Path], dict[str, Any] | None],
+        pattern: str = "*",
+        exclude: Iterable[str] = (),
+        workers: int | None = None,
         session: async_sessionmaker[AsyncSession] | AsyncSession | None = None,
         begin: bool = False,
-    ) -> None:
+    ) -> dict[str, list[str]]:
+        kwargs = {"path": path, "reader": reader, "pattern": pattern, "exclude": exclude, "workers": workers}
         if session is not None:
-            await self.contents.correct_contents_async(session=session, path=path, begin=begin)
+            return await self.contents.correct_contents_async(session=session, begin=begin, **kwargs)
         elif self.is_open:
-            await self.contents.correct_contents_async(session=self.async_session_maker, path=path, begin=True)
+            return await self.contents.correct_contents_async(session=self.async_session_maker, begin=True, **kwargs)
         else:
             raise IOError("File not open")
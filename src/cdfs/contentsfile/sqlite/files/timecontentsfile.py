@@ -13,16 +13,28 @@ __email__ = __email__
 
 # Imports #
 # Standard Libraries #
+import asyncio
+from collections.abc import Callable, Iterable, Mapping
+import datetime
 import pathlib
 from typing import Any
+import uuid
 
 # Third-Party Packages #
-from dspobjects.time import Timestamp
+from dspobjects.time import Timestamp, nanostamp
+import numpy as np
+from sqlalchemy import Row
 from sqlalchemy.orm import DeclarativeBase, Session
 from sqlalchemy.ext.asyncio import AsyncAttrs, AsyncSession, async_sessionmaker
 
 # Local Packages #
-from ..bases import BaseMetaInformationTable, BaseTimeContentsTable
+from ..bases import (
+    BaseMetaInformationTable,
+    BaseTimeContentsTable,
+    BaseTimeSegmentsTable,
+    BaseStatisticsTable,
+    BaseFileStatsTable,
+)
 from .contentsfile import ContentsFile
 
 
@@ -40,6 +52,18 @@ class TimeContentsTable(BaseTimeContentsTable, TimeContentsFileAsyncSchema):
     pass
 
 
+class TimeSegmentsTable(BaseTimeSegmentsTable, TimeContentsFileAsyncSchema):
+    pass
+
+
+class TimeStatisticsTable(BaseStatisticsTable, TimeContentsFileAsyncSchema):
+    pass
+
+
+class TimeFileStatsTable(BaseFileStatsTable, TimeContentsFileAsyncSchema):
+    pass
+
+
 class TimeContentsFile(ContentsFile):
     """
 
@@ -53,6 +77,9 @@ class TimeContentsFile(ContentsFile):
     schema: type[DeclarativeBase] = TimeContentsFileAsyncSchema
     meta_information_table: type[BaseMetaInformationTable] = TimeMetaInformationTable
     contents: type[BaseTimeContentsTable] = TimeContentsTable
+    segments: type[BaseTimeSegmentsTable] = TimeSegmentsTable
+    statistics: type[BaseStatisticsTable] = TimeStatisticsTable
+    file_stats: type[BaseFileStatsTable] = TimeFileStatsTable
 
     # Magic Methods #
     # Construction/Destruction
@@ -115,3 +142,524 @@ class TimeContentsFile(ContentsFile):
             return await self.contents.get_all_nanostamps_async(session=self.async_session_maker)
         else:
             raise IOError("File not open")
+
+    def get_contents_rows(self, session: Session | None = None) -> tuple[Row, ...]:
+        if session is not None:
+            return self.contents.get_all_rows(session=session)
+        elif self.is_open:
+            with self.create_session() as session:
+                return self.contents.get_all_rows(session=session)
+        else:
+            raise IOError("File not open")
+
+    async def get_contents_rows_async(
+        self,
+        session: async_sessionmaker[AsyncSession] | AsyncSession | None = None,
+    ) -> tuple[Row, ...]:
+        if session is not None:
+            return await self.contents.get_all_rows_async(session=session)
+        elif self.is_open:
+            return await self.contents.get_all_rows_async(session=self.async_session_maker)
+        else:
+            raise IOError("File not open")
+
+    def get_contents_rows_from_update(
+        self,
+        update_id: int,
+        inclusive: bool = True,
+        session: Session | None = None,
+    ) -> tuple[Row, ...]:
+        if session is not None:
+            return self.contents.get_rows_from_update(session=session, update_id=update_id, inclusive=inclusive)
+        elif self.is_open:
+            with self.create_session() as session:
+                return self.contents.get_rows_from_update(session=session, update_id=update_id, inclusive=inclusive)
+        else:
+            raise IOError("File not open")
+
+    async def get_contents_rows_from_update_async(
+        self,
+        update_id: int,
+        inclusive: bool = True,
+        session: async_sessionmaker[AsyncSession] | AsyncSession | None = None,
+    ) -> tuple[Row, ...]:
+        if session is not None:
+            return await self.contents.get_rows_from_update_async(
+                session=session,
+                update_id=update_id,
+                inclusive=inclusive,
+            )
+        elif self.is_open:
+            return await self.contents.get_rows_from_update_async(
+                session=self.async_session_maker,
+                update_id=update_id,
+                inclusive=inclusive,
+            )
+        else:
+            raise IOError("File not open")
+
+    def correct_contents(
+        self,
+        path: pathlib.Path,
+        reader: Callable[[pathlib.Path], dict[str, Any] | None],
+        pattern: str = "*",
+        exclude: Iterable[str] = (),
+        workers: int | None = None,
+        incremental: bool = False,
+        session: Session | None = None,
+        begin: bool = False,
+    ) -> dict[str, list[str]]:
+        """Scans a directory for leaf files and makes the contents match them.
+
+        The size, modification time, and inode of each file which is read are stored, so an incremental scan only reads
+        the files whose stat results changed or which are new and keeps the entries of the other files as they are. The
+        entries of files which could not be read are also kept as they are. The statistics of the updated and removed
+        entries are deleted and the segments are rebuilt if they changed.
+
+        Args:
+            path: The directory to scan.
+            reader: The picklable callable which reads the entry of a file, returning None for files which are not
+                leaves.
+            pattern: The fnmatch pattern of the paths of the files to read relative to the directory.
+            exclude: The prefixes of the names or the fnmatch patterns of the relative paths of the files and
+                directories to skip.
+            workers: The number of processes which read the files, defaults to the number of processors.
+            incremental: Determines if the files whose stat results did not change will be skipped.
+            session: The session to correct the contents with.
+            begin: Determines if a transaction will be begun and committed when a session is given.
+
+        Returns:
+            The relative paths of the added, updated, removed, and unreadable files.
+        """
+        if session is not None:
+            if begin:
+                with session.begin():
+                    return self._correct_contents(session, path, reader, pattern, exclude, workers, incremental)
+            else:
+                return self._correct_contents(session, path, reader, pattern, exclude, workers, incremental)
+        elif self.is_open:
+            with self.create_session() as session:
+                with session.begin():
+                    return self._correct_contents(session, path, reader, pattern, exclude, workers, incremental)
+        else:
+            raise IOError("File not open")
+
+    async def correct_contents_async(
+        self,
+        path: pathlib.Path,
+        reader: Callable[[pathlib.Path], dict[str, Any] | None],
+        pattern: str = "*",
+        exclude: Iterable[str] = (),
+        workers: int | None = None,
+        incremental: bool = False,
+        session: async_sessionmaker[AsyncSession] | AsyncSession | None = None,
+        begin: bool = False,
+    ) -> dict[str, list[str]]:
+        args = (path, reader, pattern, exclude, workers, incremental)
+        if session is None:
+            if not self.is_open:
+                raise IOError("File not open")
+            session = self.async_session_maker
+
+        if isinstance(session, async_sessionmaker):
+            async with session() as async_session:
+                async with async_session.begin():
+                    return await self._correct_contents_async(async_session, *args)
+        elif begin:
+            async with session.begin():
+                return await self._correct_contents_async(session, *args)
+        else:
+            return await self._correct_contents_async(session, *args)
+
+    def _correct_contents(
+        self,
+        session: Session,
+        path: pathlib.Path,
+        reader: Callable[[pathlib.Path], dict[str, Any] | None],
+        pattern: str,
+        exclude: Iterable[str],
+        workers: int | None,
+        incremental: bool,
+    ) -> dict[str, list[str]]:
+        files = self.contents.scan_files(path, pattern, exclude)
+        unchanged = self._get_unchanged_files(session, files) if incremental else set()
+        changed_files = [f for f in files if f not in unchanged]
+        entries, unreadable = self.contents.read_entries(path, changed_files, reader, workers)
+        return self._reconcile_contents(session, files, unchanged, entries, unreadable)
+
+    async def _correct_contents_async(
+        self,
+        session: AsyncSession,
+        path: pathlib.Path,
+        reader: Callable[[pathlib.Path], dict[str, Any] | None],
+        pattern: str,
+        exclude: Iterable[str],
+        workers: int | None,
+        incremental: bool,
+    ) -> dict[str, list[str]]:
+        loop = asyncio.get_running_loop()
+        files = await loop.run_in_executor(None, self.contents.scan_files, path, pattern, exclude)
+        unchanged = await session.run_sync(self._get_unchanged_files, files) if incremental else set()
+        changed_files = [f for f in files if f not in unchanged]
+        entries, unreadable = await loop.run_in_executor(
+            None,
+            self.contents.read_entries,
+            path,
+            changed_files,
+            reader,
+            workers,
+        )
+        return await session.run_sync(self._reconcile_contents, files, unchanged, entries, unreadable)
+
+    def _get_unchanged_files(self, session: Session, files: dict[str, tuple[int, int, int]]) -> set[str]:
+        known = self.file_stats.get_file_stats(session=session, contents=self.contents)
+        return {f for f, stat in files.items() if known.get(f, None) == stat}
+
+    def _reconcile_contents(
+        self,
+        session: Session,
+        files: dict[str, tuple[int, int, int]],
+        unchanged: set[str],
+        entries: dict[str, dict[str, Any]],
+        unreadable: list[str],
+    ) -> dict[str, list[str]]:
+        ids = {row.path: row.id for row in self.contents.get_id_rows(session=session)}
+        changes = self.contents.reconcile_entries(session=session, entries=entries, keep=unchanged | set(unreadable))
+        changed = [ids[p] for p in changes["updated"] + changes["removed"]]
+        self.statistics.delete_statistics(session=session, ids=changed)
+        self.file_stats.delete_file_stats(session=session, ids=changed)
+        if any(changes.values()) and self.segments.has_table(session):
+            self.segments.update_segments(session=session, contents=self.contents, rebuild=True)
+
+        ids = {row.path: row.id for row in self.contents.get_id_rows(session=session)}
+        self.file_stats.set_file_stats(session=session, stats={ids[f]: files[f] for f in entries})
+        return changes | {"unreadable": unreadable}
+
+    def get_contents_id_rows(self, session: Session | None = None) -> tuple[Row, ...]:
+        if session is not None:
+            return self.contents.get_id_rows(session=session)
+        elif self.is_open:
+            with self.create_session() as session:
+                return self.contents.get_id_rows(session=session)
+        else:
+            raise IOError("File not open")
+
+    def replace_contents(
+        self,
+        ids: Iterable[uuid.UUID],
+        entries: Iterable[dict[str, Any]],
+        session: Session | None = None,
+        begin: bool = False,
+    ) -> None:
+        """Deletes contents entries and their statistics and inserts new entries in one transaction.
+
+        Args:
+            ids: The ids of the entries to delete.
+            entries: The new entries to insert.
+            session: The session to replace the entries with.
+            begin: Determines if a transaction will be begun and committed when a session is given.
+        """
+        if session is not None:
+            if begin:
+                with session.begin():
+                    self._replace_contents(ids, entries, session)
+            else:
+                self._replace_contents(ids, entries, session)
+        elif self.is_open:
+            with self.create_session() as session:
+                with session.begin():
+                    self._replace_contents(ids, entries, session)
+        else:
+            raise IOError("File not open")
+
+    def _replace_contents(self, ids: Iterable[uuid.UUID], entries: Iterable[dict[str, Any]], session: Session) -> None:
+        ids = list(ids)
+        self.contents.replace_entries(session=session, ids=ids, entries=entries)
+        self.statistics.delete_statistics(session=session, ids=ids)
+        self.file_stats.delete_file_stats(session=session, ids=ids)
+
+    def find_contents_segments(
+        self,
+        tolerance: float = 1.0,
+        session: Session | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Finds the continuous segments of the contents by comparing each entry's end with the next entry's start.
+
+        Args:
+            tolerance: The number of sample periods a gap can be beyond one sample period and still be continuous.
+            session: The session to query with.
+
+        Returns:
+            The start and end nanostamps of the segments as int64 arrays.
+        """
+        if session is not None:
+            return self.contents.get_segments(session=session, tolerance=tolerance)
+        elif self.is_open:
+            with self.create_session() as session:
+                return self.contents.get_segments(session=session, tolerance=tolerance)
+        else:
+            raise IOError("File not open")
+
+    async def find_contents_segments_async(
+        self,
+        tolerance: float = 1.0,
+        session: async_sessionmaker[AsyncSession] | AsyncSession | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        if session is not None:
+            return await self.contents.get_segments_async(session=session, tolerance=tolerance)
+        elif self.is_open:
+            return await self.contents.get_segments_async(session=self.async_session_maker, tolerance=tolerance)
+        else:
+            raise IOError("File not open")
+
+    def update_segments(
+        self,
+        tolerance: float = 1.0,
+        rebuild: bool = False,
+        session: Session | None = None,
+        begin: bool = False,
+    ) -> bool:
+        """Updates the stored continuous segments with the contents entries added since the last update.
+
+        Args:
+            tolerance: The number of sample periods a gap can be beyond one sample period and still be continuous.
+            rebuild: Determines if the segments will be rebuilt from all the entries.
+            session: The session to update with.
+            begin: Determines if a transaction will be begun and committed when a session is given.
+
+        Returns:
+            If the segments were changed.
+        """
+        if session is not None:
+            return self.segments.update_segments(
+                session=session,
+                contents=self.contents,
+                tolerance=tolerance,
+                rebuild=rebuild,
+                begin=begin,
+            )
+        elif self.is_open:
+            with self.create_session() as session:
+                return self.segments.update_segments(
+                    session=session,
+                    contents=self.contents,
+                    tolerance=tolerance,
+                    rebuild=rebuild,
+                    begin=True,
+                )
+        else:
+            raise IOError("File not open")
+
+    async def update_segments_async(
+        self,
+        tolerance: float = 1.0,
+        rebuild: bool = False,
+        session: async_sessionmaker[AsyncSession] | AsyncSession | None = None,
+        begin: bool = False,
+    ) -> bool:
+        if session is not None:
+            return await self.segments.update_segments_async(
+                session=session,
+                contents=self.contents,
+                tolerance=tolerance,
+                rebuild=rebuild,
+                begin=begin,
+            )
+        elif self.is_open:
+            return await self.segments.update_segments_async(
+                session=self.async_session_maker,
+                contents=self.contents,
+                tolerance=tolerance,
+                rebuild=rebuild,
+                begin=True,
+            )
+        else:
+            raise IOError("File not open")
+
+    def get_segments(
+        self,
+        min_duration: datetime.timedelta | float | None = None,
+        session: Session | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Gets the stored continuous segments which are at least a duration long.
+
+        Args:
+            min_duration: The minimum time from the start to the end of the segments to get as a timedelta or seconds.
+            session: The session to query with.
+
+        Returns:
+            The start and end nanostamps of the segments as int64 arrays.
+        """
+        if session is not None:
+            return self.segments.get_segments(session=session, min_duration=min_duration)
+        elif self.is_open:
+            with self.create_session() as session:
+                return self.segments.get_segments(session=session, min_duration=min_duration)
+        else:
+            raise IOError("File not open")
+
+    async def get_segments_async(
+        self,
+        min_duration: datetime.timedelta | float | None = None,
+        session: async_sessionmaker[AsyncSession] | AsyncSession | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        if session is not None:
+            return await self.segments.get_segments_async(session=session, min_duration=min_duration)
+        elif self.is_open:
+            return await self.segments.get_segments_async(session=self.async_session_maker, min_duration=min_duration)
+        else:
+            raise IOError("File not open")
+
+    def get_entries_without_statistics(self, session: Session | None = None) -> tuple[Row, ...]:
+        """Gets the id and path of the contents entries which have no statistics.
+
+        Args:
+            session: The session to query with.
+
+        Returns:
+            The id and path of each entry without statistics, ordered by start.
+        """
+        if session is not None:
+            return self.statistics.get_entries_without_statistics(session=session, contents=self.contents)
+        elif self.is_open:
+            with self.create_session() as session:
+                return self.statistics.get_entries_without_statistics(session=session, contents=self.contents)
+        else:
+            raise IOError("File not open")
+
+    def get_channel_statistics(self, channel: int, session: Session | None = None) -> tuple[Row, ...]:
+        """Gets the statistics of a channel of every contents entry which has statistics.
+
+        Args:
+            channel: The channel to get the statistics of.
+            session: The session to query with.
+
+        Returns:
+            The path, count, minimum, and maximum of the channel of each entry.
+        """
+        if session is not None:
+            return self.statistics.get_channel_statistics(session=session, contents=self.contents, channel=channel)
+        elif self.is_open:
+            with self.create_session() as session:
+                return self.statistics.get_channel_statistics(
+                    session=session,
+                    contents=self.contents,
+                    channel=channel,
+                )
+        else:
+            raise IOError("File not open")
+
+    def set_statistics(
+        self,
+        statistics: Mapping[uuid.UUID, dict[str, np.ndarray]],
+        session: Session | None = None,
+        begin: bool = False,
+    ) -> None:
+        """Replaces the statistics of contents entries in one transaction.
+
+        Args:
+            statistics: The count, minimum, maximum, total, and total_squares of each channel by contents entry id.
+            session: The session to set the statistics with.
+            begin: Determines if a transaction will be begun and committed when a session is given.
+        """
+        if session is not None:
+            self.statistics.set_statistics(session=session, statistics=statistics, begin=begin)
+        elif self.is_open:
+            with self.create_session() as session:
+                self.statistics.set_statistics(session=session, statistics=statistics, begin=True)
+        else:
+            raise IOError("File not open")
+
+    async def set_statistics_async(
+        self,
+        statistics: Mapping[uuid.UUID, dict[str, np.ndarray]],
+        session: async_sessionmaker[AsyncSession] | AsyncSession | None = None,
+        begin: bool = False,
+    ) -> None:
+        if session is not None:
+            await self.statistics.set_statistics_async(session=session, statistics=statistics, begin=begin)
+        elif self.is_open:
+            await self.statistics.set_statistics_async(
+                session=self.async_session_maker,
+                statistics=statistics,
+                begin=True,
+            )
+        else:
+            raise IOError("File not open")
+
+    def set_leaf_statistics(
+        self,
+        path: pathlib.Path | str,
+        data: np.ndarray,
+        axis: int = 0,
+        session: Session | None = None,
+        begin: bool = False,
+    ) -> None:
+        """Computes and stores the statistics of the data of a contents entry, such as when the leaf is ingested.
+
+        Args:
+            path: The path of the contents entry.
+            data: The samples of the leaf.
+            axis: The axis the samples are along.
+            session: The session to set the statistics with.
+            begin: Determines if a transaction will be begun and committed when a session is given.
+        """
+        if session is not None:
+            if begin:
+                with session.begin():
+                    self._set_leaf_statistics(path, data, axis, session)
+            else:
+                self._set_leaf_statistics(path, data, axis, session)
+        elif self.is_open:
+            with self.create_session() as session:
+                with session.begin():
+                    self._set_leaf_statistics(path, data, axis, session)
+        else:
+            raise IOError("File not open")
+
+    def _set_leaf_statistics(self, path: pathlib.Path | str, data: np.ndarray, axis: int, session: Session) -> None:
+        contents_id = self.statistics.get_contents_id(session=session, contents=self.contents, path=path)
+        if contents_id is None:
+            raise KeyError(f"{path} is not in the contents")
+        statistics = {contents_id: self.statistics.compute_statistics(data, axis)}
+        self.statistics.set_statistics(session=session, statistics=statistics)
+
+    def get_window_statistics(
+        self,
+        start: datetime.datetime | float | int | np.dtype,
+        stop: datetime.datetime | float | int | np.dtype,
+        reader: Callable[[int, int], np.ndarray],
+        session: Session | None = None,
+    ) -> dict[str, np.ndarray] | None:
+        """Gets the statistics of each channel in a time window, reading raw data only for the entries at its edges.
+
+        The stored statistics of the entries wholly in the window are combined in the database. The entries which are
+        partly in the window or have no statistics are read with the reader and their statistics are computed.
+
+        Args:
+            start: The time of the start of the window, inclusive.
+            stop: The time of the end of the window, exclusive.
+            reader: A callable which reads the samples from a start nanostamp up to a stop nanostamp with the samples
+                along the first axis.
+            session: The session to query with.
+
+        Returns:
+            The count, minimum, maximum, total, total_squares, mean, and rms of each channel, or None if there is no
+            data in the window.
+        """
+        start = int(nanostamp(start))
+        stop = int(nanostamp(stop))
+        if session is not None:
+            totals, edges = self.statistics.get_window_statistics(session, self.contents, start, stop)
+        elif self.is_open:
+            with self.create_session() as session:
+                totals, edges = self.statistics.get_window_statistics(session, self.contents, start, stop)
+        else:
+            raise IOError("File not open")
+
+        parts = [] if totals is None else [totals]
+        for _, entry_start, entry_end in edges:
+            data = reader(max(start, entry_start), min(stop, entry_end + 1))
+            if data.shape[0]:
+                parts.append(self.statistics.compute_statistics(data))
+        return self.statistics.combine_statistics(parts)
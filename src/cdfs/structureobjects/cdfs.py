@@ -14,20 +14,26 @@ __email__ = __email__
 # Imports #
 # Standard Libraries #
 from abc import abstractmethod
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 import datetime
+import os
 import pathlib
+from threading import RLock, Thread
 from typing import Any
 
 # Third-Party Packages #
 from baseobjects import BaseComposite
 from baseobjects.cachingtools import CachingObject, timed_keyless_cache
-from dspobjects.time import Timestamp
+from dspobjects.time import Timestamp, nanostamp
+import h5py
+import numpy as np
 from sqlalchemy.orm import Session
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 # Local Packages #
 from ..contentsfile import TimeContentsFile
-from ..arrays import TimeContentsProxy
+from ..arrays import FileHandlePool, OverviewPyramid, TimeContentsProxy
 
 
 # Definitions #
@@ -47,6 +53,11 @@ class CDFS(CachingObject, BaseComposite):
     default_proxy_type: type[TimeContentsProxy] = TimeContentsProxy
     default_data_file_type: type | None = None
     default_content_file_name: str = "contents.sqlite3"
+    default_leaf_pattern: str = "*"
+    default_handle_limit: int = 256
+    default_background_load: bool = False
+    default_statistics_block_length: int = 2**16
+    virtual_dataset_suffix: str = ".vds.h5"
     contents_file_type: type[TimeContentsFile] = TimeContentsFile
 
     # Magic Methods #
@@ -60,6 +71,8 @@ class CDFS(CachingObject, BaseComposite):
         create: bool = False,
         update: bool = False,
         contents_name: str | None = None,
+        handle_limit: int | None = None,
+        background_load: bool | None = None,
         *,
         init: bool = True,
         **kwargs: Any,
@@ -77,7 +90,12 @@ class CDFS(CachingObject, BaseComposite):
 
         self._start_datetime: Timestamp | None = None
         self._end_datetime: Timestamp | None = None
-        self.data: TimeContentsProxy | None = None
+        self._data: TimeContentsProxy | None = None
+        self._data_kwargs: dict[str, Any] | None = None
+        self._data_lock: RLock = RLock()
+        self._data_thread: Thread | None = None
+        self.background_load: bool = self.default_background_load
+        self.handle_pool: FileHandlePool = FileHandlePool(limit=self.default_handle_limit)
 
         self.components: dict[str, Any] = {}
 
@@ -94,6 +112,8 @@ class CDFS(CachingObject, BaseComposite):
                 create=create,
                 update=update,
                 contents_name=contents_name,
+                handle_limit=handle_limit,
+                background_load=background_load,
                 **kwargs,
             )
 
@@ -121,6 +141,30 @@ class CDFS(CachingObject, BaseComposite):
     def contents_path(self) -> pathlib.Path:
         return self.path / self.contents_file_name
 
+    @property
+    def handle_limit(self) -> int:
+        """The maximum number of leaf files which can be open at once."""
+        return self.handle_pool.limit
+
+    @handle_limit.setter
+    def handle_limit(self, value: int) -> None:
+        self.handle_pool.set_limit(value)
+
+    @property
+    def data(self) -> TimeContentsProxy | None:
+        """The proxy of the data, which is built on first access if its construction was deferred."""
+        return self.get_data()
+
+    @data.setter
+    def data(self, value: TimeContentsProxy | None) -> None:
+        self._data = value
+        self._data_kwargs = None
+
+    @property
+    def is_data_loaded(self) -> bool:
+        """Determines if the proxy of the data has been built."""
+        return self._data is not None
+
     @property
     def meta_information(self) -> dict[str, Any]:
         return self.contents_file.meta_information
@@ -151,6 +195,8 @@ class CDFS(CachingObject, BaseComposite):
         create: bool = False,
         update: bool = False,
         contents_name: str | None = None,
+        handle_limit: int | None = None,
+        background_load: bool | None = None,
         **kwargs: Any,
     ) -> None:
         """Constructs this object.
@@ -164,6 +210,9 @@ class CDFS(CachingObject, BaseComposite):
             update: Determines if this proxy will start_timestamp updating or not.
             open_: Determines if the arrays will remain open after construction.
             load: Determines if the arrays will be constructed.
+            contents_name: The name of the contents file.
+            handle_limit: The maximum number of leaf files which can be open at once.
+            background_load: Determines if the data will be built in a background thread after opening.
             **kwargs: The keyword arguments to create contained arrays.
         """
         if path is not None:
@@ -175,6 +224,12 @@ class CDFS(CachingObject, BaseComposite):
         if contents_name is not None:
             self.contents_file_name = contents_name
 
+        if handle_limit is not None:
+            self.handle_limit = handle_limit
+
+        if background_load is not None:
+            self.background_load = background_load
+
         super().construct(**kwargs)
 
         if open_ or load or create:
@@ -227,15 +282,79 @@ class CDFS(CachingObject, BaseComposite):
         await self.contents_file.create_meta_information_async(session=session, entry=entry, begin=begin, **kwargs)
 
     # Contents
-    def correct_contents(self, session: Session | None = None, path: pathlib.Path | None = None) -> None:
-        self.contents_file.correct_contents(session=session, path=self.path if path is None else path)
+    def get_contents_reader(self) -> Any:
+        """Gets the callable which reads the contents entry of a leaf file.
+
+        Returns:
+            The read_contents_entry method of the leaf type.
+        """
+        leaf_type = self.default_proxy_type.default_leaf_type if self._data is None else self._data.leaf_type
+        return leaf_type.read_contents_entry
+
+    def get_scan_exclude(self) -> tuple[str, ...]:
+        """Gets what a scan of the directory skips, which are the files this CDFS writes that are not leaves.
+
+        Returns:
+            The name of the contents file and the patterns of the overview sidecars and exported virtual datasets.
+        """
+        exclude = [self.contents_file_name, "overviews", f"*{OverviewPyramid.suffix}"]
+        exclude.append(f"*{self.virtual_dataset_suffix}")
+        if self._data is not None and self._data.overviews is not None:
+            overviews_path = self._data.overviews.path.absolute()
+            if overviews_path.is_relative_to(self.path.absolute()):
+                exclude.append(overviews_path.relative_to(self.path.absolute()).as_posix())
+        return tuple(exclude)
+
+    def correct_contents(
+        self,
+        session: Session | None = None,
+        path: pathlib.Path | None = None,
+        pattern: str | None = None,
+        workers: int | None = None,
+        incremental: bool = False,
+    ) -> dict[str, list[str]]:
+        """Scans the directory for leaf files in a process pool and makes the contents match them.
+
+        The contents file, the overview sidecars, and the exported virtual datasets are skipped.
+
+        Args:
+            session: The session to correct the contents with.
+            path: The directory to scan, defaults to the directory of this CDFS.
+            pattern: The fnmatch pattern of the paths of the leaf files relative to the directory, defaults to all.
+            workers: The number of processes which read the files, defaults to the number of processors.
+            incremental: Determines if the files whose size, modification time, and inode did not change will be
+                skipped.
+
+        Returns:
+            The relative paths of the added, updated, removed, and unreadable files.
+        """
+        return self.contents_file.correct_contents(
+            path=self.path if path is None else path,
+            reader=self.get_contents_reader(),
+            pattern=self.default_leaf_pattern if pattern is None else pattern,
+            exclude=self.get_scan_exclude(),
+            workers=workers,
+            incremental=incremental,
+            session=session,
+        )
 
     async def correct_contents_async(
         self,
         session: async_sessionmaker[AsyncSession] | AsyncSession | None = None,
         path: pathlib.Path | None = None,
-    ) -> None:
-        await self.contents_file.correct_contents_async(session=session, path=self.path if path is None else path)
+        pattern: str | None = None,
+        workers: int | None = None,
+        incremental: bool = False,
+    ) -> dict[str, list[str]]:
+        return await self.contents_file.correct_contents_async(
+            path=self.path if path is None else path,
+            reader=self.get_contents_reader(),
+            pattern=self.default_leaf_pattern if pattern is None else pattern,
+            exclude=self.get_scan_exclude(),
+            workers=workers,
+            incremental=incremental,
+            session=session,
+        )
 
     @timed_keyless_cache(call_method="clearing_call", local=True)
     def get_start_datetime(self, session: Session | None = None) -> Timestamp | None:
@@ -272,14 +391,508 @@ class CDFS(CachingObject, BaseComposite):
     ) -> tuple[tuple[int, int, int], ...]:
         return await self.contents_file.get_contents_nanostamps_async(session=session)
 
+    def find_contents_segments(
+        self,
+        tolerance: float = 1.0,
+        session: Session | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        return self.contents_file.find_contents_segments(tolerance=tolerance, session=session)
+
+    async def find_contents_segments_async(
+        self,
+        tolerance: float = 1.0,
+        session: async_sessionmaker[AsyncSession] | AsyncSession | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        return await self.contents_file.find_contents_segments_async(tolerance=tolerance, session=session)
+
+    def update_segments(
+        self,
+        tolerance: float = 1.0,
+        rebuild: bool = False,
+        session: Session | None = None,
+    ) -> bool:
+        return self.contents_file.update_segments(tolerance=tolerance, rebuild=rebuild, session=session)
+
+    async def update_segments_async(
+        self,
+        tolerance: float = 1.0,
+        rebuild: bool = False,
+        session: async_sessionmaker[AsyncSession] | AsyncSession | None = None,
+    ) -> bool:
+        return await self.contents_file.update_segments_async(tolerance=tolerance, rebuild=rebuild, session=session)
+
+    def get_segments(
+        self,
+        min_duration: datetime.timedelta | float | None = None,
+        session: Session | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        return self.contents_file.get_segments(min_duration=min_duration, session=session)
+
+    async def get_segments_async(
+        self,
+        min_duration: datetime.timedelta | float | None = None,
+        session: async_sessionmaker[AsyncSession] | AsyncSession | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        return await self.contents_file.get_segments_async(min_duration=min_duration, session=session)
+
+    def build_statistics(
+        self,
+        workers: int = 4,
+        session: Session | None = None,
+        block_length: int | None = None,
+    ) -> int:
+        """Computes and stores the statistics of the leaves without statistics, reading the leaves concurrently.
+
+        Only the leaves of the entries without statistics are created, and each leaf is read in blocks, so the memory
+        used depends on the block length rather than the size of the leaves.
+
+        Args:
+            workers: The number of threads which read the leaves.
+            session: The session to store the statistics with.
+            block_length: The number of samples read at a time, defaults to the default statistics block length.
+
+        Returns:
+            The number of leaves whose statistics were stored.
+        """
+        entries = self.contents_file.get_entries_without_statistics(session=session)
+        if not entries:
+            return 0
+
+        paths = (self.path / path for _, path in entries)
+        getters = {path: get_leaf for path, _, get_leaf in self.data.get_leaf_entries(paths)}
+        entries = [(i, getters[self.path / path]) for i, path in entries if self.path / path in getters]
+        axis = self.data.axis
+        block_length = self.default_statistics_block_length if block_length is None else block_length
+        compute_statistics = self.contents_file.statistics.compute_statistics
+
+        def compute(get_leaf: Any) -> dict[str, np.ndarray]:
+            leaf = get_leaf()
+            with leaf.use_file():
+                length = leaf.shape[axis]
+                slices = [slice(None)] * len(leaf.shape)
+                totals = None
+                for start in range(0, max(length, 1), block_length):
+                    slices[axis] = slice(start, start + block_length)
+                    part = compute_statistics(leaf.get_slices(slices), axis)
+                    if totals is None:
+                        totals = part
+                    else:
+                        totals["count"] += part["count"]
+                        totals["minimum"] = np.fmin(totals["minimum"], part["minimum"])
+                        totals["maximum"] = np.fmax(totals["maximum"], part["maximum"])
+                        totals["total"] += part["total"]
+                        totals["total_squares"] += part["total_squares"]
+            return totals
+
+        with ThreadPoolExecutor(max_workers=max(workers, 1), thread_name_prefix="cdfs_statistics") as executor:
+            statistics = dict(zip((i for i, _ in entries), executor.map(compute, (g for _, g in entries))))
+
+        if statistics:
+            self.contents_file.set_statistics(statistics=statistics, session=session)
+        return len(statistics)
+
+    def get_window_statistics(
+        self,
+        start: datetime.datetime | float | int | np.dtype,
+        stop: datetime.datetime | float | int | np.dtype,
+        session: Session | None = None,
+    ) -> dict[str, np.ndarray] | None:
+        """Gets the statistics of each channel in a time window, reading raw data only for the leaves at its edges.
+
+        Args:
+            start: The time of the start of the window, inclusive.
+            stop: The time of the end of the window, exclusive.
+            session: The session to query with.
+
+        Returns:
+            The count, minimum, maximum, total, total_squares, mean, and rms of each channel, or None if there is no
+            data in the window.
+        """
+        axis = self.data.axis
+
+        def reader(start_: int, stop_: int) -> np.ndarray:
+            return np.moveaxis(self.data.read_time_range(np.uint64(start_), np.uint64(stop_)), axis, 0)
+
+        return self.contents_file.get_window_statistics(start=start, stop=stop, reader=reader, session=session)
+
+    def find_intervals(
+        self,
+        channel: int,
+        above: float | None = None,
+        below: float | None = None,
+        start: datetime.datetime | float | int | np.dtype | None = None,
+        stop: datetime.datetime | float | int | np.dtype | None = None,
+        workers: int = 4,
+        session: Session | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Finds the intervals where a channel is above and or below thresholds, pruning leaves with their statistics.
+
+        The stored minimum and maximum of each leaf skip the leaves which cannot match, and the leaves whose every
+        sample matches become intervals without being read. Only the other leaves are read, concurrently and only the
+        one channel. The pruning uses only the leaf rows of the proxy and the statistics, so only the leaves which are
+        read are created. Leaves without statistics are always read. Intervals which continue across adjacent leaves
+        are merged.
+
+        Args:
+            channel: The channel to search, the index of the axes other than the sample axis in C order.
+            above: The value the samples must be greater than, None for no lower bound.
+            below: The value the samples must be less than, None for no upper bound.
+            start: The time to search from, inclusive, defaults to the start of the data.
+            stop: The time to search to, exclusive, defaults to the end of the data.
+            workers: The number of threads which read the leaves.
+            session: The session to get the statistics with.
+
+        Returns:
+            The start and end nanostamps of the first and last matching sample of each interval as int64 arrays.
+        """
+        if above is None and below is None:
+            raise ValueError("At least one of above or below must be given.")
+
+        data = self.data
+        axis = data.axis
+        channel_shape = data.shape[:axis] + data.shape[axis + 1:]
+        channel_index = list(np.unravel_index(channel, channel_shape))
+        channel_index.insert(axis, None)
+
+        statistics = {
+            self.path / path: (count, minimum, maximum)
+            for path, count, minimum, maximum in self.contents_file.get_channel_statistics(channel, session=session)
+        }
+        start = 0 if start is None else data.get_nanostamp_index(int(nanostamp(start)))
+        stop = data.length if stop is None else data.get_nanostamp_index(int(nanostamp(stop)))
+
+        def find_runs(node: Any, row: int, inner_start: int, inner_stop: int) -> tuple[np.ndarray, np.ndarray]:
+            table = node.proxies
+            count, minimum, maximum = statistics.get(node.path / table.paths[row], (None, None, None))
+            known = count is not None and minimum is not None and maximum is not None
+            if known and not ((above is None or maximum > above) and (below is None or minimum < below)):
+                return np.empty(0, np.int64), np.empty(0, np.int64)
+
+            every = known and (above is None or minimum > above) and (below is None or maximum < below)
+            if every and count == table.get_leaf_length(row):
+                run_starts = np.array([inner_start])
+                run_stops = np.array([inner_stop])
+            else:
+                leaf = table.get_leaf(row)
+                slices = [slice(inner_start, inner_stop) if i is None else int(i) for i in channel_index]
+                with leaf.use_file():
+                    values = np.asarray(leaf.get_slices(slices), dtype=np.float64)
+                matches = np.ones(values.shape, dtype=bool)
+                if above is not None:
+                    matches &= values > above
+                if below is not None:
+                    matches &= values < below
+                edges = np.flatnonzero(np.diff(np.concatenate(([0], matches.astype(np.int8), [0]))))
+                run_starts = edges[0::2] + inner_start
+                run_stops = edges[1::2] + inner_start
+
+            period = 10**9 / float(table.sample_rates[row])
+            leaf_start = int(table.starts[row])
+            return (
+                leaf_start + np.round(run_starts * period).astype(np.int64),
+                leaf_start + np.round((run_stops - 1) * period).astype(np.int64),
+            )
+
+        leaf_rows = data.find_leaf_rows(start, max(start, stop))
+        with ThreadPoolExecutor(max_workers=max(workers, 1), thread_name_prefix="cdfs_search") as executor:
+            runs = list(executor.map(lambda leaf_row: find_runs(*leaf_row[:4]), leaf_rows))
+
+        if not runs:
+            return np.empty(0, np.int64), np.empty(0, np.int64)
+        starts = np.concatenate([run_starts for run_starts, _ in runs])
+        ends = np.concatenate([run_ends for _, run_ends in runs])
+        sample_rates = np.concatenate(
+            [np.full(len(r), float(node.proxies.sample_rates[row])) for (r, _), (node, row, *_) in zip(runs, leaf_rows)]
+        )
+        starts, ends, _ = self.contents_file.contents.find_segments(starts, ends, sample_rates, tolerance=0.5)
+        return starts, ends
+
+    def export_virtual_dataset(
+        self,
+        path: pathlib.Path | str,
+        name: str = "data",
+        time_name: str = "time",
+        rebuild: bool = False,
+    ) -> int:
+        """Writes an HDF5 file with a virtual dataset which stitches the leaf datasets along the sample axis.
+
+        The virtual dataset maps the datasets of the leaves in the order of the contents without copying their data,
+        and a time dataset holds the nanostamp of each sample. The paths and lengths of the mapped leaves are kept in
+        the file, so exporting to the same file again only writes the nanostamps from the first leaf which was added or
+        changed since. The virtual dataset itself is always remapped, which does not touch the leaf data. The source
+        files are referenced relative to the exported file. The layout is made from the paths and shapes of the contents
+        and the dataset name and dtype of the first leaf, which the leaves of a leaf type share, so only the first leaf
+        and the leaves whose nanostamps are written are opened. A file exported within the directory of this CDFS must
+        end with the virtual dataset suffix, so scans of the directory do not take it for a leaf.
+
+        Args:
+            path: The path of the HDF5 file to export to.
+            name: The name of the virtual dataset.
+            time_name: The name of the time dataset.
+            rebuild: Determines if the time dataset will be rewritten from the first leaf.
+
+        Returns:
+            The number of leaves whose nanostamps were written.
+
+        Raises:
+            ValueError: If the file is within the directory of this CDFS without the virtual dataset suffix or there
+                are no leaves to export.
+        """
+        path = pathlib.Path(path)
+        if path.absolute().is_relative_to(self.path.absolute()) and not path.name.endswith(self.virtual_dataset_suffix):
+            raise ValueError(f"{path} is within the CDFS directory, so it must end with {self.virtual_dataset_suffix}.")
+        axis = self.data.axis
+        entries = self.data.get_leaf_entries()
+        if not entries:
+            raise ValueError("There are no leaves to export.")
+
+        first_leaf = entries[0][2]()
+        with first_leaf.use_file():
+            dataset_name = first_leaf.data.name
+            dtype = first_leaf.data.dtype
+
+        channel_shape = entries[0][1][:axis] + entries[0][1][axis + 1:]
+        for leaf_path, source_shape, _ in entries:
+            if source_shape[:axis] + source_shape[axis + 1:] != channel_shape:
+                raise ValueError(f"{leaf_path} does not match the shape of the first leaf.")
+
+        paths = [str(leaf_path) for leaf_path, _, _ in entries]
+        lengths = np.array([source_shape[axis] for _, source_shape, _ in entries], dtype=np.int64)
+        offsets = np.concatenate(([0], np.cumsum(lengths)))
+        shape = channel_shape[:axis] + (int(offsets[-1]),) + channel_shape[axis:]
+
+        layout = h5py.VirtualLayout(shape=shape, dtype=dtype)
+        index = [slice(None)] * len(shape)
+        for (leaf_path, source_shape, _), start, stop in zip(entries, offsets[:-1], offsets[1:]):
+            index[axis] = slice(int(start), int(stop))
+            source_file = os.path.relpath(pathlib.Path(leaf_path).absolute(), path.parent.absolute())
+            layout[tuple(index)] = h5py.VirtualSource(source_file, dataset_name, shape=source_shape)
+
+        with h5py.File(path, "a") as file:
+            first = 0
+            if not rebuild and time_name in file and "sources" in file:
+                old_paths = [p.decode() if isinstance(p, bytes) else p for p in file["sources/paths"][...]]
+                old_lengths = file["sources/lengths"][...]
+                while first < min(len(old_paths), len(paths)) and (
+                    old_paths[first] == paths[first] and old_lengths[first] == lengths[first]
+                ):
+                    first += 1
+            else:
+                for stale in (time_name, "sources"):
+                    if stale in file:
+                        del file[stale]
+                file.create_dataset(time_name, shape=(0,), maxshape=(None,), dtype=np.uint64, chunks=(2**16,))
+                sources_group = file.create_group("sources")
+                sources_group.create_dataset("paths", shape=(0,), maxshape=(None,), dtype=h5py.string_dtype())
+                sources_group.create_dataset("lengths", shape=(0,), maxshape=(None,), dtype=np.int64)
+
+            time = file[time_name]
+            time.resize((int(offsets[-1]),))
+            for (_, _, get_leaf), start, stop in zip(entries[first:], offsets[first:-1], offsets[first + 1:]):
+                leaf = get_leaf()
+                with leaf.use_file():
+                    time[int(start):int(stop)] = np.asarray(leaf.time_axis.get_nanostamps(), dtype=np.uint64)
+
+            file["sources/paths"].resize((len(paths),))
+            file["sources/paths"][...] = paths
+            file["sources/lengths"].resize((len(paths),))
+            file["sources/lengths"][...] = lengths
+
+            if name in file:
+                del file[name]
+            file.create_virtual_dataset(name, layout)
+            file[name].attrs["axis"] = axis
+
+        return len(paths) - first
+
+    def compact_leaves(
+        self,
+        target_bytes: int = 256 * 2**20,
+        tolerance: float = 1.0,
+        session: Session | None = None,
+    ) -> int:
+        """Merges runs of small contiguous leaves into larger leaf files.
+
+        Leaves are merged when they are in the same directory, have the same axis, channel shape, dtype, time zone, and
+        sample rate, and each starts after the previous one ends with no gap between them, until the merged file would
+        exceed the target size. Leaves which overlap are never merged. The merged files are written with the
+        write_file method of the leaf type. Then the contents entries of the merged leaves are replaced by entries of
+        the new files with new update ids in one transaction, so readers which update their proxies add the new leaves
+        and drop the leaves whose entries were removed. The merged leaf files are deleted after the transaction.
+
+        Args:
+            target_bytes: The maximum number of bytes of data in a merged file.
+            tolerance: The number of sample periods a gap can be beyond one sample period and still be contiguous.
+            session: The session to replace the contents entries with.
+
+        Returns:
+            The number of merged files written.
+
+        Raises:
+            NotImplementedError: If the leaf type cannot write new leaf files.
+        """
+        leaf_type = self.data.leaf_type
+        if not leaf_type.can_write_file():
+            raise NotImplementedError(f"{leaf_type.__name__} cannot write leaf files, so leaves cannot be compacted.")
+
+        rows = self.contents_file.get_contents_id_rows(session=session)
+        getters = {path: get_leaf for path, _, get_leaf in self.data.get_leaf_entries()}
+        update_id = max((row.update_id for row in rows), default=0)
+
+        groups = []
+        group = []
+        group_key = None
+        group_bytes = 0
+        for row in rows:
+            get_leaf = getters.get(self.path / row.path, None)
+            if get_leaf is None:
+                continue
+            leaf = get_leaf()
+            with leaf.use_file():
+                dtype = leaf.data.dtype
+            shape = tuple(int(i) for i in row.shape.split(",") if i.strip())
+            key = (
+                pathlib.PurePosixPath(row.path).parent,
+                row.axis,
+                shape[:row.axis] + shape[row.axis + 1:],
+                dtype,
+                row.tz_offset,
+                row.sample_rate,
+            )
+            nbytes = int(np.prod(shape)) * dtype.itemsize
+            gap = row.start - group[-1][0].end if group else 0
+            contiguous = 0 < gap <= (1 + tolerance) * 10**9 / row.sample_rate
+            if key == group_key and contiguous and group_bytes + nbytes <= target_bytes:
+                group.append((row, get_leaf))
+                group_bytes += nbytes
+            else:
+                if len(group) > 1:
+                    groups.append(group)
+                group = [(row, get_leaf)]
+                group_key = key
+                group_bytes = nbytes
+        if len(group) > 1:
+            groups.append(group)
+
+        ids = []
+        entries = []
+        for group in groups:
+            first = group[0][0]
+            last = group[-1][0]
+            data = []
+            nanostamps = []
+            for _, get_leaf in group:
+                leaf = get_leaf()
+                with leaf.use_file():
+                    data.append(leaf.get_slices())
+                    nanostamps.append(np.asarray(leaf.time_axis.get_nanostamps(), dtype=np.uint64))
+            data = np.concatenate(data, axis=first.axis)
+
+            name = pathlib.PurePosixPath(first.path)
+            path = (name.parent / f"compacted_{first.start}_{last.end}{name.suffix}").as_posix()
+            leaf_type.write_file(
+                path=self.path / path,
+                data=data,
+                nanostamps=np.concatenate(nanostamps),
+                sample_rate=first.sample_rate,
+                axis=first.axis,
+            )
+            update_id += 1
+            ids.extend(row.id for row, _ in group)
+            entries.append(
+                {
+                    "path": path,
+                    "axis": first.axis,
+                    "shape": data.shape,
+                    "timezone": first.tz_offset,
+                    "start": np.uint64(first.start),
+                    "end": np.uint64(last.end),
+                    "sample_rate": first.sample_rate,
+                    "update_id": update_id,
+                }
+            )
+
+        if not groups:
+            return 0
+
+        self.contents_file.replace_contents(ids=ids, entries=entries, session=session, begin=session is not None)
+        self.data.update_proxies()
+        for group in groups:
+            for row, _ in group:
+                (self.path / row.path).unlink(missing_ok=True)
+        return len(groups)
+
     # CDFS Data
     def construct_data(self, swmr: bool = True, **kwargs):
-        self.data = self.default_proxy_type(
-            path=self.path,
-            contents_file=self.contents_file,
-            mode=self._mode,
-            swmr=swmr,
-            **kwargs,
+        with self._data_lock:
+            self.data = self.default_proxy_type(
+                path=self.path,
+                contents_file=self.contents_file,
+                mode=self._mode,
+                swmr=swmr,
+                handle_pool=self.handle_pool,
+                **kwargs,
+            )
+
+    def defer_data(self, background: bool = False, swmr: bool = True, **kwargs: Any) -> None:
+        """Sets the proxy of the data to be built on first access rather than now.
+
+        Args:
+            background: Determines if the proxy will be built in a background thread right away.
+            swmr: Determines if the leaf files will be opened in SWMR mode.
+            **kwargs: The keyword arguments to create the proxy.
+        """
+        with self._data_lock:
+            self._data_kwargs = {"swmr": swmr, **kwargs}
+
+        if background:
+            self._data_thread = Thread(target=self.get_data, name="cdfs_data", daemon=True)
+            self._data_thread.start()
+
+    def get_data(self) -> TimeContentsProxy | None:
+        """Gets the proxy of the data, building it if its construction was deferred.
+
+        If the proxy is being built in a background thread, this waits for it to finish.
+
+        Returns:
+            The proxy of the data or None if it has not been constructed or deferred.
+        """
+        if self._data is None and self._data_kwargs is not None:
+            with self._data_lock:
+                if self._data is None and self._data_kwargs is not None:
+                    self.construct_data(**self._data_kwargs)
+        return self._data
+
+    def join_data_thread(self) -> None:
+        """Waits for the background thread building the proxy of the data to finish, if there is one."""
+        if self._data_thread is not None:
+            self._data_thread.join()
+            self._data_thread = None
+
+    def iter_windows(
+        self,
+        duration: datetime.timedelta | float,
+        step: datetime.timedelta | float | None = None,
+        overlap: datetime.timedelta | float = 0,
+        start: datetime.datetime | float | int | None = None,
+        stop: datetime.datetime | float | int | None = None,
+        fill_value: Any = np.nan,
+        dtype: Any = None,
+        reuse: bool = True,
+        channels: int | slice | Iterable[int] | None = None,
+        channel_axis: int | None = None,
+    ) -> Iterator[tuple[np.uint64, np.ndarray]]:
+        return self.data.iter_windows(
+            duration=duration,
+            step=step,
+            overlap=overlap,
+            start=start,
+            stop=stop,
+            fill_value=fill_value,
+            dtype=dtype,
+            reuse=reuse,
+            channels=channels,
+            channel_axis=channel_axis,
         )
 
     # File
@@ -292,8 +905,18 @@ class CDFS(CachingObject, BaseComposite):
         mode: str | None = None,
         load: bool | None = None,
         create: bool = False,
+        background_load: bool | None = None,
         **kwargs: Any,
     ) -> None:
+        """Opens the contents file and defers building the proxy of the data until it is first accessed.
+
+        Args:
+            mode: The mode to open the CDFS in.
+            load: Determines if the proxy of the data will be built on first access or in the background.
+            create: Determines if the CDFS will be created if it does not exist.
+            background_load: Determines if the proxy will be built in a background thread right after opening.
+            **kwargs: The keyword arguments to open the contents file.
+        """
         if not self._is_open:
             if mode is not None:
                 self._mode = mode
@@ -309,20 +932,26 @@ class CDFS(CachingObject, BaseComposite):
             self._is_open = True
 
             if load:
-                self.construct_data()
+                self.defer_data(background=self.background_load if background_load is None else background_load)
 
     def close(self):
+        self.join_data_thread()
+        self._data_kwargs = None
         if self.contents_file is not None:
             self.contents_file.close()
-        if self.data is not None:
-            self.data.close()
+        if self._data is not None:
+            self._data.close()
+        self.handle_pool.clear()
         self._is_open = False
         return True
 
     async def close_async(self) -> bool:
+        self.join_data_thread()
+        self._data_kwargs = None
         if self.contents_file is not None:
             await self.contents_file.close_async()
-        if self.data is not None:
-            self.data.close()
+        if self._data is not None:
+            self._data.close()
+        self.handle_pool.clear()
         self._is_open = False
         return True
\ No newline at end of file
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+""" test_channelselection.py
+Benchmarks for reading a few channels of wide leaves compared to reading all the channels.
+"""
+# Package Header #
+from src.cdfs.header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Standard Libraries #
+from time import perf_counter
+
+# Third-Party Packages #
+import h5py
+import numpy as np
+import pytest
+
+# Local Packages #
+from ..test_timecontentsproxy import ExampleCDFS, SAMPLE_RATE
+
+
+# Definitions #
+# Constants #
+N_LEAVES = 8
+LEAF_LENGTH = 50_000
+N_CHANNELS = 64
+CHUNKS = (4096, 8)
+N_READS = 3
+
+
+# Functions #
+@pytest.fixture(scope="module")
+def wide_cdfs(tmp_path_factory):
+    """A pytest fixture which creates a CDFS with leaves of many chunked channels."""
+    path = tmp_path_factory.mktemp("channels") / "wide"
+    cdfs = ExampleCDFS(path=path, mode="a", create=True, load=False)
+    cdfs.contents_file.create_meta_information(tz_offset=0)
+    period = 10**9 // SAMPLE_RATE
+    rng = np.random.default_rng(0)
+    with cdfs.contents_file.create_session() as session:
+        for i in range(N_LEAVES):
+            start = 1_700_000_000 * 10**9 + i * LEAF_LENGTH * period
+            times = (start + np.arange(LEAF_LENGTH, dtype=np.int64) * period).astype(np.uint64)
+            (path / "node").mkdir(exist_ok=True)
+            with h5py.File(path / f"node/leaf_{i}.h5", "w") as file:
+                file.create_dataset(
+                    "data",
+                    data=rng.standard_normal((LEAF_LENGTH, N_CHANNELS)).astype(np.float32),
+                    chunks=CHUNKS,
+                    compression="gzip",
+                )
+                file["time"] = times
+                file.attrs["sample_rate"] = SAMPLE_RATE
+            cdfs.contents_file.contents.insert(
+                session=session,
+                as_entry=True,
+                begin=True,
+                update_id=i,
+                path=f"node/leaf_{i}.h5",
+                axis=0,
+                shape=(LEAF_LENGTH, N_CHANNELS),
+                timezone=0,
+                start=times[0],
+                end=times[-1],
+                sample_rate=SAMPLE_RATE,
+            )
+    cdfs.close()
+    return path
+
+
+# Classes #
+class TestChannelSelectionPerformance:
+    @pytest.mark.parametrize("channels", [None, slice(0, 4), [3, 17, 40, 60]], ids=["all", "slice", "scattered"])
+    def test_read_index_range(self, wide_cdfs, channels):
+        cdfs = ExampleCDFS(path=wide_cdfs, mode="r", load=True)
+        cdfs.data.set_read_workers(1)
+        cdfs.data.read_index_range(0, LEAF_LENGTH, channels=channels)
+
+        start = perf_counter()
+        for _ in range(N_READS):
+            data = cdfs.data.read_index_range(channels=channels)
+        elapsed = (perf_counter() - start) / N_READS
+
+        n_samples = N_LEAVES * LEAF_LENGTH
+        print(f"\n{data.shape[1]} channels: {n_samples / elapsed / 10**6:.1f} M samples/s, {elapsed * 1000:.0f} ms")
+        assert data.shape[0] == n_samples
+        cdfs.close()
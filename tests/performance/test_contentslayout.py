@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+""" test_contentslayout.py
+Benchmarks for the row layout of the time contents table.
+"""
+# Package Header #
+from src.cdfs.header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Standard Libraries #
+from time import perf_counter
+
+# Third-Party Packages #
+import numpy as np
+import pytest
+from sqlalchemy import select
+
+# Local Packages #
+from src.cdfs.contentsfile.sqlite import *
+
+
+# Definitions #
+# Constants #
+N_ENTRIES = 20000
+BATCH_SIZE = 500
+N_SCANS = 200
+LEAF_DURATION = 10 * 10**9
+
+
+# Classes #
+class TestContentsLayoutPerformance:
+    layouts = {"rowid": TimeContentsFile, "clustered": ClusteredTimeContentsFile}
+
+    def ingest(self, file):
+        entries = (
+            {
+                "update_id": i,
+                "path": f"leaf_{i}.h5",
+                "axis": 0,
+                "shape": (10240, 64),
+                "timezone": 0,
+                "start": np.uint64(i * LEAF_DURATION),
+                "end": np.uint64((i + 1) * LEAF_DURATION - 1),
+                "sample_rate": 1024,
+            }
+            for i in range(N_ENTRIES)
+        )
+        with file.create_session() as session:
+            batch = []
+            for entry in entries:
+                batch.append(entry)
+                if len(batch) == BATCH_SIZE:
+                    file.contents.insert_all(session=session, items=batch, as_entries=True, begin=True)
+                    batch = []
+            if batch:
+                file.contents.insert_all(session=session, items=batch, as_entries=True, begin=True)
+
+    def range_scan(self, file, rng):
+        table = file.contents
+        n_rows = 0
+        with file.create_session() as session:
+            for start in rng.integers(0, N_ENTRIES - 100, N_SCANS):
+                statement = (
+                    select(table.path, table.start, table.end)
+                    .where(table.start >= int(start * LEAF_DURATION), table.start < int((start + 100) * LEAF_DURATION))
+                    .order_by(table.start)
+                )
+                n_rows += len(session.execute(statement).all())
+        return n_rows
+
+    @pytest.mark.parametrize("layout", ["rowid", "clustered"])
+    def test_ingest_and_range_scan(self, tmp_path, layout):
+        file = self.layouts[layout](path=tmp_path / "contents.sqlite3", open_=True, create=True)
+
+        start = perf_counter()
+        self.ingest(file)
+        ingest_time = perf_counter() - start
+
+        start = perf_counter()
+        n_rows = self.range_scan(file, np.random.default_rng(0))
+        scan_time = perf_counter() - start
+
+        print(f"\n{layout}: ingest {N_ENTRIES / ingest_time:.0f} rows/s, range scan {n_rows / scan_time:.0f} rows/s")
+        assert n_rows == N_SCANS * 100
+        file.close()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+""" test_correctcontents.py
+Benchmarks for full and incremental scans of the leaf files to correct the contents.
+"""
+# Package Header #
+from src.cdfs.header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Standard Libraries #
+from time import perf_counter
+
+# Third-Party Packages #
+import numpy as np
+import pytest
+
+# Local Packages #
+from ..test_timecontentsproxy import ExampleCDFS, ExampleLeaf, SAMPLE_RATE
+
+
+# Definitions #
+# Constants #
+N_LEAVES = 500
+LEAF_LENGTH = 1000
+N_CHANNELS = 8
+
+
+# Functions #
+@pytest.fixture(scope="module")
+def scanned_cdfs(tmp_path_factory):
+    """A pytest fixture which creates a CDFS of many small leaf files and builds its contents with a full scan."""
+    path = tmp_path_factory.mktemp("scan") / "many"
+    cdfs = ExampleCDFS(path=path, mode="a", create=True, load=False)
+    cdfs.contents_file.create_meta_information(tz_offset=0)
+    period = 10**9 // SAMPLE_RATE
+    (path / "node").mkdir()
+    data = np.zeros((LEAF_LENGTH, N_CHANNELS), dtype=np.float32)
+    for i in range(N_LEAVES):
+        start = 1_700_000_000 * 10**9 + i * LEAF_LENGTH * period
+        times = (start + np.arange(LEAF_LENGTH, dtype=np.int64) * period).astype(np.uint64)
+        ExampleLeaf.write_file(path / f"node/leaf_{i:05d}.h5", data, times, SAMPLE_RATE)
+    cdfs.correct_contents()
+    cdfs.close()
+    return path
+
+
+# Classes #
+class TestCorrectContentsPerformance:
+    @pytest.mark.parametrize("incremental", [False, True], ids=["full", "incremental"])
+    def test_correct_contents(self, scanned_cdfs, incremental):
+        cdfs = ExampleCDFS(path=scanned_cdfs, mode="a", load=False)
+
+        start = perf_counter()
+        changes = cdfs.correct_contents(incremental=incremental)
+        elapsed = perf_counter() - start
+
+        print(f"\nincremental={incremental}: {N_LEAVES} files in {elapsed * 1000:.0f} ms")
+        assert not any(changes.values())
+        cdfs.close()
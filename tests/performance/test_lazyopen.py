@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+""" test_lazyopen.py
+Benchmarks for opening a CDFS with many leaves with the proxy of the data built eagerly and lazily.
+"""
+# Package Header #
+from src.cdfs.header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Standard Libraries #
+from time import perf_counter
+
+# Third-Party Packages #
+import h5py
+import numpy as np
+import pytest
+
+# Local Packages #
+from ..test_timecontentsproxy import ExampleCDFS, SAMPLE_RATE
+
+
+# Definitions #
+# Constants #
+N_LEAVES = 2000
+LEAF_LENGTH = 100
+N_CHANNELS = 4
+
+
+# Functions #
+@pytest.fixture(scope="module")
+def many_leaves_cdfs(tmp_path_factory):
+    """A pytest fixture which creates a CDFS with many small leaves."""
+    path = tmp_path_factory.mktemp("lazyopen") / "many"
+    cdfs = ExampleCDFS(path=path, mode="a", create=True, load=False)
+    cdfs.contents_file.create_meta_information(tz_offset=0)
+    period = 10**9 // SAMPLE_RATE
+    (path / "node").mkdir(exist_ok=True)
+    with cdfs.contents_file.create_session() as session:
+        for i in range(N_LEAVES):
+            start = 1_700_000_000 * 10**9 + i * LEAF_LENGTH * period
+            times = (start + np.arange(LEAF_LENGTH, dtype=np.int64) * period).astype(np.uint64)
+            with h5py.File(path / f"node/leaf_{i}.h5", "w") as file:
+                file["data"] = np.zeros((LEAF_LENGTH, N_CHANNELS), dtype=np.float32)
+                file["time"] = times
+                file.attrs["sample_rate"] = SAMPLE_RATE
+            cdfs.contents_file.contents.insert(
+                session=session,
+                as_entry=True,
+                begin=True,
+                update_id=i,
+                path=f"node/leaf_{i}.h5",
+                axis=0,
+                shape=(LEAF_LENGTH, N_CHANNELS),
+                timezone=0,
+                start=times[0],
+                end=times[-1],
+                sample_rate=SAMPLE_RATE,
+            )
+    cdfs.close()
+    return path
+
+
+# Classes #
+class TestLazyOpenPerformance:
+    @pytest.mark.parametrize("eager", [True, False])
+    def test_open(self, many_leaves_cdfs, eager):
+        start = perf_counter()
+        cdfs = ExampleCDFS(path=many_leaves_cdfs, mode="r", load=True)
+        if eager:
+            cdfs.get_data()
+        elapsed = perf_counter() - start
+
+        print(f"\neager={eager}: {elapsed * 10**3:.1f} ms to open")
+        assert cdfs.data.shape[0] == N_LEAVES * LEAF_LENGTH
+        cdfs.close()
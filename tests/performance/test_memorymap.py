@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+""" test_memorymap.py
+Benchmarks for many small random reads of contiguous leaves with and without memory maps.
+"""
+# Package Header #
+from src.cdfs.header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Standard Libraries #
+from time import perf_counter
+
+# Third-Party Packages #
+import h5py
+import numpy as np
+import pytest
+
+# Local Packages #
+from ..test_timecontentsproxy import ExampleCDFS, SAMPLE_RATE
+
+
+# Definitions #
+# Constants #
+N_LEAVES = 8
+LEAF_LENGTH = 100_000
+N_CHANNELS = 16
+READ_LENGTH = 64
+N_READS = 5000
+
+
+# Functions #
+@pytest.fixture(scope="module")
+def contiguous_cdfs(tmp_path_factory):
+    """A pytest fixture which creates a CDFS with leaves of contiguous datasets."""
+    path = tmp_path_factory.mktemp("memorymap") / "contiguous"
+    cdfs = ExampleCDFS(path=path, mode="a", create=True, load=False)
+    cdfs.contents_file.create_meta_information(tz_offset=0)
+    period = 10**9 // SAMPLE_RATE
+    rng = np.random.default_rng(0)
+    with cdfs.contents_file.create_session() as session:
+        for i in range(N_LEAVES):
+            start = 1_700_000_000 * 10**9 + i * LEAF_LENGTH * period
+            times = (start + np.arange(LEAF_LENGTH, dtype=np.int64) * period).astype(np.uint64)
+            (path / "node").mkdir(exist_ok=True)
+            with h5py.File(path / f"node/leaf_{i}.h5", "w") as file:
+                file["data"] = rng.standard_normal((LEAF_LENGTH, N_CHANNELS)).astype(np.float32)
+                file["time"] = times
+                file.attrs["sample_rate"] = SAMPLE_RATE
+            cdfs.contents_file.contents.insert(
+                session=session,
+                as_entry=True,
+                begin=True,
+                update_id=i,
+                path=f"node/leaf_{i}.h5",
+                axis=0,
+                shape=(LEAF_LENGTH, N_CHANNELS),
+                timezone=0,
+                start=times[0],
+                end=times[-1],
+                sample_rate=SAMPLE_RATE,
+            )
+    cdfs.close()
+    return path
+
+
+# Classes #
+class TestMemoryMapPerformance:
+    @pytest.mark.parametrize("memory_map, copy", [(False, True), (True, True), (True, False)])
+    def test_random_reads(self, contiguous_cdfs, memory_map, copy):
+        cdfs = ExampleCDFS(path=contiguous_cdfs, mode="r", load=True)
+        cdfs.data.close()
+        cdfs.construct_data(memory_map=memory_map)
+        cdfs.data.set_read_workers(1)
+        rng = np.random.default_rng(1)
+        starts = rng.integers(0, N_LEAVES * LEAF_LENGTH - READ_LENGTH, N_READS)
+        cdfs.data.read_index_range(0, READ_LENGTH, copy=copy)
+
+        start = perf_counter()
+        for index in starts:
+            data = cdfs.data.read_index_range(int(index), int(index) + READ_LENGTH, copy=copy)
+        elapsed = (perf_counter() - start) / N_READS
+
+        print(f"\nmemory_map={memory_map}, copy={copy}: {elapsed * 10**6:.0f} us per read")
+        assert data.shape == (READ_LENGTH, N_CHANNELS)
+        cdfs.close()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+""" test_parallelread.py
+Benchmarks for reading ranges which span many leaves.
+"""
+# Package Header #
+from src.cdfs.header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Standard Libraries #
+from time import perf_counter
+
+# Third-Party Packages #
+import h5py
+import numpy as np
+import pytest
+
+# Local Packages #
+from ..test_timecontentsproxy import ExampleCDFS, SAMPLE_RATE
+
+
+# Definitions #
+# Constants #
+N_LEAVES = 32
+LEAF_LENGTH = 100_000
+N_CHANNELS = 16
+N_READS = 5
+
+
+# Functions #
+@pytest.fixture(scope="module")
+def large_cdfs(tmp_path_factory):
+    """A pytest fixture which creates a CDFS with many large leaves."""
+    path = tmp_path_factory.mktemp("parallel") / "large"
+    cdfs = ExampleCDFS(path=path, mode="a", create=True, load=False)
+    cdfs.contents_file.create_meta_information(tz_offset=0)
+    period = 10**9 // SAMPLE_RATE
+    rng = np.random.default_rng(0)
+    with cdfs.contents_file.create_session() as session:
+        for i in range(N_LEAVES):
+            start = 1_700_000_000 * 10**9 + i * LEAF_LENGTH * period
+            times = (start + np.arange(LEAF_LENGTH, dtype=np.int64) * period).astype(np.uint64)
+            (path / "node").mkdir(exist_ok=True)
+            with h5py.File(path / f"node/leaf_{i}.h5", "w") as file:
+                file["data"] = rng.standard_normal((LEAF_LENGTH, N_CHANNELS))
+                file["time"] = times
+                file.attrs["sample_rate"] = SAMPLE_RATE
+            cdfs.contents_file.contents.insert(
+                session=session,
+                as_entry=True,
+                begin=True,
+                update_id=i,
+                path=f"node/leaf_{i}.h5",
+                axis=0,
+                shape=(LEAF_LENGTH, N_CHANNELS),
+                timezone=0,
+                start=times[0],
+                end=times[-1],
+                sample_rate=SAMPLE_RATE,
+            )
+    cdfs.close()
+    return path
+
+
+# Classes #
+class TestParallelReadPerformance:
+    @pytest.mark.parametrize("read_workers", [1, 4])
+    def test_read_index_range(self, large_cdfs, read_workers):
+        cdfs = ExampleCDFS(path=large_cdfs, mode="r", load=True)
+        cdfs.data.set_read_workers(read_workers)
+        cdfs.data.read_index_range()
+
+        start = perf_counter()
+        for _ in range(N_READS):
+            data = cdfs.data.read_index_range()
+        elapsed = (perf_counter() - start) / N_READS
+
+        print(f"\n{read_workers} workers: {data.nbytes / elapsed / 10**6:.0f} MB/s")
+        assert data.shape == (N_LEAVES * LEAF_LENGTH, N_CHANNELS)
+        cdfs.close()
+
+    @pytest.mark.parametrize("prefetch", [False, True])
+    def test_sequential_scan(self, large_cdfs, prefetch):
+        cdfs = ExampleCDFS(path=large_cdfs, mode="r", load=True)
+        cdfs.data.set_read_workers(1)
+        if prefetch:
+            cdfs.data.enable_prefetch(depth=2, chunk_length=LEAF_LENGTH // 4)
+        window = LEAF_LENGTH // 4
+        out = np.empty((window, N_CHANNELS))
+
+        start = perf_counter()
+        for index in range(0, N_LEAVES * LEAF_LENGTH, window):
+            cdfs.data.read_index_range(index, index + window, out=out)
+        elapsed = perf_counter() - start
+
+        stats = cdfs.data.prefetcher.get_stats() if prefetch else {}
+        print(f"\nprefetch {prefetch}: {N_LEAVES * LEAF_LENGTH * N_CHANNELS * 8 / elapsed / 10**6:.0f} MB/s {stats}")
+        cdfs.close()
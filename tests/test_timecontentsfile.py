@@ -22,6 +22,7 @@ import pathlib
 from typing import Any
 
 # Third-Party Packages #
+import numpy as np
 import pytest
 from dspobjects.time import nanostamp
 from sqlalchemy import select
@@ -116,5 +117,128 @@ class TestTimeContentsFile(TestContentsFile):
         assert file_path.is_file()
         assert len(ns) == n_entries
 
+    def insert_timed_entries(self, file, ranges, update_id: int = 0):
+        with file.create_session() as session:
+            file.contents.insert_all(
+                session=session,
+                items=[
+                    {
+                        "update_id": update_id,
+                        "path": f"leaf_{start}.h5",
+                        "axis": 0,
+                        "shape": (100, 4),
+                        "timezone": 0,
+                        "start": np.uint64(start * 10**7),
+                        "end": np.uint64(end * 10**7),
+                        "sample_rate": 100,
+                    }
+                    for start, end in ranges
+                ],
+                as_entries=True,
+                begin=True,
+            )
+
+    def test_find_contents_segments(self, tmp_path):
+        db = self.class_(path=tmp_path / "test.db", open_=True, create=True)
+        self.insert_timed_entries(db, [(200, 299), (0, 99), (101, 199), (350, 449), (400, 420)])
+        starts, ends = db.find_contents_segments()
+        assert starts.dtype == ends.dtype == np.int64
+        assert starts.tolist() == [0, 350 * 10**7]
+        assert ends.tolist() == [299 * 10**7, 449 * 10**7]
+
+        starts, _ = db.find_contents_segments(tolerance=0)
+        assert starts.tolist() == [0, 101 * 10**7, 350 * 10**7]
+
+    def test_update_segments(self, tmp_path):
+        db = self.class_(path=tmp_path / "test.db", open_=True, create=True)
+        self.insert_timed_entries(db, [(0, 99), (100, 199), (300, 399)], update_id=1)
+        assert db.update_segments()
+        assert db.get_segments()[0].tolist() == [0, 300 * 10**7]
+
+        assert not db.update_segments()
+        self.insert_timed_entries(db, [(200, 299), (1000, 1099)], update_id=2)
+        assert db.update_segments()
+        starts, ends = db.get_segments()
+        assert starts.tolist() == [0, 1000 * 10**7]
+        assert ends.tolist() == [399 * 10**7, 1099 * 10**7]
+
+        starts, _ = db.get_segments(min_duration=datetime.timedelta(seconds=2))
+        assert starts.tolist() == [0]
+        assert db.get_segments(min_duration=5)[0].size == 0
+        assert db.update_segments(rebuild=True)
+        assert db.get_segments()[0].tolist() == [0, 1000 * 10**7]
+
+
+class TestClusteredTimeContentsFile:
+    class_ = ClusteredTimeContentsFile
+
+    def insert_entries(self, file, n_entries: int = 10):
+        with file.create_session() as session:
+            with session.begin():
+                for i in reversed(range(n_entries)):
+                    file.contents.insert(
+                        session=session,
+                        as_entry=True,
+                        update_id=i,
+                        path=f"/example_{i}",
+                        axis=0,
+                        shape=(500, 100),
+                        timezone="local",
+                        start=datetime.datetime.now() + datetime.timedelta(seconds=i),
+                        end=datetime.datetime.now() + datetime.timedelta(seconds=i + 1),
+                        sample_rate=1024,
+                    )
 
+    def test_create_clustered_file(self, tmp_path):
+        file_path = tmp_path / "test.db"
+        db = self.class_(path=file_path, open_=True, create=True)
+        self.insert_entries(db)
+        assert db.is_clustered()
+        assert len(db.get_contents_nanostamps()) == 10
+
+    def test_migrate_contents(self, tmp_path):
+        file_path = tmp_path / "test.db"
+        n_entries = 10
+        db = TimeContentsFile(path=file_path, open_=True, create=True)
+        self.insert_entries(db, n_entries=n_entries)
+        db.close()
+
+        clustered = self.class_(path=file_path, open_=True)
+        assert not clustered.is_clustered()
+        assert clustered.migrate_contents()
+        assert clustered.is_clustered()
+        assert not clustered.migrate_contents()
+
+        nanostamps = clustered.get_contents_nanostamps()
+        assert len(nanostamps) == n_entries
+        with clustered.create_session() as session:
+            starts = [e["start"] for e in clustered.contents.get_all(session=session, as_entries=True)]
+        assert starts == sorted(starts)
+
+    def test_reconcile_changed_start(self, tmp_path):
+        db = self.class_(path=tmp_path / "test.db", open_=True, create=True)
+        entries = {
+            f"/example_{i}": {
+                "path": f"/example_{i}",
+                "axis": 0,
+                "shape": (100, 4),
+                "timezone": 0,
+                "start": np.uint64(i * 10**9),
+                "end": np.uint64(i * 10**9 + 99 * 10**7),
+                "sample_rate": 100,
+            }
+            for i in range(3)
+        }
+        with db.create_session() as session:
+            with session.begin():
+                assert db.contents.reconcile_entries(session, entries)["added"] == list(entries)
 
+        entries["/example_1"] |= {"start": np.uint64(5 * 10**9), "end": np.uint64(5 * 10**9 + 99 * 10**7)}
+        with db.create_session() as session:
+            with session.begin():
+                changes = db.contents.reconcile_entries(session, entries)
+        assert changes == {"added": [], "updated": ["/example_1"], "removed": []}
+        with db.create_session() as session:
+            rows = [(e["path"], e["update_id"]) for e in db.contents.get_all(session=session, as_entries=True)]
+        assert rows == [("/example_0", 1), ("/example_2", 1), ("/example_1", 2)]
+        db.close()
@@ -0,0 +1,975 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+""" test_timecontentsproxy.py
+Test for the TimeContentsProxy.
+"""
+# Package Header #
+from src.cdfs.header import *
+
+# Header #
+__author__ = __author__
+__credits__ = __credits__
+__maintainer__ = __maintainer__
+__email__ = __email__
+
+
+# Imports #
+# Standard Libraries #
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import datetime
+import os
+import pathlib
+import threading
+import time
+from typing import Any
+
+# Third-Party Packages #
+import h5py
+import numpy as np
+from proxyarrays import ContainerTimeAxis
+import pytest
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from sqlalchemy.ext.asyncio import AsyncAttrs
+
+# Local Packages #
+from src.cdfs.contentsfile.sqlite import BaseMetaInformationTable, BaseTimeContentsTable, TimeContentsFile
+from src.cdfs.arrays import BaseTimeContentsLeafContainer, TimeContentsNodeProxy, TimeContentsProxy
+from src.cdfs import CDFS
+
+
+# Definitions #
+# Constants #
+SAMPLE_RATE = 100
+LEAF_LENGTH = 1000
+N_CHANNELS = 4
+START = 1_700_000_000 * 10**9
+
+
+# Classes #
+class ExampleSchema(AsyncAttrs, DeclarativeBase):
+    pass
+
+
+class ExampleMetaInformationTable(BaseMetaInformationTable, ExampleSchema):
+    tz_offset: Mapped[int] = mapped_column(default=0)
+
+    def as_entry(self) -> dict[str, Any]:
+        entry = super().as_entry()
+        entry["tz_offset"] = datetime.timezone(datetime.timedelta(seconds=self.tz_offset))
+        return entry
+
+
+class ExampleContentsTable(BaseTimeContentsTable, ExampleSchema):
+    pass
+
+
+class ExampleContentsFile(TimeContentsFile):
+    schema = ExampleSchema
+    meta_information_table = ExampleMetaInformationTable
+    contents = ExampleContentsTable
+
+
+class ExampleLeaf(BaseTimeContentsLeafContainer):
+    file_type = h5py.File
+
+    @classmethod
+    def validate_path(cls, path: str | pathlib.Path) -> bool:
+        return pathlib.Path(path).is_file()
+
+    def _is_open(self) -> bool:
+        return self._file is not None and bool(self._file)
+
+    def load(self) -> None:
+        pass
+
+    def get_data(self) -> Any:
+        return self.file["data"]
+
+    def set_data(self, value: Any) -> None:
+        pass
+
+    def get_time_axis(self) -> Any:
+        return ContainerTimeAxis(
+            data=self.file["time"][...],
+            sample_rate=float(self.file.attrs["sample_rate"]),
+            precise=True,
+        )
+
+    def set_time_axis(self, value: Any) -> None:
+        pass
+
+    @classmethod
+    def write_file(
+        cls,
+        path: pathlib.Path,
+        data: np.ndarray,
+        nanostamps: np.ndarray,
+        sample_rate: float,
+        axis: int = 0,
+    ) -> None:
+        with h5py.File(path, "w") as file:
+            file["data"] = data
+            file["time"] = nanostamps
+            file.attrs["sample_rate"] = sample_rate
+
+
+class ExampleNode(TimeContentsNodeProxy):
+    default_leaf_type = ExampleLeaf
+
+
+ExampleNode.default_node_type = ExampleNode
+
+
+class ExampleProxy(TimeContentsProxy):
+    default_node_type = ExampleNode
+    default_leaf_type = ExampleLeaf
+
+
+class ExampleCDFS(CDFS):
+    default_proxy_type = ExampleProxy
+    contents_file_type = ExampleContentsFile
+
+
+# Functions #
+def leaf_start(index: int, gap: int = 0) -> int:
+    return START + index * (LEAF_LENGTH * 10**9 // SAMPLE_RATE + gap)
+
+
+def add_leaf(cdfs: CDFS, index: int, update_id: int, name: str | None = None, gap: int = 0) -> np.ndarray:
+    start = leaf_start(index, gap)
+    times = (start + np.arange(LEAF_LENGTH, dtype=np.int64) * (10**9 // SAMPLE_RATE)).astype(np.uint64)
+    data = np.arange(LEAF_LENGTH * N_CHANNELS, dtype=np.float64).reshape(LEAF_LENGTH, N_CHANNELS) + index * 10**6
+    path = f"node/leaf_{index}.h5" if name is None else name
+    (cdfs.path / path).parent.mkdir(parents=True, exist_ok=True)
+    with h5py.File(cdfs.path / path, "w") as file:
+        file["data"] = data
+        file["time"] = times
+        file.attrs["sample_rate"] = SAMPLE_RATE
+
+    with cdfs.contents_file.create_session() as session:
+        cdfs.contents_file.contents.insert(
+            session=session,
+            as_entry=True,
+            begin=True,
+            update_id=update_id,
+            path=path,
+            axis=0,
+            shape=data.shape,
+            timezone=0,
+            start=times[0],
+            end=times[-1],
+            sample_rate=SAMPLE_RATE,
+        )
+    return data
+
+
+@pytest.fixture
+def example_cdfs(tmp_path):
+    """A pytest fixture which creates a CDFS with five contiguous leaves and returns it with the leaf data."""
+    cdfs = ExampleCDFS(path=tmp_path / "example", mode="a", create=True, load=False)
+    cdfs.contents_file.create_meta_information(tz_offset=0)
+    data = [add_leaf(cdfs, i, update_id=i) for i in (3, 0, 4, 1, 2)]
+    cdfs.close()
+    return ExampleCDFS(path=tmp_path / "example", mode="r", load=True), data
+
+
+# Classes #
+class TestTimeContentsProxy:
+    def test_construct_proxies(self, example_cdfs):
+        cdfs, data = example_cdfs
+        proxy = cdfs.data
+        assert proxy.latest_update == 4
+        assert len(proxy.proxies) == 1
+        assert len(proxy.proxies[0].proxies) == 5
+        assert proxy.shape == (5 * LEAF_LENGTH, N_CHANNELS)
+        assert proxy.start_nanostamp == leaf_start(0)
+        assert all(not leaf.is_open for leaf in proxy.proxies[0].proxies)
+
+    def test_entries_from_rows(self, example_cdfs):
+        cdfs, _ = example_cdfs
+        entries = cdfs.data.entries_from_rows(cdfs.contents_file.get_contents_rows())
+        assert len(entries) == 5
+        assert all(e["shape"] == (LEAF_LENGTH, N_CHANNELS) for e in entries)
+        assert all(isinstance(e["start"], np.uint64) for e in entries)
+
+    def test_update_proxies(self, example_cdfs):
+        cdfs, _ = example_cdfs
+        cdfs.contents_file.close()
+        cdfs.contents_file.open()
+        add_leaf(cdfs, 5, update_id=5)
+        cdfs.data.update_proxies()
+        assert cdfs.data.latest_update == 5
+        assert len(cdfs.data.proxies[0].proxies) == 6
+        assert cdfs.data.shape == (6 * LEAF_LENGTH, N_CHANNELS)
+
+    def test_read_across_leaves(self, example_cdfs):
+        cdfs, data = example_cdfs
+        expected = np.concatenate(sorted(data, key=lambda d: d[0, 0]))
+        window = (slice(LEAF_LENGTH - 5, LEAF_LENGTH + 5),)
+        assert np.array_equal(cdfs.data.slices_array(window), expected[window])
+
+    def test_children_ordered_by_start(self, example_cdfs):
+        cdfs, _ = example_cdfs
+        node = cdfs.data.proxies[0]
+        assert node.child_starts.tolist() == [leaf_start(i) for i in range(5)]
+        assert [p.path.name for p in node.proxies] == [f"leaf_{i}.h5" for i in range(5)]
+        assert all(not leaf.is_open for leaf in node.proxies)
+
+    def test_update_merges_children(self, example_cdfs):
+        cdfs, _ = example_cdfs
+        cdfs.contents_file.close()
+        cdfs.contents_file.open()
+        add_leaf(cdfs, 7, update_id=5)
+        add_leaf(cdfs, 6, update_id=6, name="node/leaf_10.h5")
+        add_leaf(cdfs, -2, update_id=7, name="early/leaf_0.h5")
+        cdfs.data.update_proxies()
+
+        node = cdfs.data.proxies[1]
+        assert [p.path.name for p in cdfs.data.proxies] == ["early", "node"]
+        assert cdfs.data.child_starts.tolist() == [leaf_start(-2), leaf_start(0)]
+        assert node.child_starts.tolist() == [leaf_start(i) for i in (0, 1, 2, 3, 4, 6, 7)]
+        assert [p.path.name for p in node.proxies][-2:] == ["leaf_10.h5", "leaf_7.h5"]
+        assert node.child_start_indices.tolist() == [i * LEAF_LENGTH for i in range(7)]
+        assert cdfs.data.length == 8 * LEAF_LENGTH
+
+    def test_child_time_index(self, example_cdfs):
+        cdfs, _ = example_cdfs
+        node = cdfs.data.proxies[0]
+        period = 10**9 // SAMPLE_RATE
+        assert node.child_ends.tolist() == [leaf_start(i) + (LEAF_LENGTH - 1) * period for i in range(5)]
+        assert node.child_lengths.tolist() == [LEAF_LENGTH] * 5
+        assert cdfs.data.end_nanostamp == leaf_start(4) + (LEAF_LENGTH - 1) * period
+
+        index, proxy = node.find_proxy(np.uint64(leaf_start(2) + 5 * period))
+        assert index == 2 and proxy is node.proxies[2]
+        assert node.find_proxy(np.uint64(leaf_start(3) - 1)).index == 3
+        with pytest.raises(IndexError):
+            node.find_proxy(np.uint64(leaf_start(0) - 1))
+
+        found = node.find_inner_proxy_indices([0, LEAF_LENGTH - 1, LEAF_LENGTH, 3 * LEAF_LENGTH + 7, -1])
+        assert [tuple(f) for f in found] == [
+            (0, 0, 0),
+            (0, 0, LEAF_LENGTH - 1),
+            (1, LEAF_LENGTH, 0),
+            (3, 3 * LEAF_LENGTH, 7),
+            (4, 4 * LEAF_LENGTH, LEAF_LENGTH - 1),
+        ]
+        assert all(not leaf.is_open for leaf in node.proxies)
+
+    def test_leaves_materialized_lazily(self, example_cdfs):
+        cdfs, data = example_cdfs
+        node = cdfs.data.proxies[0]
+        table = node.proxies
+        table.max_materialized = 2
+        assert cdfs.data.shape == (5 * LEAF_LENGTH, N_CHANNELS)
+        assert cdfs.data.sample_rate == SAMPLE_RATE
+        assert len(table.materialized) == 0
+        assert table.leaf_rows.tolist() == [table.find_leaf(f"leaf_{i}.h5") for i in range(5)]
+
+        expected = np.concatenate(sorted(data, key=lambda d: d[0, 0]))
+        assert np.array_equal(cdfs.data.slices_array((slice(None),)), expected)
+        assert len(table.materialized) == 2
+        assert node.proxies[0] is node.proxies[0]
+        assert table.shapes == [(LEAF_LENGTH, N_CHANNELS)]
+        assert table.shape_index == {(LEAF_LENGTH, N_CHANNELS): 0}
+
+        rows = table.leaf_rows.tolist()
+        first = table.get_leaf(rows[0])
+        assert np.array_equal(first.data[0], expected[0])
+        assert first.is_open
+        table.get_leaf(rows[1])
+        table.get_leaf(rows[2])
+        assert rows[0] not in table.materialized
+        assert not first.is_open
+
+        table.max_materialized = 1
+        with ThreadPoolExecutor(4) as executor:
+            leaves = list(executor.map(lambda i: table.get_leaf(rows[i % 5]).get_shape(), range(200)))
+        assert leaves == [(LEAF_LENGTH, N_CHANNELS)] * 200
+        assert len(table.materialized) == 1
+
+        leaf = table.get_leaf(rows[4])
+        assert np.array_equal(leaf.data[0], expected[4 * LEAF_LENGTH])
+        table.evict()
+        assert not table.materialized and not leaf.is_open
+
+        marker = object()
+        table[0:2] = [marker]
+        assert len(table) == table.leaf_rows.size == 4
+        assert table.find_leaf("leaf_0.h5") is table.find_leaf("leaf_1.h5") is None
+        del table[1]
+        assert len(table) == table.leaf_rows.size == 3
+        assert table.find_leaf("leaf_2.h5") is None and table[0] is marker
+
+        lock = table.lock
+        leaf = table.get_leaf(rows[4])
+        assert np.array_equal(leaf.data[0], expected[4 * LEAF_LENGTH])
+        table.clear()
+        assert len(table) == len(table.paths) == 0 and table.lock is lock
+        assert not leaf.is_open
+
+    def test_handle_pool(self, example_cdfs):
+        cdfs, data = example_cdfs
+        cdfs.handle_limit = 2
+        pool = cdfs.handle_pool
+        expected = np.concatenate(sorted(data, key=lambda d: d[0, 0]))
+
+        assert np.array_equal(cdfs.data.slices_array((slice(None),)), expected)
+        assert len(pool) <= 2
+        assert pool.evictions >= 3
+
+        pool.reset_stats()
+        leaf = cdfs.data.proxies[0].proxies[4]
+        assert np.array_equal(leaf.data[0], expected[4 * LEAF_LENGTH])
+        assert np.array_equal(leaf.data[1], expected[4 * LEAF_LENGTH + 1])
+        assert pool.get_stats()["hits"] >= 1
+
+        first = cdfs.data.proxies[0].proxies[0]
+        assert np.array_equal(first.data[0], expected[0])
+        assert np.array_equal(cdfs.data.proxies[0].proxies[1].data[0], expected[LEAF_LENGTH])
+        assert np.array_equal(cdfs.data.proxies[0].proxies[2].data[0], expected[2 * LEAF_LENGTH])
+        assert not first.is_open
+        assert np.array_equal(first.data[1], expected[1])
+        assert first.is_open
+
+        with first.use_file() as file:
+            first.close()
+            assert np.array_equal(file["data"][0], expected[0])
+        assert not first.is_open
+
+        cdfs.close()
+        assert len(pool) == 0
+
+    @pytest.mark.parametrize("read_workers", [1, 4])
+    def test_read_index_range(self, example_cdfs, read_workers):
+        cdfs, data = example_cdfs
+        cdfs.data.set_read_workers(read_workers)
+        expected = np.concatenate(sorted(data, key=lambda d: d[0, 0]))
+        assert np.array_equal(cdfs.data.read_index_range(), expected)
+        assert np.array_equal(cdfs.data.read_index_range(990, 3010), expected[990:3010])
+        assert np.array_equal(cdfs.data.read_index_range(-5), expected[-5:])
+        assert cdfs.data.read_index_range(10, 10).shape == (0, N_CHANNELS)
+        cdfs.data.close()
+
+    def test_read_time_range(self, example_cdfs):
+        cdfs, data = example_cdfs
+        expected = np.concatenate(sorted(data, key=lambda d: d[0, 0]))
+        period = 10**9 // SAMPLE_RATE
+        start = np.uint64(leaf_start(1) - 5 * period)
+        stop = np.uint64(leaf_start(3) + 5 * period + 1)
+        assert cdfs.data.get_nanostamp_index(int(start)) == LEAF_LENGTH - 5
+        assert np.array_equal(cdfs.data.read_time_range(start, stop), expected[LEAF_LENGTH - 5:3 * LEAF_LENGTH + 6])
+
+    def test_read_into_out(self, example_cdfs):
+        cdfs, data = example_cdfs
+        expected = np.concatenate(sorted(data, key=lambda d: d[0, 0]))
+        out = np.zeros((2 * LEAF_LENGTH, N_CHANNELS))
+        assert cdfs.data.read_index_range(500, 2500, out=out) is out
+        assert np.array_equal(out, expected[500:2500])
+
+        start = np.uint64(leaf_start(2))
+        stop = np.uint64(leaf_start(4))
+        assert cdfs.data.read_time_range(start, stop, out=out) is out
+        assert np.array_equal(out, expected[2 * LEAF_LENGTH:4 * LEAF_LENGTH])
+
+        with pytest.raises(ValueError):
+            cdfs.data.read_index_range(0, 10, out=out)
+        with pytest.raises(TypeError):
+            cdfs.data.read_index_range(500, 2500, dtype=np.float32, out=out)
+
+    def test_read_channels(self, example_cdfs):
+        cdfs, data = example_cdfs
+        expected = np.concatenate(sorted(data, key=lambda d: d[0, 0]))
+        assert np.array_equal(cdfs.data.read_index_range(500, 2500, channels=slice(1, 3)), expected[500:2500, 1:3])
+        assert np.array_equal(cdfs.data.read_index_range(500, 2500, channels=[3, 0, 3]), expected[500:2500, [3, 0, 3]])
+        assert np.array_equal(cdfs.data.read_index_range(channels=-1, channel_axis=1), expected[:, [-1]])
+        assert np.array_equal(cdfs.data.read_index_range(channels=slice(None, None, -2)), expected[:, ::-2])
+
+        start = np.uint64(leaf_start(2))
+        stop = np.uint64(leaf_start(4))
+        selected = cdfs.data.read_time_range(start, stop, channels=[0, 2])
+        assert np.array_equal(selected, expected[2 * LEAF_LENGTH:4 * LEAF_LENGTH, [0, 2]])
+
+        cdfs.data.enable_block_cache(block_length=256)
+        for channels in ([1, 2], [2, 1], None):
+            selected = cdfs.data.read_index_range(900, 2100, channels=channels)
+            assert np.array_equal(selected, expected[900:2100] if channels is None else expected[900:2100, channels])
+
+        _, window = next(cdfs.data.iter_windows(duration=3, channels=[1]))
+        assert np.array_equal(window, expected[:300, [1]])
+
+        with pytest.raises(ValueError):
+            cdfs.data.read_index_range(channels=[0], channel_axis=0)
+        with pytest.raises(IndexError):
+            cdfs.data.read_index_range(channels=[N_CHANNELS])
+
+    def test_memory_map(self, example_cdfs, tmp_path):
+        cdfs, data = example_cdfs
+        expected = np.concatenate(sorted(data, key=lambda d: d[0, 0]))
+        cdfs.data.close()
+        cdfs.construct_data(memory_map=True)
+        assert np.array_equal(cdfs.data.read_index_range(990, 3010), expected[990:3010])
+        assert np.array_equal(cdfs.data.read_index_range(990, 3010, channels=[3, 1]), expected[990:3010, [3, 1]])
+
+        leaf = cdfs.data.find_leaf_segments(0, 1)[0][0]
+        view = cdfs.data.read_index_range(100, 200, copy=False)
+        assert np.shares_memory(view, leaf.get_memmap())
+        assert not view.flags.writeable
+        assert np.array_equal(view, expected[100:200])
+        assert np.array_equal(cdfs.data.read_index_range(990, 1010, copy=False), expected[990:1010])
+        leaf.close()
+        assert leaf._memmap is None
+
+        with h5py.File(tmp_path / "chunked.h5", "w") as file:
+            file.create_dataset("data", data=data[0], chunks=(100, N_CHANNELS))
+            file["time"] = np.arange(LEAF_LENGTH, dtype=np.uint64)
+            file.attrs["sample_rate"] = SAMPLE_RATE
+        chunked = ExampleLeaf(path=tmp_path / "chunked.h5", mode="r", memory_map=True, trust_contents=False)
+        assert chunked.get_memmap() is None
+        assert np.array_equal(chunked.get_slices((slice(5, 10),)), data[0][5:10])
+        chunked.close()
+
+    def test_sequential_prefetch(self, example_cdfs):
+        cdfs, data = example_cdfs
+        expected = np.concatenate(sorted(data, key=lambda d: d[0, 0]))
+        prefetcher = cdfs.data.enable_prefetch(depth=2, chunk_length=LEAF_LENGTH // 4)
+        window = LEAF_LENGTH // 4
+        for start in range(0, len(expected), window):
+            assert np.array_equal(cdfs.data.read_index_range(start, start + window), expected[start:start + window])
+
+        stats = prefetcher.get_stats()
+        assert stats["hits"] > 0
+        assert stats["nbytes"] <= prefetcher.memory_budget
+
+        cdfs.data.read_index_range(0, window)
+        assert np.array_equal(cdfs.data.read_index_range(window, 3 * window), expected[window:3 * window])
+        cdfs.data.disable_prefetch()
+        assert cdfs.data.prefetcher is None
+
+        prefetcher = cdfs.data.enable_prefetch(depth=1)
+        leaf = cdfs.data.proxies[0].proxies[4]
+        release = threading.Event()
+        use_file = leaf.use_file
+        leaf.use_file = lambda *args, **kwargs: release.wait(5) and use_file(*args, **kwargs)
+        prefetcher.is_sequential(0, window)
+        prefetcher.schedule([(leaf, 0, window, 0)])
+        future = prefetcher.pending[(leaf.path, 0)]
+        assert not prefetcher.is_sequential(4 * window, 5 * window)
+        release.set()
+        if not future.cancel():
+            future.result(timeout=5)
+        assert len(prefetcher) == 0 and prefetcher.nbytes == 0 and not prefetcher.pending
+        cdfs.data.disable_prefetch()
+
+    def test_block_cache(self, example_cdfs):
+        cdfs, data = example_cdfs
+        expected = np.concatenate(sorted(data, key=lambda d: d[0, 0]))
+        cache = cdfs.data.enable_block_cache(block_length=256)
+        for _ in range(2):
+            assert np.array_equal(cdfs.data.read_index_range(900, 2100), expected[900:2100])
+        assert cache.get_stats()["hits"] == cache.get_stats()["misses"] > 0
+
+        cdfs.data.enable_block_cache(max_bytes=3 * 256 * N_CHANNELS * 8)
+        assert cache.nbytes <= cache.max_bytes
+        assert cache.evictions > 0
+
+        cdfs.contents_file.close()
+        cdfs.contents_file.open()
+        grown = np.concatenate([data[2], data[2][:500] + 0.5])
+        times = (leaf_start(4) + np.arange(len(grown), dtype=np.int64) * (10**9 // SAMPLE_RATE)).astype(np.uint64)
+        cdfs.data.read_index_range(4000, 5000)
+        cdfs.handle_pool.clear()
+        with h5py.File(cdfs.path / "node/leaf_4.h5", "w") as file:
+            file["data"] = grown
+            file["time"] = times
+            file.attrs["sample_rate"] = SAMPLE_RATE
+        with cdfs.contents_file.create_session() as session:
+            cdfs.contents_file.contents.update_entry(
+                session=session,
+                entry={"path": "node/leaf_4.h5", "shape": grown.shape, "end": times[-1], "update_id": 5},
+                key="path",
+                begin=True,
+            )
+        cdfs.data.update_proxies()
+        assert cache.invalidations > 0
+        assert np.array_equal(cdfs.data.read_index_range(4000, 5500), grown)
+
+    def test_read_overview(self, example_cdfs):
+        cdfs, data = example_cdfs
+        expected = np.concatenate(sorted(data, key=lambda d: d[0, 0]))
+        overviews = cdfs.data.enable_overviews(factor=4)
+        overviews.wait()
+        assert overviews.builds == 5
+        assert (cdfs.path / "overviews/node/leaf_0.h5.overview.npz").is_file()
+
+        nanostamps, minimum, maximum, mean = cdfs.data.read_overview(max_points=100)
+        assert len(nanostamps) == minimum.shape[0] == 5 * 16 <= 100
+        assert nanostamps[1] - nanostamps[0] == 64 * 10**9 // SAMPLE_RATE
+        bins = [leaf[i:i + 64] for leaf in sorted(data, key=lambda d: d[0, 0]) for i in range(0, LEAF_LENGTH, 64)]
+        assert np.array_equal(minimum, [b.min(axis=0) for b in bins])
+        assert np.array_equal(maximum, [b.max(axis=0) for b in bins])
+        assert np.allclose(mean, [b.mean(axis=0) for b in bins])
+
+        start = np.uint64(leaf_start(1))
+        _, minimum, _, _ = cdfs.data.read_overview(start, start + np.uint64(10**9), max_points=50, channels=[2])
+        assert np.array_equal(minimum, expected[LEAF_LENGTH:LEAF_LENGTH + 100:4, [2]])
+        nanostamps, minimum, maximum, _ = cdfs.data.read_overview(start, start + np.uint64(10**9), max_points=100)
+        assert nanostamps[0] == start
+        assert np.array_equal(minimum, expected[LEAF_LENGTH:LEAF_LENGTH + 100]) and minimum is maximum
+
+        nanostamps, minimum, maximum, mean = cdfs.data.read_overview(max_points=3)
+        assert nanostamps.tolist() == [leaf_start(0), leaf_start(2), leaf_start(4)]
+        groups = [expected[:2000], expected[2000:4000], expected[4000:]]
+        assert np.array_equal(minimum, [g.min(axis=0) for g in groups])
+        assert np.array_equal(maximum, [g.max(axis=0) for g in groups])
+        assert np.allclose(mean, [g.mean(axis=0) for g in groups])
+
+        leaf_path = cdfs.path / "node/leaf_0.h5"
+        mtime = leaf_path.stat().st_mtime_ns + 10**9
+        os.utime(leaf_path, ns=(mtime, mtime))
+        builds = overviews.builds
+        cdfs.data.read_overview(max_points=100)
+        assert overviews.builds == builds + 1
+
+        cdfs.close()
+        cdfs = ExampleCDFS(path=cdfs.path, mode="a", load=True)
+        cdfs.get_data()
+        add_leaf(cdfs, 5, update_id=5)
+        overviews = cdfs.data.enable_overviews(factor=4, background=False)
+        cdfs.data.update_proxies()
+        overviews.wait()
+        assert overviews.builds == 1
+        assert len(cdfs.data.proxies[0].proxies.materialized) == 1
+        cdfs.close()
+
+    def test_window_statistics(self, example_cdfs):
+        cdfs, data = example_cdfs
+        expected = np.concatenate(sorted(data, key=lambda d: d[0, 0]))
+        start = np.uint64(leaf_start(0) + 500 * 10**9 // SAMPLE_RATE)
+        stop = np.uint64(leaf_start(3) + 250 * 10**9 // SAMPLE_RATE)
+        window = expected[500:3250]
+
+        statistics = cdfs.get_window_statistics(start, stop)
+        assert np.array_equal(statistics["count"], [len(window)] * N_CHANNELS)
+        assert np.array_equal(statistics["minimum"], window.min(axis=0))
+        assert np.array_equal(statistics["maximum"], window.max(axis=0))
+        assert np.allclose(statistics["mean"], window.mean(axis=0))
+        assert np.allclose(statistics["rms"], np.sqrt(np.square(window).mean(axis=0)))
+
+        cdfs.close()
+        cdfs = ExampleCDFS(path=cdfs.path, mode="a", load=True)
+        cdfs.contents_file.set_leaf_statistics("node/leaf_1.h5", data[3])
+        assert len(cdfs.contents_file.get_entries_without_statistics()) == 4
+        assert cdfs.build_statistics(workers=2, block_length=300) == 4
+        assert cdfs.build_statistics() == 0
+
+        reads = []
+        read_time_range = cdfs.data.read_time_range
+        cdfs.data.read_time_range = lambda *args: reads.append(args) or read_time_range(*args)
+        statistics = cdfs.get_window_statistics(start, stop)
+        assert len(reads) == 2
+        assert np.array_equal(statistics["minimum"], window.min(axis=0))
+        assert np.array_equal(statistics["maximum"], window.max(axis=0))
+        assert np.allclose(statistics["mean"], window.mean(axis=0))
+        assert cdfs.get_window_statistics(np.uint64(leaf_start(6)), np.uint64(leaf_start(7))) is None
+        cdfs.close()
+
+    def test_find_intervals(self, example_cdfs, monkeypatch):
+        cdfs, _ = example_cdfs
+        period = 10**9 // SAMPLE_RATE
+        threshold = 2 * 10**6 + 2000
+        expected = [leaf_start(2) + 500 * period], [leaf_start(4) + (LEAF_LENGTH - 1) * period]
+        starts, ends = cdfs.find_intervals(channel=1, above=threshold)
+        assert starts.dtype == ends.dtype == np.int64
+        assert (starts.tolist(), ends.tolist()) == expected
+
+        cdfs.close()
+        cdfs = ExampleCDFS(path=cdfs.path, mode="a", load=True)
+        cdfs.build_statistics()
+        reads = []
+        get_slices = ExampleLeaf.get_slices
+        monkeypatch.setattr(ExampleLeaf, "get_slices", lambda self, *a: reads.append(self.path) or get_slices(self, *a))
+        leaf_table = cdfs.data.proxies[0].proxies
+        leaf_table.evict()
+        starts, ends = cdfs.find_intervals(channel=1, above=threshold)
+        assert (starts.tolist(), ends.tolist()) == expected
+        assert reads == [cdfs.path / "node/leaf_2.h5"]
+        assert list(leaf_table.materialized) == [leaf_table.find_leaf("leaf_2.h5")]
+
+        starts, ends = cdfs.find_intervals(channel=1, above=10**6 + 401, below=10**6 + 413)
+        assert (starts.tolist(), ends.tolist()) == ([leaf_start(1) + 101 * period], [leaf_start(1) + 102 * period])
+        start = np.uint64(leaf_start(3) + 10 * period)
+        starts, _ = cdfs.find_intervals(channel=1, above=threshold, start=start, stop=np.uint64(leaf_start(4)))
+        assert starts.tolist() == [start]
+        cdfs.close()
+
+    def test_export_virtual_dataset(self, example_cdfs, tmp_path, monkeypatch):
+        cdfs, data = example_cdfs
+        expected = np.concatenate(sorted(data, key=lambda d: d[0, 0]))
+        period = 10**9 // SAMPLE_RATE
+        export_path = tmp_path / "export" / "recording.h5"
+        export_path.parent.mkdir()
+        with pytest.raises(ValueError):
+            cdfs.export_virtual_dataset(cdfs.path / "recording.h5")
+        assert cdfs.export_virtual_dataset(export_path) == 5
+
+        monkeypatch.chdir(export_path.parent)
+        with h5py.File(export_path, "r") as file:
+            assert file["data"].is_virtual
+            assert np.array_equal(file["data"][...], expected)
+            assert np.array_equal(file["time"][...], leaf_start(0) + np.arange(len(expected), dtype=np.uint64) * period)
+
+        cdfs.close()
+        cdfs = ExampleCDFS(path=cdfs.path, mode="a", load=False)
+        new_data = add_leaf(cdfs, 5, update_id=5)
+        cdfs.close()
+        cdfs = ExampleCDFS(path=cdfs.path, mode="r", load=True)
+        assert cdfs.export_virtual_dataset(export_path) == 1
+        assert len(cdfs.data.proxies[0].proxies.materialized) == 2
+        assert cdfs.export_virtual_dataset(export_path) == 0
+        with h5py.File(export_path, "r") as file:
+            assert np.array_equal(file["data"][...], np.concatenate((expected, new_data)))
+            assert file["time"][-1] == leaf_start(5) + (LEAF_LENGTH - 1) * period
+            assert len(file["sources/paths"]) == 6
+        assert cdfs.export_virtual_dataset(export_path, rebuild=True) == 6
+        cdfs.close()
+
+    def test_compact_leaves(self, example_cdfs, monkeypatch):
+        cdfs, data = example_cdfs
+        expected = np.concatenate(sorted(data, key=lambda d: d[0, 0]))
+        assert np.array_equal(cdfs.data.read_index_range(), expected)
+        cdfs.handle_pool.clear()
+
+        writer = ExampleCDFS(path=cdfs.path, mode="a", load=True)
+        writer.build_statistics()
+        with monkeypatch.context() as context:
+            context.setattr(ExampleLeaf, "write_file", BaseTimeContentsLeafContainer.write_file)
+            writer.handle_pool.reset_stats()
+            with pytest.raises(NotImplementedError):
+                writer.compact_leaves(target_bytes=3 * data[0].nbytes)
+            assert writer.handle_pool.get_stats()["misses"] == 0
+        assert writer.compact_leaves(target_bytes=3 * data[0].nbytes) == 2
+        assert [row.path for row in writer.contents_file.get_contents_rows()] == [
+            f"node/compacted_{leaf_start(0)}_{leaf_start(2) + (LEAF_LENGTH - 1) * 10**7}.h5",
+            f"node/compacted_{leaf_start(3)}_{leaf_start(4) + (LEAF_LENGTH - 1) * 10**7}.h5",
+        ]
+        assert sorted(p.name for p in (cdfs.path / "node").iterdir()) == [
+            f"compacted_{leaf_start(0)}_{leaf_start(2) + (LEAF_LENGTH - 1) * 10**7}.h5",
+            f"compacted_{leaf_start(3)}_{leaf_start(4) + (LEAF_LENGTH - 1) * 10**7}.h5",
+        ]
+        assert len(writer.contents_file.get_entries_without_statistics()) == 2
+        assert len(writer.contents_file.get_channel_statistics(0)) == 0
+        assert np.array_equal(writer.data.read_index_range(), expected)
+        assert writer.compact_leaves(target_bytes=3 * data[0].nbytes) == 0
+        writer.close()
+
+        cdfs.data.update_proxies()
+        assert len(cdfs.data.get_leaves()) == 2
+        assert cdfs.data.latest_update == 6
+        assert np.array_equal(cdfs.data.read_index_range(), expected)
+        assert np.array_equal(cdfs.data.read_index_range(2990, 3010), expected[2990:3010])
+        cdfs.close()
+
+    def test_compact_leaves_dtypes_and_overlaps(self, tmp_path):
+        cdfs = ExampleCDFS(path=tmp_path / "mixed", mode="a", create=True, load=False)
+        cdfs.contents_file.create_meta_information(tz_offset=0)
+        for i in range(5):
+            add_leaf(cdfs, i, update_id=i)
+            if i in (1, 3, 4):
+                with h5py.File(cdfs.path / f"node/leaf_{i}.h5", "r+") as file:
+                    data = file["data"][...]
+                    del file["data"]
+                    file["data"] = data.astype(np.float32)
+        add_leaf(cdfs, 2, update_id=5, name="node/overlap_2.h5")
+        cdfs.close()
+
+        cdfs = ExampleCDFS(path=tmp_path / "mixed", mode="a", load=True)
+        assert cdfs.compact_leaves(target_bytes=2**30) == 1
+        compacted = f"node/compacted_{leaf_start(3)}_{leaf_start(4) + (LEAF_LENGTH - 1) * 10**7}.h5"
+        paths = {row.path for row in cdfs.contents_file.get_contents_rows()}
+        assert paths == {"node/leaf_0.h5", "node/leaf_1.h5", "node/leaf_2.h5", "node/overlap_2.h5", compacted}
+        with h5py.File(cdfs.path / compacted, "r") as file:
+            assert file["data"].dtype == np.float32
+            assert (np.diff(file["time"][...].astype(np.int64)) > 0).all()
+        cdfs.close()
+
+    def test_update_keeps_overlapping_leaves(self, example_cdfs):
+        cdfs, data = example_cdfs
+        assert len(cdfs.data.get_leaves()) == 5
+        cdfs.close()
+        cdfs = ExampleCDFS(path=cdfs.path, mode="a", load=True)
+        cdfs.get_data()
+        add_leaf(cdfs, 1, update_id=5, name="other/leaf_1.h5")
+        cdfs.data.update_proxies()
+        assert len(cdfs.data.get_leaves()) == 6
+        entry = {"path": "other/new.h5", "start": leaf_start(1) + 10**9, "end": leaf_start(1) + 2 * 10**9}
+        assert cdfs.data.find_replaced_paths([entry]) == {"node/leaf_1.h5", "other/leaf_1.h5"}
+        cdfs.close()
+
+    def test_correct_contents(self, example_cdfs):
+        cdfs, data = example_cdfs
+        cdfs.close()
+        period = 10**9 // SAMPLE_RATE
+        (cdfs.path / "node/leaf_4.h5").unlink()
+        (cdfs.path / "node/broken.h5").write_text("not a leaf")
+        (cdfs.path / "overviews").mkdir()
+        (cdfs.path / "overviews/node/leaf_0.h5.overview.npz").parent.mkdir()
+        (cdfs.path / "overviews/node/leaf_0.h5.overview.npz").write_text("not a leaf")
+        (cdfs.path / "node/export.vds.h5").write_text("not a leaf")
+        new_data = np.ones((LEAF_LENGTH, N_CHANNELS))
+        ExampleLeaf.write_file(
+            cdfs.path / "node/leaf_5.h5",
+            new_data,
+            (leaf_start(5) + np.arange(LEAF_LENGTH) * period).astype(np.uint64),
+            SAMPLE_RATE,
+        )
+        ExampleLeaf.write_file(
+            cdfs.path / "node/leaf_1.h5",
+            data[3][:500],
+            (leaf_start(1) + np.arange(500) * period).astype(np.uint64),
+            SAMPLE_RATE,
+        )
+
+        cdfs = ExampleCDFS(path=cdfs.path, mode="a", load=False)
+        cdfs.update_segments()
+        changes = cdfs.correct_contents(workers=2)
+        assert changes == {
+            "added": ["node/leaf_5.h5"],
+            "updated": ["node/leaf_1.h5"],
+            "removed": ["node/leaf_4.h5"],
+            "unreadable": ["node/broken.h5"],
+        }
+        rows = cdfs.contents_file.get_contents_rows()
+        assert [row.path for row in rows] == [f"node/leaf_{i}.h5" for i in (0, 1, 2, 3, 5)]
+        assert rows[1].shape == "500, 4" and rows[1].update_id == rows[4].update_id == 5
+        assert rows[4].end == leaf_start(5) + (LEAF_LENGTH - 1) * period
+        assert len(cdfs.get_segments()[0]) == 3
+        assert cdfs.correct_contents(workers=2) == {
+            "added": [],
+            "updated": [],
+            "removed": [],
+            "unreadable": ["node/broken.h5"],
+        }
+
+        cdfs.construct_data()
+        assert np.array_equal(cdfs.data.read_index_range(1000, 1500), data[3][:500])
+        assert np.array_equal(cdfs.data.read_index_range(3500, 4500), new_data)
+        cdfs.close()
+
+    def test_correct_contents_incremental(self, example_cdfs):
+        cdfs, data = example_cdfs
+        cdfs.close()
+        cdfs = ExampleCDFS(path=cdfs.path, mode="a", load=False)
+        unchanged = {"added": [], "updated": [], "removed": [], "unreadable": []}
+        assert cdfs.correct_contents(workers=1, incremental=True) == unchanged
+        assert cdfs.correct_contents(workers=1, incremental=True) == unchanged
+
+        leaf_2 = cdfs.path / "node/leaf_2.h5"
+        stat = leaf_2.stat()
+        with leaf_2.open("r+b") as file:
+            file.write(b"\0" * 64)
+        os.utime(leaf_2, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        period = 10**9 // SAMPLE_RATE
+        ExampleLeaf.write_file(
+            cdfs.path / "node/leaf_1.h5",
+            data[3][:500],
+            (leaf_start(1) + np.arange(500) * period).astype(np.uint64),
+            SAMPLE_RATE,
+        )
+        assert cdfs.correct_contents(workers=1, incremental=True) == unchanged | {"updated": ["node/leaf_1.h5"]}
+        assert cdfs.correct_contents(workers=1) == unchanged | {"unreadable": ["node/leaf_2.h5"]}
+        assert [row.path for row in cdfs.contents_file.get_contents_rows()] == [f"node/leaf_{i}.h5" for i in range(5)]
+        cdfs.close()
+
+    def test_correct_contents_async(self, example_cdfs, monkeypatch):
+        cdfs, _ = example_cdfs
+        cdfs.close()
+        cdfs = ExampleCDFS(path=cdfs.path, mode="a", load=False)
+        (cdfs.path / "node/leaf_4.h5").unlink()
+        ticks = []
+        read_entries = ExampleContentsTable.read_entries.__func__
+
+        def slow_read_entries(cls, *args):
+            time.sleep(0.2)
+            return read_entries(cls, *args)
+
+        monkeypatch.setattr(ExampleContentsTable, "read_entries", classmethod(slow_read_entries))
+
+        async def tick():
+            while True:
+                ticks.append(None)
+                await asyncio.sleep(0.01)
+
+        async def correct():
+            ticker = asyncio.create_task(tick())
+            try:
+                return await cdfs.correct_contents_async(workers=1, incremental=True)
+            finally:
+                ticker.cancel()
+
+        changes = asyncio.run(correct())
+        assert changes == {"added": [], "updated": [], "removed": ["node/leaf_4.h5"], "unreadable": []}
+        assert len(ticks) >= 5
+        cdfs.close()
+
+    def test_iter_windows(self, example_cdfs):
+        cdfs, data = example_cdfs
+        expected = np.concatenate(sorted(data, key=lambda d: d[0, 0]))
+        windows = list(cdfs.iter_windows(duration=3, overlap=0.5, reuse=False))
+        assert len(windows) == 20
+        for i, (start, window) in enumerate(windows):
+            first = i * 250
+            assert start == np.uint64(leaf_start(0) + first * 10**9 // SAMPLE_RATE)
+            n_samples = min(300, len(expected) - first)
+            assert np.array_equal(window[:n_samples], expected[first:first + n_samples])
+            assert np.isnan(window[n_samples:]).all()
+
+        buffers = {id(window) for _, window in cdfs.data.iter_windows(duration=datetime.timedelta(seconds=10))}
+        assert len(buffers) == 1
+
+    def test_iter_windows_gaps(self, tmp_path):
+        cdfs = ExampleCDFS(path=tmp_path / "gaps", mode="a", create=True, load=False)
+        cdfs.contents_file.create_meta_information(tz_offset=0)
+        gap = 2 * 10**9
+        data = [add_leaf(cdfs, i, update_id=i, gap=gap) for i in range(2)]
+        cdfs.close()
+
+        cdfs = ExampleCDFS(path=tmp_path / "gaps", mode="r", load=True)
+        start = np.uint64(leaf_start(1, gap) - 5 * 10**9)
+        windows = list(cdfs.iter_windows(duration=10, start=start, stop=start + np.uint64(1), fill_value=-1.0))
+        assert len(windows) == 1
+        window = windows[0][1]
+        assert np.array_equal(window[:300], data[0][-300:])
+        assert (window[300:500] == -1).all()
+        assert np.array_equal(window[500:], data[1][:500])
+        cdfs.close()
+
+    def test_aiter_windows(self, example_cdfs, monkeypatch):
+        cdfs, data = example_cdfs
+        expected = np.concatenate(sorted(data, key=lambda d: d[0, 0]))
+        fill_window = cdfs.data.fill_window
+        active = []
+        in_flight = []
+
+        def counted_fill_window(*args):
+            active.append(None)
+            in_flight.append(len(active))
+            try:
+                return fill_window(*args)
+            finally:
+                active.pop()
+
+        monkeypatch.setattr(cdfs.data, "fill_window", counted_fill_window)
+
+        async def collect():
+            windows = []
+            async for start, window in cdfs.data.aiter_windows(duration=3, overlap=0.5, ahead=2):
+                await asyncio.sleep(0)
+                windows.append((start, window.copy()))
+            return windows
+
+        windows = asyncio.run(collect())
+        assert max(in_flight) == 1
+        assert [s for s, _ in windows] == [s for s, _ in cdfs.data.iter_windows(duration=3, overlap=0.5)]
+        assert all(np.array_equal(w[:300], expected[i * 250:i * 250 + 300]) for i, (_, w) in enumerate(windows[:-2]))
+
+    def test_aiter_windows_cancel(self, example_cdfs):
+        cdfs, _ = example_cdfs
+
+        async def first_windows():
+            windows = cdfs.data.aiter_windows(duration=1, ahead=3)
+            starts = [(await anext(windows))[0] for _ in range(2)]
+            await windows.aclose()
+            return starts
+
+        assert asyncio.run(first_windows()) == [np.uint64(leaf_start(0)), np.uint64(leaf_start(0) + 10**9)]
+
+    def test_aiter_windows_follow(self, example_cdfs, monkeypatch):
+        cdfs, _ = example_cdfs
+        cdfs.close()
+        cdfs = ExampleCDFS(path=cdfs.path, mode="a", load=True)
+        start = np.uint64(leaf_start(0))
+        stop = start + np.uint64(50 * 10**9 + 1)
+        updates = []
+
+        async def update_proxies_async(**kwargs):
+            updates.append(cdfs.data.end_nanostamp)
+            cdfs.data.update_proxies(**kwargs)
+
+        monkeypatch.setattr(cdfs.data, "update_proxies_async", update_proxies_async)
+
+        async def follow():
+            windows = []
+            iterator = cdfs.data.aiter_windows(duration=10, start=start, stop=stop, follow=True, ahead=3)
+            async for window_start, window in iterator:
+                windows.append((window_start, window.copy()))
+                if len(windows) == 5:
+                    windows.append(add_leaf(cdfs, 5, update_id=5))
+            return windows
+
+        windows = asyncio.run(asyncio.wait_for(follow(), timeout=30))
+        data = windows.pop(5)
+        assert [s for s, _ in windows] == [np.uint64(leaf_start(i)) for i in range(6)]
+        assert np.array_equal(windows[5][1], data)
+        assert updates
+        cdfs.close()
+
+    def test_trust_contents(self, example_cdfs):
+        cdfs, _ = example_cdfs
+        path = cdfs.path / "node/leaf_0.h5"
+        start = leaf_start(0) + 5
+        leaf = ExampleLeaf(
+            path=path,
+            mode="r",
+            shape=(10, N_CHANNELS),
+            sample_rate=50,
+            start=np.uint64(start),
+            end=np.uint64(start),
+        )
+        leaf.open()
+        assert leaf.trusts_contents
+        assert leaf.get_start_nanostamp() == start
+        assert leaf.get_shape() == (10, N_CHANNELS)
+        assert leaf.get_sample_rate() == 50
+
+        leaf.trust_contents = False
+        leaf.get_shape.clear_cache()
+        assert leaf.get_start_nanostamp() == leaf_start(0)
+        assert leaf.get_shape() == (LEAF_LENGTH, N_CHANNELS)
+        assert leaf.get_sample_rate() == SAMPLE_RATE
+        leaf.close()
+
+    def test_get_nanostamp_indices(self, example_cdfs):
+        cdfs, _ = example_cdfs
+        proxy = cdfs.data
+        rng = np.random.default_rng(0)
+        nanostamps = rng.integers(leaf_start(-1), leaf_start(6), 200, dtype=np.int64)
+        nanostamps[:3] = [leaf_start(0), leaf_start(2) + 10**7, leaf_start(2) + 10**7 + 1]
+        expected = [proxy.get_nanostamp_index(int(t)) for t in nanostamps]
+        assert proxy.get_nanostamp_indices(nanostamps).tolist() == expected
+        assert proxy.proxies[0].child_sample_rates.tolist() == [SAMPLE_RATE] * 5
+
+        leaf = proxy.proxies[0].proxies[0]
+        assert leaf.get_sample_period_nanoseconds() == 10**9 // SAMPLE_RATE
+        assert leaf.get_sample_period() == 1 / SAMPLE_RATE
+
+    def test_lazy_data(self, example_cdfs):
+        cdfs, data = example_cdfs
+        expected = np.concatenate(sorted(data, key=lambda d: d[0, 0]))
+        assert not cdfs.is_data_loaded
+        assert cdfs.start_datetime is not None
+        assert not cdfs.is_data_loaded
+        assert np.array_equal(cdfs.data.read_index_range(990, 1010), expected[990:1010])
+        assert cdfs.is_data_loaded
+        cdfs.close()
+
+        cdfs = ExampleCDFS(path=cdfs.path, mode="r", load=True, background_load=True)
+        cdfs.join_data_thread()
+        assert cdfs.is_data_loaded
+        assert np.array_equal(cdfs.data.read_index_range(990, 1010), expected[990:1010])
+        cdfs.close()
+
+        cdfs = ExampleCDFS(path=cdfs.path, mode="r", load=False)
+        assert cdfs.data is None
+        cdfs.close()